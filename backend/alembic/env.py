@@ -12,6 +12,10 @@ from app.core.database import Base
 from app.models.user import User
 from app.models.document import Document
 from app.models.chunk import DocumentChunk
+from app.models.summary import DocumentSummary
+from app.models.page import DocumentPage
+from app.models.entity import DocumentEntity, EntityAlias
+from app.models.graph_layout import DocumentGraphLayout
 from app.models.chat import ChatSession, ChatMessage
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,38 @@
+"""add_quantized_embedding_indexes
+
+Revision ID: 2da2d105d978
+Revises: 10f4acad51b1
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2da2d105d978'
+down_revision: Union[str, Sequence[str], None] = '10f4acad51b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expression indexes over the float32 column: candidate search uses the compact
+    # halfvec / binary representation, the exact rerank still reads `embedding`.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding_halfvec "
+        "ON document_chunks USING hnsw ((embedding::halfvec(384)) halfvec_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding_binary "
+        "ON document_chunks USING hnsw ((binary_quantize(embedding)::bit(384)) bit_hamming_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding_binary")
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding_halfvec")
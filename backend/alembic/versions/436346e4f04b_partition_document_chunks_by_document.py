@@ -0,0 +1,103 @@
+"""partition_document_chunks_by_document
+
+Revision ID: 436346e4f04b
+Revises: e2b3d9831d3c
+Create Date: 2026-10-19 13:41:52.870126
+
+Converts document_chunks into a table hash-partitioned on document_id.
+Existing rows are copied into the new table inside the migration; run it
+through partition_chunks.py to get before/after benchmarks.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '436346e4f04b'
+down_revision: Union[str, Sequence[str], None] = 'e2b3d9831d3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NUM_PARTITIONS = 16
+
+COLUMNS = "id, document_id, chunk_index, content, page_number, embedding"
+
+
+def _create_chunks_table(name: str, partitioned: bool) -> None:
+    op.execute(f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL,
+            document_id UUID NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            chunk_index INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            page_number INTEGER NOT NULL,
+            embedding VECTOR(384),
+            content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
+            PRIMARY KEY ({'id, document_id' if partitioned else 'id'})
+        ){' PARTITION BY HASH (document_id)' if partitioned else ''}
+    """)
+
+
+def _swap_in(new_name: str) -> None:
+    """Replace document_chunks with `new_name`, keeping the original constraint names."""
+    op.execute("DROP TABLE document_chunks")
+    op.execute(f"ALTER TABLE {new_name} RENAME TO document_chunks")
+    op.execute(f"ALTER TABLE document_chunks RENAME CONSTRAINT {new_name}_pkey TO document_chunks_pkey")
+    op.execute(
+        f"ALTER TABLE document_chunks RENAME CONSTRAINT {new_name}_document_id_fkey "
+        "TO document_chunks_document_id_fkey"
+    )
+
+
+def _create_indexes() -> None:
+    # On a partitioned table each of these cascades into one index per partition
+    op.create_index('ix_document_chunks_document_id', 'document_chunks', ['document_id'], unique=False)
+    op.create_index(
+        'ix_document_chunks_content_tsv', 'document_chunks', ['content_tsv'],
+        unique=False, postgresql_using='gin'
+    )
+    op.execute(
+        "CREATE INDEX ix_document_chunks_embedding "
+        "ON document_chunks USING hnsw (embedding vector_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_document_chunks_embedding_halfvec "
+        "ON document_chunks USING hnsw ((embedding::halfvec(384)) halfvec_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_document_chunks_embedding_binary "
+        "ON document_chunks USING hnsw ((binary_quantize(embedding)::bit(384)) bit_hamming_ops)"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_chunks_table("document_chunks_partitioned", partitioned=True)
+    for remainder in range(NUM_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE document_chunks_p{remainder} PARTITION OF document_chunks_partitioned "
+            f"FOR VALUES WITH (MODULUS {NUM_PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    # Copy before building indexes: bulk load first, index once
+    op.execute(
+        f"INSERT INTO document_chunks_partitioned ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM document_chunks"
+    )
+    _swap_in("document_chunks_partitioned")
+    _create_indexes()
+    op.execute("ANALYZE document_chunks")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _create_chunks_table("document_chunks_unpartitioned", partitioned=False)
+    op.execute(
+        f"INSERT INTO document_chunks_unpartitioned ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM document_chunks"
+    )
+    # Dropping the partitioned parent drops its partitions as well
+    _swap_in("document_chunks_unpartitioned")
+    _create_indexes()
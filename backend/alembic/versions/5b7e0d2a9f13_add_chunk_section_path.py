@@ -0,0 +1,37 @@
+"""add_chunk_section_path
+
+Revision ID: 5b7e0d2a9f13
+Revises: c8fad51c36c1
+Create Date: 2026-10-19 16:02:11.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e0d2a9f13'
+down_revision: Union[str, Sequence[str], None] = 'c8fad51c36c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing chunks keep a NULL section_path until their document is reprocessed
+    op.add_column('document_chunks', sa.Column('section_path', sa.String(length=1024), nullable=True))
+    op.create_index(
+        'ix_document_chunks_section_path',
+        'document_chunks',
+        ['document_id', 'section_path'],
+        unique=False,
+        postgresql_ops={'section_path': 'text_pattern_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_chunks_section_path', table_name='document_chunks')
+    op.drop_column('document_chunks', 'section_path')
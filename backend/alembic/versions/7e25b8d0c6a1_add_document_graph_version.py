@@ -0,0 +1,28 @@
+"""add_document_graph_version
+
+Revision ID: 7e25b8d0c6a1
+Revises: d47a2c9e8b15
+Create Date: 2026-10-19 19:48:26.530194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e25b8d0c6a1'
+down_revision: Union[str, Sequence[str], None] = 'd47a2c9e8b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('graph_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'graph_version')
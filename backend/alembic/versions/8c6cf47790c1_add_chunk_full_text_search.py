@@ -0,0 +1,39 @@
+"""add_chunk_full_text_search
+
+Revision ID: 8c6cf47790c1
+Revises: 2da2d105d978
+Create Date: 2026-10-19 10:03:17.552961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c6cf47790c1'
+down_revision: Union[str, Sequence[str], None] = '2da2d105d978'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_chunks', sa.Column(
+        'content_tsv',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', content)", persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_document_chunks_content_tsv', 'document_chunks', ['content_tsv'],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_chunks_content_tsv', table_name='document_chunks')
+    op.drop_column('document_chunks', 'content_tsv')
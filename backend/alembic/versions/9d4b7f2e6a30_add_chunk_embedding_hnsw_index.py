@@ -0,0 +1,35 @@
+"""add_chunk_embedding_hnsw_index
+
+Revision ID: 9d4b7f2e6a30
+Revises: e58a0c7f3b19
+Create Date: 2026-10-19 22:41:05.317652
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b7f2e6a30'
+down_revision: Union[str, Sequence[str], None] = 'e58a0c7f3b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # HNSW index for the default `full` storage mode (the quantized modes use the
+    # halfvec / binary expression indexes); on the partitioned table it cascades
+    # into one index per partition. Databases partitioned after 436346e4f04b was
+    # amended already have it.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding "
+        "ON document_chunks USING hnsw (embedding vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_embedding")
@@ -0,0 +1,45 @@
+"""add_document_pages
+
+Revision ID: a93c4e6f0b27
+Revises: 5b7e0d2a9f13
+Create Date: 2026-10-19 16:40:52.907114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93c4e6f0b27'
+down_revision: Union[str, Sequence[str], None] = '5b7e0d2a9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table('document_pages',
+    sa.Column('document_id', sa.UUID(), nullable=False),
+    sa.Column('page_number', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('document_id', 'page_number')
+    )
+    # Pages of documents ingested before this revision are filled in on reprocess
+    op.create_index(
+        'ix_document_pages_text_trgm',
+        'document_pages',
+        ['text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'text': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_pages_text_trgm', table_name='document_pages')
+    op.drop_table('document_pages')
@@ -0,0 +1,35 @@
+"""add_document_graph_layouts
+
+Revision ID: b3f9e61d2a74
+Revises: 7e25b8d0c6a1
+Create Date: 2026-10-19 20:14:52.306417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f9e61d2a74'
+down_revision: Union[str, Sequence[str], None] = '7e25b8d0c6a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_graph_layouts',
+    sa.Column('document_id', sa.UUID(), nullable=False),
+    sa.Column('graph_version', sa.Integer(), nullable=False),
+    sa.Column('positions', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('document_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('document_graph_layouts')
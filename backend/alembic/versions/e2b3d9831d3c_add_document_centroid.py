@@ -0,0 +1,35 @@
+"""add_document_centroid
+
+Revision ID: e2b3d9831d3c
+Revises: 8c6cf47790c1
+Create Date: 2026-10-19 11:26:05.304417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b3d9831d3c'
+down_revision: Union[str, Sequence[str], None] = '8c6cf47790c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('centroid', pgvector.sqlalchemy.vector.VECTOR(dim=384), nullable=True))
+    # Backfill centroids for documents ingested before this revision
+    op.execute(
+        "UPDATE documents SET centroid = ("
+        "SELECT avg(embedding) FROM document_chunks WHERE document_chunks.document_id = documents.id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'centroid')
@@ -0,0 +1,34 @@
+"""add_document_entity_aliases
+
+Revision ID: e58a0c7f3b19
+Revises: b3f9e61d2a74
+Create Date: 2026-10-19 21:02:37.845120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e58a0c7f3b19'
+down_revision: Union[str, Sequence[str], None] = 'b3f9e61d2a74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_entity_aliases',
+    sa.Column('document_id', sa.UUID(), nullable=False),
+    sa.Column('alias', sa.String(length=512), nullable=False),
+    sa.Column('canonical', sa.String(length=512), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('document_id', 'alias')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('document_entity_aliases')
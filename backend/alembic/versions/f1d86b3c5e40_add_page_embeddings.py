@@ -0,0 +1,43 @@
+"""add_page_embeddings
+
+Revision ID: f1d86b3c5e40
+Revises: a93c4e6f0b27
+Create Date: 2026-10-19 17:21:37.265019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pgvector.sqlalchemy
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d86b3c5e40'
+down_revision: Union[str, Sequence[str], None] = 'a93c4e6f0b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_pages', sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=384), nullable=True))
+    # Backfill from the chunks of each page
+    op.execute("""
+        UPDATE document_pages p
+        SET embedding = c.embedding
+        FROM (
+            SELECT document_id, page_number, avg(embedding) AS embedding
+            FROM document_chunks
+            WHERE embedding IS NOT NULL
+            GROUP BY document_id, page_number
+        ) c
+        WHERE c.document_id = p.document_id AND c.page_number = p.page_number
+    """)
+    op.create_index('ix_document_chunks_document_page', 'document_chunks', ['document_id', 'page_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_chunks_document_page', table_name='document_chunks')
+    op.drop_column('document_pages', 'embedding')
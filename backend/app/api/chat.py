@@ -1,4 +1,6 @@
 import json
+import time
+import logging
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from fastapi.responses import StreamingResponse
@@ -6,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_db
+from app.core.config import settings
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.chat import ChatSession, ChatMessage, MessageRole
@@ -15,9 +18,13 @@ from app.services.hybrid_search import hybrid_search_service
 from app.services.persona import persona_engine
 from app.services.llm import llm_service
 from app.services.web_search import web_search_service
+from app.services.query_router import query_router, RouteDecision
+from app.services.context_packer import context_packer
+from app.services.entity_linker import entity_linker
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 @router.post("/chat")
@@ -27,9 +34,12 @@ async def chat_with_document(
     persona: str = Body("default"),
     session_id: UUID | None = Body(None),
     web_search: bool = Body(False),
+    library_search: bool = Body(False),
+    document_ids: list[UUID] | None = Body(None),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
+    request_start = time.perf_counter()
     user_id = user.id
     doc = None
     if document_id:
@@ -79,14 +89,52 @@ async def chat_with_document(
     graph_facts = []
     web_results = []
     
-    # a. RAG (only if doc is present)
-    if document_id:
-        query_vector = embedding_service.embed_texts([question])[0]
-        hybrid_results = await hybrid_search_service.search(
-            question, query_vector, document_id, db
-        )
-        context_chunks = [c for c in hybrid_results["vector_chunks"] if c["distance"] < 0.65]
-        graph_facts = hybrid_results["graph_facts"]
+    # a. RAG (single document, or library-wide when requested)
+    if document_id or library_search or document_ids:
+        # Route first: small talk and follow-ups skip the retrieval pipeline
+        query_vector = None
+        ngram_vectors = None
+        route = RouteDecision.RETRIEVE
+        # Question n-grams for semantic entity linking share the question's embedding call
+        ngrams = []
+        if document_id and settings.ENABLE_GRAPH_RAG and settings.ENABLE_ENTITY_LINKING:
+            ngrams = entity_linker.candidate_ngrams(question)
+
+        if settings.ENABLE_QUERY_ROUTER:
+            route = query_router.route_by_rules(question, session_id)
+            if route is None:
+                vectors = embedding_service.embed_texts([question] + ngrams)
+                query_vector, ngram_vectors = vectors[0], vectors[1:]
+                route = query_router.route_by_embedding(query_vector, session_id, question)
+
+        retrieval_ms = None
+        if route == RouteDecision.RETRIEVE:
+            retrieval_start = time.perf_counter()
+            if query_vector is None:
+                vectors = embedding_service.embed_texts([question] + ngrams)
+                query_vector, ngram_vectors = vectors[0], vectors[1:]
+            if document_id:
+                hybrid_results = await hybrid_search_service.search(
+                    question, query_vector, document_id, db,
+                    total_chunks=doc.total_chunks, ngram_vectors=ngram_vectors
+                )
+            else:
+                # Library mode: retrieve across the user's documents (or the given subset)
+                hybrid_results = await hybrid_search_service.search_library(
+                    question, query_vector, user_id, db, document_ids=document_ids
+                )
+            context_chunks = hybrid_results["vector_chunks"]
+            graph_facts = hybrid_results["graph_facts"]
+            retrieval_ms = (time.perf_counter() - retrieval_start) * 1000
+            logger.info(f"Retrieval took {retrieval_ms:.1f} ms")
+            query_router.remember(session_id, query_vector, context_chunks, graph_facts)
+        elif route == RouteDecision.REUSE:
+            cached = query_router.cached_context(session_id)
+            context_chunks = cached["context_chunks"]
+            graph_facts = cached["graph_facts"]
+
+        if settings.ENABLE_QUERY_ROUTER:
+            query_router.record(route, retrieval_ms)
 
     # b. Web Search (if enabled)
     if web_search:
@@ -111,7 +159,8 @@ async def chat_with_document(
     for c in context_chunks:
         merged_context.append({
             "page_number": c["page_number"],
-            "content": c["content"]
+            "content": c["content"],
+            "source_name": c.get("source_name")
         })
     
     # Inject Web Search results as virtual chunks
@@ -121,6 +170,10 @@ async def chat_with_document(
             "content": f"Title: {wr['title']}\nURL: {wr['url']}\nSnippet: {wr['content']}"
         })
 
+    # Dedupe, compress and fit the context into the token budget
+    if settings.ENABLE_CONTEXT_PACKING:
+        merged_context, graph_facts = context_packer.pack(question, merged_context, graph_facts)
+
     # Enhance the prompt with graph facts
     if graph_facts:
         fact_str = "\n".join(graph_facts)
@@ -128,6 +181,7 @@ async def chat_with_document(
     
     # d. Assemble prompt
     messages = persona_engine.assemble_prompt(persona, merged_context, question, history=history_formatted)
+    prompt_chars = sum(len(m["content"]) for m in messages)
     
     # 5. Stream from LLM
     async def chat_generator():
@@ -141,7 +195,7 @@ async def chat_with_document(
             {
                 "page_number": c["page_number"],
                 "content": c["content"][:200] + "..." if len(c["content"]) > 200 else c["content"],
-                "source_name": doc.filename if doc else "Web"
+                "source_name": c.get("source_name") or (doc.filename if doc else "Web")
             }
             for c in context_chunks
         ]
@@ -158,6 +212,12 @@ async def chat_with_document(
         yield f"__CITATIONS__:{citations_json}\n"
         
         async for token in llm_service.stream_chat(messages):
+            if not full_response:
+                # Time-to-first-token, measured from request start, alongside prompt size
+                logger.info(
+                    f"TTFT {(time.perf_counter() - request_start) * 1000:.1f} ms "
+                    f"(prompt {prompt_chars} chars, {len(context_chunks)} chunks)"
+                )
             full_response += token
             yield token
             
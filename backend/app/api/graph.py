@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import logging
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from uuid import UUID
 from sqlalchemy import select
-from app.services.graph_service import graph_service
+from app.services.graph_service import graph_backend
+from app.services.graph_layout import graph_layout_service
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
@@ -9,16 +13,29 @@ from app.models.document import Document
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.get("/{document_id}")
 async def get_document_graph(
     document_id: UUID,
+    request: Request,
+    response: Response,
+    top_n: int | None = Query(None, ge=1, le=5000, description="Only the N highest-degree entities"),
+    focus: str | None = Query(None, description="Entity to expand around"),
+    depth: int = Query(1, ge=1, le=3, description="Hops around `focus`"),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page of links"),
+    limit: int | None = Query(None, ge=1, le=10000, description="Links per page"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
     """
     Retrieve the knowledge graph for a specific document.
     Formats data for react-force-graph.
+
+    Supports level of detail (`top_n`), neighbourhood expansion (`focus`, `depth`)
+    and link pagination (`cursor`, `limit`). Responses carry an ETag derived from
+    the document's graph version, so unchanged graphs are answered with a 304.
+    Nodes carry precomputed `x`/`y` coordinates from the full-graph layout.
     """
     # 1. Verify document ownership
     result = await db.execute(select(Document).where(Document.id == document_id))
@@ -29,35 +46,66 @@ async def get_document_graph(
     if doc.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this document")
 
-    # 2. Cypher query to get nodes and relations for this doc
-    query = """
-    MATCH (s:Entity)-[r:RELATES_TO {doc_id: $doc_id}]->(o:Entity)
-    RETURN s.name AS source, r.relation AS relation, o.name AS target
-    """
-    
+    # 2. Conditional request: the graph only changes when graph_version is bumped
+    view = f"{top_n}|{focus}|{depth}|{cursor}|{limit}"
+    etag = f'"g{doc.graph_version}-{hashlib.sha1(view.encode()).hexdigest()[:12]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    # 3. Nodes and relations for this doc (optionally a subgraph / a page of links)
+    links_query = graph_backend.links(
+        document_id, top_n=top_n, focus=focus, depth=depth, cursor=cursor,
+        limit=limit + 1 if limit else None  # one extra to know whether another page exists
+    )
+
     try:
-        records = await graph_service.execute_query(query, {"doc_id": str(document_id)})
-        
-        nodes = set()
+        nodes = {}
         links = []
+        next_cursor = None
         
-        for record in records:
-            source = record["source"]
-            target = record["target"]
-            relation = record["relation"]
-            
-            nodes.add(source)
-            nodes.add(target)
-            
-            links.append({
-                "source": source,
-                "target": target,
-                "label": relation
-            })
+        # Stream the records: large graphs are not buffered twice (driver result + response).
+        # aclosing: leaving the loop early (next page exists) closes the stream and its session now
+        async with aclosing(links_query) as records:
+            async for record in records:
+                if limit and len(links) == limit:
+                    next_cursor = links[-1]["id"]
+                    break
+                source = record["source"]
+                target = record["target"]
+                relation = record["relation"]
+                
+                nodes[source] = nodes.get(source, 0) + 1
+                nodes[target] = nodes.get(target, 0) + 1
+                
+                links.append({
+                    "id": record["rel_id"],
+                    "source": source,
+                    "target": target,
+                    "label": relation
+                })
             
+        # Precomputed coordinates (per graph version) let the client render without simulating
+        try:
+            positions = await graph_layout_service.positions(document_id, doc.graph_version, db) if nodes else {}
+        except Exception as layout_err:
+            logger.warning(f"Graph layout unavailable for {document_id}: {layout_err}")
+            positions = {}
+
+        node_list = []
+        for n, page_degree in nodes.items():
+            # Links of this response only, not the entity's degree in the whole graph
+            node = {"id": n, "name": n, "page_degree": page_degree}
+            if n in positions:
+                node["x"], node["y"] = positions[n]
+            node_list.append(node)
+
         return {
-            "nodes": [{"id": n, "name": n} for n in nodes],
-            "links": links
+            "nodes": node_list,
+            "links": links,
+            "next_cursor": next_cursor,
+            "graph_version": doc.graph_version
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
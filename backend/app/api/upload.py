@@ -1,6 +1,7 @@
 import shutil
+import time
 import uuid
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -9,9 +10,14 @@ from app.core.config import settings
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.document import Document, UploadStatus
-from app.schemas.document import DocumentResponse
+from app.schemas.document import DocumentResponse, DocumentSearchResponse
 from app.services.ingestion import ingestion_service
-from app.services.graph_service import graph_service
+from app.services.graph_service import graph_backend
+from app.services.local_vector_index import local_vector_index
+from app.services.page_search import page_search_service
+from app.services.entity_matcher import entity_matcher
+from app.services.entity_linker import entity_linker
+from app.services.graph_expansion import graph_expansion_service
 import os
 from pathlib import Path
 
@@ -19,6 +25,14 @@ from pathlib import Path
 router = APIRouter()
 
 
+def _invalidate_document_caches(document_id: uuid.UUID, file_path: str):
+    """Drop in-process derived data of a document (local vector index, entity matcher / linker, graph walks)."""
+    local_vector_index.invalidate(document_id, file_path)
+    entity_matcher.invalidate(document_id)
+    entity_linker.invalidate(document_id)
+    graph_expansion_service.invalidate(document_id)
+
+
 @router.post("/upload", response_model=DocumentResponse)
 async def upload_pdf(
     background_tasks: BackgroundTasks,
@@ -106,6 +120,33 @@ async def get_document_content(
         raise HTTPException(status_code=403, detail="Not authorized to access this document")
         
     return FileResponse(doc.file_path, media_type="application/pdf", filename=doc.filename)
+
+
+@router.get("/documents/{document_id}/search", response_model=DocumentSearchResponse)
+async def search_document(
+    document_id: uuid.UUID,
+    q: str = Query(..., min_length=2, max_length=200),
+    after: int | None = Query(None, description="Last page_number of the previous result page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+):
+    result = await db.execute(select(Document).where(Document.id == document_id))
+    doc = result.scalar_one_or_none()
+
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    if doc.user_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this document")
+
+    start = time.perf_counter()
+    hits, next_after = await page_search_service.search(document_id, q.strip(), db, after=after, limit=limit)
+    took_ms = (time.perf_counter() - start) * 1000
+
+    return DocumentSearchResponse(query=q, hits=hits, next_after=next_after, took_ms=round(took_ms, 2))
+
+
 @router.delete("/documents/{document_id}")
 async def delete_document(
     document_id: uuid.UUID,
@@ -121,17 +162,11 @@ async def delete_document(
     if doc.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this document")
 
-    # 1. Delete from Neo4j
-    await graph_service.execute_query(
-        "MATCH (n)-[r {doc_id: $doc_id}]->() DELETE r",
-        {"doc_id": str(document_id)}
-    )
-    await graph_service.execute_query(
-        "MATCH (n:Entity) WHERE NOT (n)--() DELETE n",
-        {}
-    )
+    # 1. Delete the document's graph
+    await graph_backend.delete_document_graph(document_id)
 
-    # 2. Delete file from disk
+    # 2. Delete file from disk (and the cached / local index data, if any)
+    _invalidate_document_caches(document_id, doc.file_path)
     if os.path.exists(doc.file_path):
         os.remove(doc.file_path)
         # Also delete extracted images if any
@@ -163,25 +198,28 @@ async def reprocess_document(
     if doc.user_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to reprocess this document")
 
-    # 1. Clear Neo4j data for this doc
-    await graph_service.execute_query(
-        "MATCH (n)-[r {doc_id: $doc_id}]->() DELETE r",
-        {"doc_id": str(document_id)}
-    )
-    await graph_service.execute_query(
-        "MATCH (n:Entity) WHERE NOT (n)--() DELETE n",
-        {}
-    )
+    # 1. Clear graph data for this doc
+    await graph_backend.delete_document_graph(document_id)
 
-    # 2. Clear Postgres chunks (manual delete if cascade is wanted but we want to keep the Doc record)
+    # 2. Clear Postgres chunks, summaries, page text and entities (manual delete if cascade is wanted but we want to keep the Doc record)
     from app.models.chunk import DocumentChunk
+    from app.models.summary import DocumentSummary
+    from app.models.page import DocumentPage
+    from app.models.entity import DocumentEntity, EntityAlias
     from sqlalchemy import delete
     await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+    await db.execute(delete(DocumentSummary).where(DocumentSummary.document_id == document_id))
+    await db.execute(delete(DocumentPage).where(DocumentPage.document_id == document_id))
+    await db.execute(delete(DocumentEntity).where(DocumentEntity.document_id == document_id))
+    await db.execute(delete(EntityAlias).where(EntityAlias.document_id == document_id))
+    _invalidate_document_caches(document_id, doc.file_path)
 
     # 3. Reset status and trigger ingestion
     doc.upload_status = UploadStatus.PENDING
     doc.total_pages = 0
     doc.total_chunks = 0
+    doc.centroid = None
+    doc.graph_version = Document.graph_version + 1
     await db.commit()
     await db.refresh(doc)
 
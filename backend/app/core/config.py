@@ -29,13 +29,96 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
 
+    # Vector Storage
+    VECTOR_BACKEND: str = "pgvector"  # pgvector | local (memory-mapped per-document index)
+    LOCAL_INDEX_CACHE_MB: int = 256
+    VECTOR_STORAGE_MODE: str = "full"  # full | halfvec | binary
+    VECTOR_RERANK_OVERFETCH: int = 4  # candidates fetched per result before the float32 rerank
+    HNSW_EF_SEARCH: int = 100  # candidate list of a document-filtered HNSW scan (pgvector default 40)
+    HNSW_ITERATIVE_SCAN: str = "relaxed_order"  # off | relaxed_order | strict_order (pgvector >= 0.8)
+
+    # Hybrid Search
+    ENABLE_KEYWORD_SEARCH: bool = True
+    HYBRID_CANDIDATE_DEPTH: int = 20  # candidates taken from each ranked list before fusion
+    HYBRID_RRF_K: int = 60
+    HYBRID_VECTOR_WEIGHT: float = 1.0
+    HYBRID_KEYWORD_WEIGHT: float = 1.0
+    RAG_MAX_DISTANCE: float = 0.65  # vector-only hits above this cosine distance are dropped
+    LIBRARY_ROUTE_TOP_DOCS: int = 5  # documents kept by centroid routing in library search
+    TWO_STAGE_MIN_CHUNKS: int = 2000  # documents this large search top pages first, then their chunks
+    TWO_STAGE_TOP_PAGES: int = 20
+
+    # Query Router (skip retrieval for small talk / follow-ups)
+    ENABLE_QUERY_ROUTER: bool = True
+    ROUTER_SMALL_TALK_THRESHOLD: float = 0.8
+    ROUTER_REUSE_THRESHOLD: float = 0.92
+    ROUTER_FOLLOW_UP_THRESHOLD: float = 0.75  # follow-up phrasing that names a topic ("clarify X")
+    ROUTER_SESSION_CACHE_SIZE: int = 1024
+
+    # Summary Tree (precomputed at ingestion for broad questions)
+    # Off by default: one sequential LLM call per node, ~chunks / SUMMARY_GROUP_SIZE per document
+    ENABLE_SUMMARY_TREE: bool = False
+    SUMMARY_GROUP_SIZE: int = 8  # children summarized into one parent node
+
+    # Section Scoping ("in chapter 3 ..." restricts retrieval to that section)
+    ENABLE_SECTION_SCOPING: bool = True
+
+    # Context Packing (token budget for retrieved context)
+    ENABLE_CONTEXT_PACKING: bool = True
+    CONTEXT_TOKEN_BUDGET: int = 1500  # counted with the embedding tokenizer
+    CONTEXT_DEDUP_THRESHOLD: float = 0.7  # shingle Jaccard above which an item is a near-duplicate
+    CONTEXT_MIN_SENTENCE_SCORE: float = 0.15  # sentences less similar to the question are dropped
+
+    # Reranking (cross-encoder over an over-fetched candidate set)
+    ENABLE_RERANKER: bool = False
+    RERANKER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 20
+    RERANK_TOP_N: int = 3
+    RERANK_CACHE_SIZE: int = 4096
+
     # LLM
     LLM_MODEL: str = "llama-3.3-70b-versatile"
 
+    # Graph backend
+    GRAPH_BACKEND: str = "neo4j"  # neo4j | embedded (in-process CSR arrays per document, single process only)
+    EMBEDDED_GRAPH_CACHE_SIZE: int = 256  # document graphs kept in memory by the embedded backend
+
     # Neo4j
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
+    NEO4J_MAX_POOL_SIZE: int = 50
+    NEO4J_ACQUISITION_TIMEOUT: float = 30.0  # seconds to wait for a free pooled connection
+    ENTITY_MATCHER_CACHE_SIZE: int = 256  # documents whose entity automaton stays in memory
+    GRAPH_WRITE_BATCH_SIZE: int = 500  # triplets / relationships per Neo4j write transaction
+    GRAPH_WRITE_RETRIES: int = 3
+
+    # Graph Expansion (k-hop walk from the question's entities)
+    GRAPH_MAX_HOPS: int = 2
+    GRAPH_FANOUT: int = 10  # relationships followed per entity per hop
+    GRAPH_HOP_DECAY: float = 0.6  # score multiplier per extra hop
+    GRAPH_MAX_FACTS: int = 10
+    GRAPH_EXPANSION_CACHE_SIZE: int = 1024
+
+    # Knowledge Map Layout (precomputed per graph version)
+    GRAPH_LAYOUT_ITERATIONS: int = 60  # force-directed refinement steps
+    GRAPH_LAYOUT_SPECTRAL_MAX_NODES: int = 2000  # above this, start from a random layout (dense eigh is O(n^3))
+
+    # Entity Linking (question n-grams -> graph entities by embedding similarity)
+    ENABLE_ENTITY_LINKING: bool = True
+    ENTITY_LINK_THRESHOLD: float = 0.75
+    ENTITY_LINK_MAX_NGRAMS: int = 24  # embedded in the same batch as the question
+    ENTITY_LINK_MAX_ENTITIES: int = 5
+
+    # Entity Canonicalization (merge name variants before the graph write)
+    ENABLE_ENTITY_CANONICALIZATION: bool = True
+    ENTITY_CANONICAL_THRESHOLD: float = 0.92  # cosine between normalized names; 1.0 = rules only
+
+    # Graph Communities (label propagation at ingestion, summarized for global questions)
+    ENABLE_COMMUNITY_SUMMARIES: bool = True
+    COMMUNITY_MIN_SIZE: int = 3  # entities
+    COMMUNITY_MAX_SUMMARIES: int = 20  # largest communities summarized per document
+    COMMUNITY_TOP_K: int = 4  # summaries retrieved for a global question
 
     # Ollama
     OLLAMA_BASE_URL: str = "http://localhost:11434"
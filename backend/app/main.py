@@ -13,6 +13,18 @@ from sqlalchemy import update
 async def lifespan(app: FastAPI):
     # Load embedding model on startup
     await embedding_service.initialize()
+    if settings.ENABLE_RERANKER:
+        from app.services.reranker import reranker_service
+        await reranker_service.initialize()
+
+    # Neo4j constraints / indexes (versioned, idempotent)
+    if settings.ENABLE_GRAPH_RAG and settings.GRAPH_BACKEND == "neo4j":
+        from app.services.graph_schema import graph_schema_service
+        try:
+            version = await graph_schema_service.apply()
+            print(f"Graph schema at v{version}")
+        except Exception as e:
+            print(f"Graph schema bootstrap failed: {e}")
 
     # Recovery: Reset stuck "PROCESSING" documents to "FAILED"
     async with async_session() as db:
@@ -32,7 +44,9 @@ async def lifespan(app: FastAPI):
             print(f"Startup Recovery Error: {e}")
 
     yield
-    # Cleanup if needed
+    # Cleanup: close pooled Neo4j connections
+    from app.services.graph_service import graph_service
+    await graph_service.close()
 
 
 app = FastAPI(
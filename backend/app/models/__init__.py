@@ -1,6 +1,10 @@
 from app.models.user import User
 from app.models.document import Document, UploadStatus
 from app.models.chunk import DocumentChunk
+from app.models.summary import DocumentSummary
+from app.models.page import DocumentPage
+from app.models.entity import DocumentEntity, EntityAlias
+from app.models.graph_layout import DocumentGraphLayout
 from app.models.chat import ChatSession, ChatMessage, MessageRole
 
 __all__ = [
@@ -8,6 +12,11 @@ __all__ = [
     "Document",
     "UploadStatus",
     "DocumentChunk",
+    "DocumentSummary",
+    "DocumentPage",
+    "DocumentEntity",
+    "EntityAlias",
+    "DocumentGraphLayout",
     "ChatSession",
     "ChatMessage",
     "MessageRole",
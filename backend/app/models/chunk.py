@@ -2,27 +2,48 @@
 
 import uuid
 
-from sqlalchemy import Text, Integer, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Text, String, Integer, ForeignKey, Computed, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from pgvector.sqlalchemy import Vector
 
 from app.core.database import Base
 
+# Column length of section_path; longer outline paths are shortened at parse time
+SECTION_PATH_MAX_LENGTH = 1024
+
 
 class DocumentChunk(Base):
     __tablename__ = "document_chunks"
+    # Hash-partitioned on document_id (see migration 436346e4f04b), so the
+    # partition key is part of the primary key
+    __table_args__ = (
+        # Prefix lookups for section-scoped retrieval
+        Index(
+            "ix_document_chunks_section_path",
+            "document_id",
+            "section_path",
+            postgresql_ops={"section_path": "text_pattern_ops"},
+        ),
+        # Second stage of two-stage search: chunks of the selected pages
+        Index("ix_document_chunks_document_page", "document_id", "page_number"),
+        {"postgresql_partition_by": "HASH (document_id)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     document_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True, index=True
     )
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     page_number: Mapped[int] = mapped_column(Integer, nullable=False)  # Improvement #3: metadata
+    section_path: Mapped[str | None] = mapped_column(String(SECTION_PATH_MAX_LENGTH), nullable=True)  # "Chapter 3 > 3.1 ..."
     embedding = mapped_column(Vector(384), nullable=True)  # pgvector column
+    content_tsv = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', content)", persisted=True)
+    )  # full-text search column (GIN indexed)
 
     # Relationships
     document = relationship("Document", back_populates="chunks")
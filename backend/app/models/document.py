@@ -7,6 +7,7 @@ from datetime import datetime
 from sqlalchemy import String, DateTime, Enum, ForeignKey, Integer, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import Vector
 
 from app.core.database import Base
 
@@ -35,11 +36,19 @@ class Document(Base):
     )
     total_pages: Mapped[int] = mapped_column(Integer, default=0)
     total_chunks: Mapped[int] = mapped_column(Integer, default=0)
+    centroid = mapped_column(Vector(384), nullable=True)  # mean chunk embedding, for library routing
+    graph_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # bumped on every graph rebuild
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
     user = relationship("User", back_populates="documents")
-    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    # passive_deletes: let the FK cascade delete chunks in-database instead of loading them
+    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+    summaries = relationship("DocumentSummary", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+    pages = relationship("DocumentPage", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+    entities = relationship("DocumentEntity", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+    entity_aliases = relationship("EntityAlias", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+    graph_layout = relationship("DocumentGraphLayout", back_populates="document", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
     chat_sessions = relationship("ChatSession", back_populates="document", cascade="all, delete-orphan")
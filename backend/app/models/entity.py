@@ -0,0 +1,44 @@
+"""DocumentEntity / EntityAlias models — graph entity names of a document (embedded) and their merged aliases."""
+
+import uuid
+
+from sqlalchemy import String, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import Vector
+
+from app.core.database import Base
+
+# Column length of entity names and aliases; longer LLM-extracted names are dropped at ingestion
+ENTITY_NAME_MAX_LENGTH = 512
+
+
+class DocumentEntity(Base):
+    """An entity name from the document's knowledge graph, embedded for semantic linking."""
+    __tablename__ = "document_entities"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String(ENTITY_NAME_MAX_LENGTH), nullable=False)
+    embedding = mapped_column(Vector(384), nullable=True)
+
+    # Relationships
+    document = relationship("Document", back_populates="entities")
+
+
+class EntityAlias(Base):
+    """A surface form merged into a canonical entity name at ingestion ("the DNA" -> "DNA")."""
+    __tablename__ = "document_entity_aliases"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    alias: Mapped[str] = mapped_column(String(ENTITY_NAME_MAX_LENGTH), primary_key=True)
+    canonical: Mapped[str] = mapped_column(String(ENTITY_NAME_MAX_LENGTH), nullable=False)
+
+    # Relationships
+    document = relationship("Document", back_populates="entity_aliases")
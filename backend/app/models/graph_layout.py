@@ -0,0 +1,23 @@
+"""DocumentGraphLayout model — precomputed 2D knowledge map coordinates per graph version."""
+
+import uuid
+
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+
+class DocumentGraphLayout(Base):
+    """Node positions of a document's knowledge graph, valid while `graph_version` matches the document."""
+    __tablename__ = "document_graph_layouts"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    graph_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    positions: Mapped[dict] = mapped_column(JSONB, nullable=False)  # entity name -> [x, y]
+
+    # Relationships
+    document = relationship("Document", back_populates="graph_layout")
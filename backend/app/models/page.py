@@ -0,0 +1,35 @@
+"""DocumentPage model — per-page text (find-in-document) and page embeddings (two-stage search)."""
+
+import uuid
+
+from sqlalchemy import Text, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import Vector
+
+from app.core.database import Base
+
+
+class DocumentPage(Base):
+    __tablename__ = "document_pages"
+    __table_args__ = (
+        # Trigram index: serves ILIKE '%term%' without scanning every page
+        Index(
+            "ix_document_pages_text_trgm",
+            "text",
+            postgresql_using="gin",
+            postgresql_ops={"text": "gin_trgm_ops"},
+        ),
+    )
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    page_number: Mapped[int] = mapped_column(Integer, primary_key=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Mean of the page's chunk embeddings: the coarse stage of two-stage search.
+    # Scanned exactly per document (pages are few), so no ANN index.
+    embedding = mapped_column(Vector(384), nullable=True)
+
+    # Relationships
+    document = relationship("Document", back_populates="pages")
@@ -0,0 +1,33 @@
+"""DocumentSummary model — precomputed summary tree nodes with pgvector embeddings."""
+
+import uuid
+
+from sqlalchemy import String, Text, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from pgvector.sqlalchemy import Vector
+
+from app.core.database import Base
+
+
+class DocumentSummary(Base):
+    """A node of a document's summary tree (chunk-group / section summaries up to the document summary),
+    or the summary of one entity community of the document's graph (kind 'community')."""
+    __tablename__ = "document_summaries"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)  # section | document | community
+    level: Mapped[int] = mapped_column(Integer, nullable=False)  # 1 = summary of a chunk group
+    position: Mapped[int] = mapped_column(Integer, nullable=False)  # order within its level
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    page_start: Mapped[int] = mapped_column(Integer, nullable=False)
+    page_end: Mapped[int] = mapped_column(Integer, nullable=False)
+    embedding = mapped_column(Vector(384), nullable=True)
+
+    # Relationships
+    document = relationship("Document", back_populates="summaries")
@@ -20,3 +20,16 @@ class DocumentResponse(DocumentBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class PageSearchHit(BaseModel):
+    page_number: int
+    match_count: int
+    snippets: list[str]  # HTML-escaped, matches wrapped in <mark>
+
+
+class DocumentSearchResponse(BaseModel):
+    query: str
+    hits: list[PageSearchHit]
+    next_after: int | None  # pass as `after` to fetch the next page of hits
+    took_ms: float
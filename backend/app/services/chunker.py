@@ -8,6 +8,7 @@ class Chunk(BaseModel):
     chunk_index: int
     content: str
     page_number: int
+    section_path: str | None = None
 
 
 class Chunker:
@@ -29,9 +30,20 @@ class Chunker:
             sentences = re.split(r'(?<=[.!?])\s+', text)
             
             current_chunk_text = ""
+            # Offset of the chunk's first new sentence, used to look up its section
+            current_start = 0
+            cursor = 0
             
             for sentence in sentences:
+                position = text.find(sentence, cursor)
+                if position >= 0:
+                    cursor = position + len(sentence)
+                else:
+                    position = cursor
+
                 if len(current_chunk_text) + len(sentence) <= self.chunk_size:
+                    if not current_chunk_text:
+                        current_start = position
                     current_chunk_text += (sentence + " ")
                 else:
                     # Save current chunk
@@ -39,7 +51,8 @@ class Chunker:
                         all_chunks.append(Chunk(
                             chunk_index=chunk_index,
                             content=current_chunk_text.strip(),
-                            page_number=page.page_number
+                            page_number=page.page_number,
+                            section_path=self._section_at(page, current_start)
                         ))
                         chunk_index += 1
                     
@@ -47,17 +60,28 @@ class Chunker:
                     # Taking the last 'overlap' characters from current chunk to start new one
                     overlap_text = current_chunk_text[-self.overlap:] if len(current_chunk_text) > self.overlap else current_chunk_text
                     current_chunk_text = overlap_text + sentence + " "
+                    current_start = position
 
             # Add final chunk for current page
             if current_chunk_text.strip():
                 all_chunks.append(Chunk(
                     chunk_index=chunk_index,
                     content=current_chunk_text.strip(),
-                    page_number=page.page_number
+                    page_number=page.page_number,
+                    section_path=self._section_at(page, current_start)
                 ))
                 chunk_index += 1
 
         return all_chunks
 
+    @staticmethod
+    def _section_at(page: PageContent, offset: int) -> str | None:
+        """Section path active at a character offset of the page text."""
+        path = page.section_path
+        for marker in page.sections:
+            if marker.offset <= offset:
+                path = marker.path
+        return path
+
 
 chunker = Chunker()
@@ -0,0 +1,139 @@
+import re
+import logging
+
+import numpy as np
+from app.services.embeddings import embedding_service
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def strip_overlap(previous: str, text: str, min_overlap: int = 20) -> str:
+    """Remove the longest prefix of `text` that repeats a suffix of `previous`.
+
+    The chunker starts each chunk with the tail of the previous one, so
+    neighbouring chunks would otherwise repeat that text in the prompt.
+    """
+    limit = min(len(previous), len(text))
+    for size in range(limit, min_overlap - 1, -1):
+        if previous.endswith(text[:size]):
+            return text[size:].lstrip()
+    return text
+
+
+def shingle_similarity(a: str, b: str, n: int = 3) -> float:
+    """Jaccard similarity of word n-gram shingles."""
+    def shingles(text: str) -> set:
+        words = re.findall(r"\w+", text.lower())
+        return {tuple(words[i:i + n]) for i in range(max(1, len(words) - n + 1))}
+
+    sa, sb = shingles(a), shingles(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+class ContextPacker:
+    """Fits retrieved context into a token budget before prompt assembly.
+
+    1. trims chunker overlap and drops near-duplicate items,
+    2. scores sentences against the question (one batched embedding call)
+       and drops low-scoring ones,
+    3. fills the budget in rank order, graph facts first.
+    """
+
+    def pack(
+        self,
+        question: str,
+        items: list[dict],
+        graph_facts: list[str],
+        budget: int | None = None
+    ) -> tuple[list[dict], list[str]]:
+        budget = budget or settings.CONTEXT_TOKEN_BUDGET
+        if not items and not graph_facts:
+            return items, graph_facts
+
+        tokens_before = sum(embedding_service.count_tokens([c["content"] for c in items] + graph_facts))
+        items = self._dedupe(items)
+        scored = self._score_sentences(question, items)
+
+        # Graph facts are short and high-signal: give them up to a fifth of the budget
+        packed_facts = []
+        used = 0
+        fact_costs = embedding_service.count_tokens(graph_facts) if graph_facts else []
+        for fact, cost in zip(graph_facts, fact_costs):
+            if used + cost > budget // 5:
+                break
+            packed_facts.append(fact)
+            used += cost
+
+        packed_items = []
+        for item, sentences in zip(items, scored):
+            kept = []
+            for index, sentence, score, cost in sentences:
+                if score < settings.CONTEXT_MIN_SENTENCE_SCORE and kept:
+                    continue
+                if used + cost > budget:
+                    continue
+                kept.append((index, sentence))
+                used += cost
+            if kept:
+                kept.sort()
+                packed_items.append({**item, "content": " ".join(s for _, s in kept)})
+
+        logger.info(
+            f"Context packing: {tokens_before} -> {used} tokens "
+            f"({tokens_before - used} saved, {len(packed_items)} items, {len(packed_facts)} facts)"
+        )
+        return packed_items, packed_facts
+
+    def _dedupe(self, items: list[dict]) -> list[dict]:
+        kept = []
+        for item in items:
+            content = item["content"]
+            for previous in kept:
+                if previous.get("page_number") == item.get("page_number"):
+                    content = strip_overlap(previous["content"], content)
+            if not content.strip():
+                continue
+            if any(shingle_similarity(content, p["content"]) >= settings.CONTEXT_DEDUP_THRESHOLD for p in kept):
+                continue
+            kept.append({**item, "content": content})
+        return kept
+
+    def _score_sentences(self, question: str, items: list[dict]) -> list[list[tuple]]:
+        """Per item: (position, sentence, similarity to question, token cost), best first.
+
+        Web results are kept whole (title / URL / snippet) and never dropped for score.
+        """
+        split = [
+            [item["content"]] if item.get("page_number") == "Web"
+            else [s for s in SENTENCE_SPLIT.split(item["content"]) if s.strip()]
+            for item in items
+        ]
+        flat = [s for sentences in split for s in sentences]
+        if not flat:
+            return [[] for _ in items]
+
+        vectors = np.asarray(embedding_service.embed_texts([question] + flat), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        scores = vectors[1:] @ vectors[0]
+        costs = embedding_service.count_tokens(flat)
+
+        result = []
+        offset = 0
+        for item, sentences in zip(items, split):
+            is_web = item.get("page_number") == "Web"
+            entries = [
+                (i, s, 1.0 if is_web else float(scores[offset + i]), costs[offset + i])
+                for i, s in enumerate(sentences)
+            ]
+            entries.sort(key=lambda e: e[2], reverse=True)
+            result.append(entries)
+            offset += len(sentences)
+        return result
+
+
+context_packer = ContextPacker()
@@ -0,0 +1,233 @@
+import os
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from app.services.graph_backend import GraphBackend, FOCUS_NODE_CAP
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NO_PAGE = -1
+
+
+class _DocumentGraph:
+    """A document's graph as arrays: edge list plus CSR incidence lists (both directions) per node."""
+
+    def __init__(self, names: list[str], relations: list[str], src, dst, rel, page):
+        self.names = names
+        self.relations = relations
+        self.index = {name: i for i, name in enumerate(names)}
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+        self.rel = np.asarray(rel, dtype=np.int32)
+        self.page = np.asarray(page, dtype=np.int32)
+
+        # incident[indptr[i]:indptr[i + 1]] = ids of the edges touching node i
+        m = len(self.src)
+        ends = np.concatenate([self.src, self.dst])
+        edge_ids = np.concatenate([np.arange(m, dtype=np.int32)] * 2)
+        self.incident = edge_ids[np.argsort(ends, kind="stable")]
+        self.degree = np.bincount(ends, minlength=len(names)).astype(np.int32)
+        self.indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+
+    def edge(self, e: int) -> dict:
+        page = int(self.page[e])
+        return {
+            "source": self.names[self.src[e]],
+            "relation": self.relations[self.rel[e]],
+            "target": self.names[self.dst[e]],
+            "page": None if page == NO_PAGE else page,
+            "rel_id": str(e),
+        }
+
+    def incident_edges(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(edge ids, node each edge was reached from) for all edges touching `nodes`."""
+        if not len(nodes):
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        edges = np.concatenate([self.incident[self.indptr[i]:self.indptr[i + 1]] for i in nodes])
+        origins = np.repeat(nodes, self.degree[nodes])
+        return edges, origins
+
+    def other_end(self, edges: np.ndarray, origins: np.ndarray) -> np.ndarray:
+        return np.where(self.src[edges] == origins, self.dst[edges], self.src[edges])
+
+
+class EmbeddedGraphBackend(GraphBackend):
+    """In-process graph store: one compressed .npz of CSR arrays per document, next to the uploads.
+
+    Lookups are array slices with no network round-trip. Writes rewrite the
+    document's file atomically under a per-document lock, so it suits
+    single-process deployments (and tests); multi-worker setups should use Neo4j.
+    """
+
+    def __init__(self):
+        self._cache: OrderedDict[uuid.UUID, _DocumentGraph] = OrderedDict()
+        self._locks: defaultdict[uuid.UUID, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _path(self, document_id: uuid.UUID) -> Path:
+        return settings.upload_path / f"{document_id}.graph.npz"
+
+    async def write_triplets(self, document_id, triplets: list[dict]) -> int:
+        """Merge triplets into the document's graph (same identity as the Neo4j MERGE)."""
+        triplets = [t for t in triplets if t.get("subject") and t.get("relation") and t.get("object")]
+        if not triplets:
+            return 0
+        document_id = uuid.UUID(str(document_id))
+        async with self._locks[document_id]:
+            graph = self._load(document_id)
+            names = list(graph.names) if graph else []
+            relations = list(graph.relations) if graph else []
+            edges = list(zip(graph.src.tolist(), graph.rel.tolist(), graph.page.tolist(), graph.dst.tolist())) if graph else []
+            node_index = {name: i for i, name in enumerate(names)}
+            relation_index = {name: i for i, name in enumerate(relations)}
+            seen = set(edges)
+
+            def intern(value: str, index: dict, values: list) -> int:
+                if value not in index:
+                    index[value] = len(values)
+                    values.append(value)
+                return index[value]
+
+            for t in triplets:
+                page = t.get("page_number")
+                key = (
+                    intern(str(t["subject"]), node_index, names),
+                    intern(str(t["relation"]), relation_index, relations),
+                    page if isinstance(page, int) else NO_PAGE,
+                    intern(str(t["object"]), node_index, names),
+                )
+                if key not in seen:
+                    seen.add(key)
+                    edges.append(key)
+
+            src, rel, page, dst = (list(column) for column in zip(*edges))
+            self._save(document_id, _DocumentGraph(names, relations, src, dst, rel, page))
+        return len(triplets)
+
+    async def delete_document_graph(self, document_id) -> int:
+        document_id = uuid.UUID(str(document_id))
+        async with self._locks[document_id]:
+            graph = self._load(document_id)
+            self._cache.pop(document_id, None)
+            self._path(document_id).unlink(missing_ok=True)
+        deleted = len(graph.names) if graph else 0
+        logger.info(f"Deleted graph of {document_id}: {deleted} entities")
+        return deleted
+
+    async def entity_names(self, document_id) -> list[str]:
+        graph = self._load(uuid.UUID(str(document_id)))
+        return list(graph.names) if graph else []
+
+    async def neighbors(self, document_id, frontier: list[str], fanout: int) -> list[dict]:
+        graph = self._load(uuid.UUID(str(document_id)))
+        if not graph:
+            return []
+        rows = []
+        for name in frontier:
+            i = graph.index.get(name)
+            if i is None:
+                continue
+            edges, origins = graph.incident_edges(np.array([i]))
+            others = graph.other_end(edges, origins)
+            for k in np.argsort(graph.degree[others], kind="stable")[:fanout]:
+                edge = graph.edge(int(edges[k]))
+                rows.append({
+                    "subject": edge["source"],
+                    "relation": edge["relation"],
+                    "object": edge["target"],
+                    "page": edge["page"],
+                    "neighbor": graph.names[others[k]],
+                    "degree": int(graph.degree[others[k]]),
+                    "rel_id": edge["rel_id"],
+                })
+        return rows
+
+    async def links(self, document_id, top_n=None, focus=None, depth=1, cursor=None, limit=None):
+        graph = self._load(uuid.UUID(str(document_id)))
+        if not graph:
+            return
+
+        if focus:
+            nodes = self._neighbourhood(graph, focus, depth)
+        elif top_n:
+            nodes = np.argsort(-graph.degree, kind="stable")[:top_n]
+        else:
+            nodes = None
+
+        if nodes is None:
+            edges = np.arange(len(graph.src))
+        else:
+            member = np.zeros(len(graph.names), dtype=bool)
+            member[nodes] = True
+            edges = np.flatnonzero(member[graph.src] & member[graph.dst])
+        if cursor is not None:
+            edges = edges[edges > int(cursor)]
+        if limit:
+            edges = edges[:limit]
+
+        for e in edges:
+            edge = graph.edge(int(e))
+            yield {"source": edge["source"], "relation": edge["relation"], "target": edge["target"], "rel_id": edge["rel_id"]}
+
+    @staticmethod
+    def _neighbourhood(graph: _DocumentGraph, focus: str, depth: int) -> np.ndarray:
+        """The focus node plus up to FOCUS_NODE_CAP nodes within `depth` undirected hops (BFS order)."""
+        start = graph.index.get(focus)
+        if start is None:
+            return np.empty(0, dtype=np.int32)
+        visited = np.zeros(len(graph.names), dtype=bool)
+        visited[start] = True
+        found = [start]
+        frontier = np.array([start], dtype=np.int32)
+        for _ in range(depth):
+            edges, origins = graph.incident_edges(frontier)
+            others = graph.other_end(edges, origins)
+            others = others[~visited[others]]
+            frontier = others[np.sort(np.unique(others, return_index=True)[1])]
+            visited[frontier] = True
+            found.extend(frontier.tolist())
+            if len(found) > FOCUS_NODE_CAP or not len(frontier):
+                break
+        return np.asarray(found[:FOCUS_NODE_CAP + 1], dtype=np.int32)
+
+    def _load(self, document_id: uuid.UUID) -> _DocumentGraph | None:
+        if document_id in self._cache:
+            self._cache.move_to_end(document_id)
+            return self._cache[document_id]
+        path = self._path(document_id)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            graph = _DocumentGraph(
+                data["names"].tolist(), data["relations"].tolist(),
+                data["src"], data["dst"], data["rel"], data["page"]
+            )
+        self._remember(document_id, graph)
+        return graph
+
+    def _save(self, document_id: uuid.UUID, graph: _DocumentGraph):
+        path = self._path(document_id)
+        # Write to a temp file and swap in, so readers never see a half-written graph
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez_compressed(
+                f,
+                names=np.array(graph.names, dtype=str),
+                relations=np.array(graph.relations, dtype=str),
+                src=graph.src, dst=graph.dst, rel=graph.rel, page=graph.page,
+            )
+        os.replace(tmp, path)
+        self._remember(document_id, graph)
+        logger.info(f"Embedded graph for {document_id}: {len(graph.names)} entities, {len(graph.src)} relationships")
+
+    def _remember(self, document_id: uuid.UUID, graph: _DocumentGraph):
+        self._cache[document_id] = graph
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > settings.EMBEDDED_GRAPH_CACHE_SIZE:
+            self._cache.popitem(last=False)
@@ -18,5 +18,12 @@ class EmbeddingService:
         embeddings = self.model.encode(texts)
         return embeddings.tolist()
 
+    def count_tokens(self, texts: list[str]) -> list[int]:
+        """Token counts under the embedding model's tokenizer (no special tokens, no truncation)."""
+        if self.model is None:
+            raise RuntimeError("Embedding model not initialized")
+        encoded = self.model.tokenizer(texts, add_special_tokens=False, truncation=False)
+        return [len(ids) for ids in encoded["input_ids"]]
+
 
 embedding_service = EmbeddingService()
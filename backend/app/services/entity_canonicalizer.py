@@ -0,0 +1,216 @@
+import re
+import uuid
+import logging
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entity import EntityAlias
+from app.services.embeddings import embedding_service
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARTICLES = {"the", "a", "an"}
+# "Deoxyribonucleic acid (DNA)": the outer name and an acronym-like parenthetical are aliases
+PARENTHETICAL = re.compile(r"^(?P<outer>.+?)\s*\((?P<inner>[^()]+)\)\s*$")
+# Rows of the pairwise similarity computed at once
+BLOCK = 1024
+# Words ending in "s" that are not plurals
+NOT_PLURAL = {"news", "means", "series", "species", "lens", "bias", "gas", "chaos", "atlas", "canvas"}
+ORDINALS = {
+    "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth",
+    "primary", "secondary", "tertiary", "quaternary",
+}
+ROMAN = re.compile(r"^[IVXLC]+$")
+
+
+def _singular(word: str) -> str:
+    if len(word) <= 3 or word in NOT_PLURAL or word.endswith(("ss", "us", "is", "ics")):
+        return word
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def canonical_key(name: str) -> str:
+    """Rule-based normal form: case, punctuation, leading articles and a simple plural on the last word removed."""
+    words = re.findall(r"\w+", name.lower())
+    while len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    if words:
+        words[-1] = _singular(words[-1])
+    return " ".join(words)
+
+
+def distinguishers(name: str) -> frozenset[str]:
+    """Number, roman-numeral and ordinal tokens ("Type 1", "polymerase III", "first law").
+
+    Neither rule keys ("Vitamin B (B6)") nor sentence embeddings reliably separate
+    names that differ only in these, so names whose distinguishers differ are never merged.
+    """
+    tokens = re.findall(r"\w+", name)
+    return frozenset(
+        t.lower() for t in tokens
+        if any(c.isdigit() for c in t) or ROMAN.match(t) or t.lower() in ORDINALS
+    )
+
+
+def name_parts(name: str) -> list[str]:
+    """Surface forms a name stands for: itself, plus the parts of "Outer name (ACRONYM)".
+
+    Other parentheticals disambiguate ("Mercury (planet)", "Mercury (element)"), so
+    their outer name is not a form of the entity.
+    """
+    parts = [name]
+    match = PARENTHETICAL.match(name)
+    if match:
+        inner = match.group("inner").strip()
+        if " " not in inner and len(inner) <= 10 and inner.upper() == inner:
+            parts += [match.group("outer").strip(), inner]
+    return parts
+
+
+def name_keys(name: str) -> list[str]:
+    """Keys under which a surface name is considered the same entity."""
+    return [k for k in (canonical_key(part) for part in name_parts(name)) if k]
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class EntityCanonicalizer:
+    """Merges surface variants of a document's entity names before the graph write.
+
+    Names sharing a rule-based key ("DNA", "the DNA", "Deoxyribonucleic acid (DNA)")
+    are merged first; the remaining groups are merged when their keys' embeddings
+    are nearly identical. Each group takes its most frequent surface form as the
+    canonical name; the other forms are kept as aliases (`document_entity_aliases`).
+    """
+
+    def cluster(self, names: list[str], counts: Counter) -> dict[str, str]:
+        """Map every surface name to its canonical name."""
+        groups = _UnionFind(len(names))
+        # Members of a group share their distinguishers, so the root's stand for the group
+        marks = [distinguishers(name) for name in names]
+        first_with_key: dict[str, int] = {}
+        for i, name in enumerate(names):
+            for key in name_keys(name):
+                if key not in first_with_key:
+                    first_with_key[key] = i
+                elif marks[groups.find(first_with_key[key])] == marks[i]:
+                    groups.union(first_with_key[key], i)
+
+        roots = sorted({groups.find(i) for i in range(len(names))})
+        if settings.ENTITY_CANONICAL_THRESHOLD < 1.0 and len(roots) > 1:
+            self._merge_similar(names, roots, groups)
+
+        members: dict[int, list[int]] = {}
+        for i in range(len(names)):
+            members.setdefault(groups.find(i), []).append(i)
+        mapping = {}
+        for indexes in members.values():
+            # Most frequent form; ties prefer names without a parenthetical, then the first seen
+            best = min(indexes, key=lambda i: (-counts[names[i]], "(" in names[i], i))
+            for i in indexes:
+                mapping[names[i]] = names[best]
+        return mapping
+
+    def _merge_similar(self, names: list[str], roots: list[int], groups: _UnionFind):
+        """Merge rule groups by embedding similarity, complete linkage.
+
+        Two groups merge only if every pair of their rule keys is similar and has the
+        same distinguishers, so a chain A~B~C cannot join A and C through B.
+        """
+        threshold = settings.ENTITY_CANONICAL_THRESHOLD
+        vectors = np.asarray(
+            embedding_service.embed_texts([canonical_key(names[r]) for r in roots]), dtype=np.float32
+        )
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        marks = [distinguishers(names[r]) for r in roots]
+
+        candidates = []
+        for start in range(0, len(roots), BLOCK):
+            similarity = vectors[start:start + BLOCK] @ vectors.T
+            for a, b in zip(*np.nonzero(similarity >= threshold)):
+                a = start + int(a)
+                if a < b and marks[a] == marks[b]:
+                    candidates.append((float(similarity[a - start, b]), a, int(b)))
+        candidates.sort(reverse=True)
+
+        # Members (positions in `roots`) of each merged group, keyed by its representative position
+        cluster = list(range(len(roots)))
+        members = {i: [i] for i in range(len(roots))}
+        for _, a, b in candidates:
+            ca, cb = cluster[a], cluster[b]
+            if ca == cb:
+                continue
+            left, right = members[ca], members[cb]
+            if any(marks[i] != marks[j] for i in left for j in right):
+                continue
+            if (vectors[left] @ vectors[right].T).min() < threshold:
+                continue
+            for i in right:
+                cluster[i] = ca
+            left.extend(right)
+            del members[cb]
+            groups.union(roots[a], roots[b])
+
+    def canonicalize(self, document_id: uuid.UUID, triplets: list[dict]) -> tuple[list[dict], dict[str, str]]:
+        """Rewrite triplets onto canonical names; returns (triplets, alias -> canonical)."""
+        triplets = [t for t in triplets if t.get("subject") and t.get("relation") and t.get("object")]
+        counts = Counter(str(t[k]).strip() for t in triplets for k in ("subject", "object"))
+        names = list(counts)
+        mapping = self.cluster(names, counts) if names else {}
+
+        canonical_triplets = []
+        seen = set()
+        for t in triplets:
+            subject = mapping[str(t["subject"]).strip()]
+            obj = mapping[str(t["object"]).strip()]
+            key = (subject, t["relation"], obj, t.get("page_number"))
+            # Merging can turn a relation between two variants into a self-loop
+            if subject == obj or key in seen:
+                continue
+            seen.add(key)
+            canonical_triplets.append({**t, "subject": subject, "object": obj})
+
+        # The parts of "Deoxyribonucleic acid (DNA)" are also mentioned on their own in questions
+        entities = set(mapping.values())
+        aliases = {}
+        for name, canonical in mapping.items():
+            for alias in name_parts(name):
+                if alias not in entities:
+                    aliases.setdefault(alias, canonical)
+        entities_after = len(entities)
+        logger.info(
+            f"Entity canonicalization for {document_id}: entities {len(names)} -> {entities_after}, "
+            f"relationships {len(triplets)} -> {len(canonical_triplets)}"
+        )
+        return canonical_triplets, aliases
+
+    async def load_aliases(self, document_id: uuid.UUID, db: AsyncSession) -> dict[str, str]:
+        result = await db.execute(
+            select(EntityAlias.alias, EntityAlias.canonical).where(EntityAlias.document_id == document_id)
+        )
+        return {row.alias: row.canonical for row in result.all()}
+
+
+entity_canonicalizer = EntityCanonicalizer()
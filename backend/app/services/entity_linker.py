@@ -0,0 +1,115 @@
+import re
+import uuid
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.entity import DocumentEntity
+from app.services.embeddings import embedding_service
+from app.services.graph_service import graph_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "by", "with", "from", "and", "or", "but",
+    "is", "are", "was", "were", "be", "been", "do", "does", "did", "how", "what", "why", "when",
+    "where", "which", "who", "whom", "this", "that", "these", "those", "it", "its", "can", "could",
+    "would", "should", "will", "about", "explain", "describe", "tell", "me", "my", "i", "you", "we",
+}
+
+
+class EntityLinker:
+    """Links question phrases to graph entities by embedding similarity.
+
+    Entity names are embedded once at ingestion (`document_entities`); at query
+    time the per-document name matrix is held in memory (LRU) and compared with
+    the question's n-gram embeddings, which are computed in the same batch as
+    the question embedding itself.
+    """
+
+    def __init__(self):
+        # document id -> (normalized name matrix, names)
+        self._cache: OrderedDict[uuid.UUID, tuple[np.ndarray, list[str]]] = OrderedDict()
+
+    @staticmethod
+    def candidate_ngrams(question: str, max_n: int = 3) -> list[str]:
+        """Word 1..3-grams that neither start nor end with a stopword, longest first."""
+        words = re.findall(r"\w+", question.lower())
+        grams = []
+        for n in range(max_n, 0, -1):
+            for i in range(len(words) - n + 1):
+                gram = words[i:i + n]
+                if gram[0] in STOPWORDS or gram[-1] in STOPWORDS or len(" ".join(gram)) < 3:
+                    continue
+                grams.append(" ".join(gram))
+        return list(dict.fromkeys(grams))[:settings.ENTITY_LINK_MAX_NGRAMS]
+
+    async def store(self, document_id: uuid.UUID, names: list[str], db: AsyncSession):
+        """Embed a document's entity names (one batch) and persist them."""
+        names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+        if not names:
+            return
+        vectors = embedding_service.embed_texts(names)
+        await db.execute(insert(DocumentEntity).values([
+            {"id": uuid.uuid4(), "document_id": document_id, "name": name, "embedding": vector}
+            for name, vector in zip(names, vectors)
+        ]))
+        self._remember(document_id, vectors, names)
+
+    def invalidate(self, document_id: uuid.UUID):
+        self._cache.pop(document_id, None)
+
+    async def link(
+        self,
+        document_id: uuid.UUID,
+        ngram_vectors: list[list[float]],
+        db: AsyncSession
+    ) -> list[str]:
+        """Entities whose name embedding is close to any question n-gram, best first."""
+        if not ngram_vectors:
+            return []
+        matrix, names = await self._load(document_id, db)
+        if not names:
+            return []
+
+        queries = np.asarray(ngram_vectors, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        best = (matrix @ queries.T).max(axis=1)
+
+        order = np.argsort(-best)[:settings.ENTITY_LINK_MAX_ENTITIES]
+        return [names[i] for i in order if best[i] >= settings.ENTITY_LINK_THRESHOLD]
+
+    async def _load(self, document_id: uuid.UUID, db: AsyncSession) -> tuple[np.ndarray, list[str]]:
+        if document_id in self._cache:
+            self._cache.move_to_end(document_id)
+            return self._cache[document_id]
+
+        result = await db.execute(
+            select(DocumentEntity.name, DocumentEntity.embedding)
+            .where(DocumentEntity.document_id == document_id)
+        )
+        rows = result.all()
+        if rows:
+            names = [r.name for r in rows]
+            vectors = [list(r.embedding) for r in rows]
+        else:
+            # Documents ingested before entity embeddings existed: embed the graph's names in memory
+            names = await graph_backend.entity_names(document_id)
+            vectors = embedding_service.embed_texts(names) if names else []
+        return self._remember(document_id, vectors, names)
+
+    def _remember(self, document_id: uuid.UUID, vectors: list, names: list[str]) -> tuple[np.ndarray, list[str]]:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, settings.EMBEDDING_DIMENSION)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        self._cache[document_id] = (matrix, names)
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > settings.ENTITY_MATCHER_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return matrix, names
+
+
+entity_linker = EntityLinker()
@@ -0,0 +1,101 @@
+import re
+import uuid
+import logging
+from collections import OrderedDict, deque
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.graph_service import graph_backend
+from app.services.entity_canonicalizer import entity_canonicalizer
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, collapse punctuation / whitespace to single spaces, pad so matches align on words."""
+    return " " + " ".join(re.findall(r"\w+", text.lower())) + " "
+
+
+class AhoCorasick:
+    """Multi-pattern automaton: finds every pattern occurring in a text in one linear pass."""
+
+    def __init__(self, patterns: list[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append(index)
+
+        # Breadth-first failure links; outputs of the fallback state are inherited
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        """Indexes of the patterns found in `text`."""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.update(self._out[state])
+        return found
+
+
+class EntityMatcher:
+    """Per-document automaton over the document's graph entity names, cached in memory (LRU).
+
+    Built at ingestion (or lazily from Neo4j on first use) and invalidated on
+    reprocess / delete. Names match on whole words after normalization.
+    """
+
+    def __init__(self):
+        # document id -> (automaton, entity names in pattern order)
+        self._cache: OrderedDict[uuid.UUID, tuple[AhoCorasick, list[str]]] = OrderedDict()
+
+    def build(self, document_id: uuid.UUID, names: list[str], aliases: dict[str, str] | None = None):
+        """Patterns are the entity names plus their merged aliases (which report the canonical name)."""
+        by_pattern: dict[str, str] = {}
+        for name, entity in [(n, n) for n in names] + list((aliases or {}).items()):
+            pattern = normalize(name)
+            if pattern.strip():
+                by_pattern.setdefault(pattern, entity)
+        self._cache[document_id] = (AhoCorasick(list(by_pattern)), list(by_pattern.values()))
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > settings.ENTITY_MATCHER_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        logger.info(f"Entity matcher for {document_id}: {len(by_pattern)} entities")
+
+    def invalidate(self, document_id: uuid.UUID):
+        self._cache.pop(document_id, None)
+
+    async def match(self, text: str, document_id: uuid.UUID, db: AsyncSession | None = None) -> list[str]:
+        if document_id not in self._cache:
+            aliases = await entity_canonicalizer.load_aliases(document_id, db) if db is not None else None
+            self.build(document_id, await graph_backend.entity_names(document_id), aliases)
+        self._cache.move_to_end(document_id)
+
+        automaton, names = self._cache[document_id]
+        # Several aliases of one entity can match: report it once
+        return list(dict.fromkeys(names[i] for i in sorted(automaton.find(normalize(text)))))
+
+
+entity_matcher = EntityMatcher()
@@ -0,0 +1,45 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+# Entities pulled in around a `focus` entity by links()
+FOCUS_NODE_CAP = 500
+
+
+class GraphBackend(ABC):
+    """Storage operations behind GraphRAG, implemented by Neo4j and by the embedded CSR store.
+
+    Entities are namespaced per document; every operation is scoped to one document.
+    Links are dicts with `source`, `relation`, `target` and a backend-specific string
+    `rel_id` that orders them for cursor pagination.
+    """
+
+    @abstractmethod
+    async def write_triplets(self, document_id: uuid.UUID, triplets: list[dict]) -> int:
+        """Upsert (subject, relation, object, page_number) triplets; returns how many were valid."""
+
+    @abstractmethod
+    async def delete_document_graph(self, document_id: uuid.UUID) -> int:
+        """Delete a document's entities and relationships; returns the number of entities removed."""
+
+    @abstractmethod
+    async def entity_names(self, document_id: uuid.UUID) -> list[str]:
+        """All entity names of the document (loaded by the entity matcher)."""
+
+    @abstractmethod
+    async def neighbors(self, document_id: uuid.UUID, frontier: list[str], fanout: int) -> list[dict]:
+        """One hop around each frontier entity, at most `fanout` relationships each, lowest-degree
+        neighbours first. Rows: subject, relation, object, page, neighbor, degree, rel_id."""
+
+    @abstractmethod
+    def links(
+        self,
+        document_id: uuid.UUID,
+        top_n: int | None = None,
+        focus: str | None = None,
+        depth: int = 1,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """Stream the document's links in `rel_id` order: all of them, those among the `top_n`
+        highest-degree entities, or those within `depth` hops of `focus`; after `cursor`, at most `limit`."""
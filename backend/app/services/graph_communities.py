@@ -0,0 +1,149 @@
+import re
+import uuid
+import logging
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.summary import DocumentSummary
+from app.services.embeddings import embedding_service
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TOPICS = r"(topics|concepts|ideas|themes|chapters|sections|parts|everything)"
+# Questions about how the document's topics relate (not about two named entities: graph expansion answers those)
+GLOBAL_SCOPE = re.compile(
+    r"\b(big picture|as a whole|across (the|all) (document|book|text|chapters|sections))\b"
+    rf"|\b{TOPICS}\b.*\b(relate|connect|fit together|tie together|interact)"
+    rf"|\b(relate|connect|connections?|relationships?|links?)\b.*\b(between|among)\b.*\b{TOPICS}\b",
+    re.IGNORECASE
+)
+# Facts per community shown to the summarizer
+MAX_FACTS_PER_COMMUNITY = 25
+
+
+def label_propagation(n: int, edges: list[tuple[int, int]], seed: int = 0, max_iterations: int = 20) -> np.ndarray:
+    """Community label per node (0..k-1); asynchronous label propagation, deterministic for a seed."""
+    neighbours: list[list[int]] = [[] for _ in range(n)]
+    for a, b in edges:
+        if a != b:
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+
+    rng = np.random.default_rng(seed)
+    labels = list(range(n))
+    for _ in range(max_iterations):
+        changed = False
+        for i in rng.permutation(n):
+            if not neighbours[i]:
+                continue
+            counts = Counter(labels[j] for j in neighbours[i])
+            top = max(counts.values())
+            # Keep the current label when it is among the most frequent (convergence criterion)
+            if counts.get(labels[i]) == top:
+                continue
+            labels[i] = min(label for label, count in counts.items() if count == top)
+            changed = True
+        if not changed:
+            break
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def detect_communities(triplets: list[dict]) -> list[dict]:
+    """Group a document's triplets into entity communities, largest first.
+
+    Each community carries its entities (most connected first), its internal
+    facts and the page range they come from.
+    """
+    triplets = [t for t in triplets if t.get("subject") and t.get("relation") and t.get("object")]
+    names = list(dict.fromkeys(str(t[k]) for t in triplets for k in ("subject", "object")))
+    index = {name: i for i, name in enumerate(names)}
+    edges = [(index[str(t["subject"])], index[str(t["object"])]) for t in triplets]
+    labels = label_propagation(len(names), edges)
+    degree = Counter(i for edge in edges for i in edge)
+
+    communities: dict[int, dict] = {}
+    for t, (a, b) in zip(triplets, edges):
+        if labels[a] != labels[b]:
+            continue
+        community = communities.setdefault(int(labels[a]), {"entities": set(), "facts": [], "pages": []})
+        community["entities"].update((a, b))
+        community["facts"].append(f"{t['subject']} {t['relation']} {t['object']}")
+        if isinstance(t.get("page_number"), int):
+            community["pages"].append(t["page_number"])
+
+    result = []
+    for community in communities.values():
+        if len(community["entities"]) < settings.COMMUNITY_MIN_SIZE:
+            continue
+        members = sorted(community["entities"], key=lambda i: (-degree[i], i))
+        result.append({
+            "entities": [names[i] for i in members],
+            "facts": list(dict.fromkeys(community["facts"])),
+            "page_start": min(community["pages"], default=1),
+            "page_end": max(community["pages"], default=1),
+        })
+    result.sort(key=lambda c: len(c["entities"]), reverse=True)
+    return result
+
+
+class GraphCommunityService:
+    """Community summaries for global questions, built once at ingestion.
+
+    Label propagation over the document's entity graph (in memory, from the
+    triplets just written) finds clusters of related concepts; each of the
+    largest clusters gets a short LLM summary stored as a `community`
+    DocumentSummary with its embedding, retrieved like the summary tree.
+    """
+
+    @staticmethod
+    def is_global(question: str) -> bool:
+        """Whether a question asks how the document's topics relate overall."""
+        return bool(GLOBAL_SCOPE.search(question))
+
+    async def build(self, document_id: uuid.UUID, triplets: list[dict], db: AsyncSession) -> int:
+        communities = detect_communities(triplets)[:settings.COMMUNITY_MAX_SUMMARIES]
+        rows = []
+        for position, community in enumerate(communities):
+            summary = await self._summarize(community["entities"], community["facts"][:MAX_FACTS_PER_COMMUNITY])
+            rows.append({
+                "id": uuid.uuid4(),
+                "document_id": document_id,
+                "kind": "community",
+                "level": 1,
+                "position": position,
+                "content": f"{summary}\n(Concepts: {', '.join(community['entities'][:12])})",
+                "page_start": community["page_start"],
+                "page_end": community["page_end"],
+            })
+
+        if rows:
+            embeddings = embedding_service.embed_texts([r["content"] for r in rows])
+            for row, vector in zip(rows, embeddings):
+                row["embedding"] = vector
+            await db.execute(insert(DocumentSummary).values(rows))
+
+        logger.info(f"Graph communities for {document_id}: {len(rows)} summarized")
+        return len(rows)
+
+    async def _summarize(self, entities: list[str], facts: list[str]) -> str:
+        from app.services.llm import llm_service
+
+        fact_lines = "\n".join(facts)
+        prompt = f"""
+        The following facts describe one group of closely related concepts from study material.
+        In 2-4 sentences, explain what this group is about and how its concepts relate to each other.
+        Do not add information.
+
+        Concepts: {", ".join(entities[:20])}
+        Facts:
+        {fact_lines}
+        """
+        response = await llm_service.call_ollama(prompt)
+        return response.strip()
+
+
+graph_community_service = GraphCommunityService()
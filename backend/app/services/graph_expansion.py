@@ -0,0 +1,90 @@
+import math
+import uuid
+import logging
+from collections import Counter, OrderedDict
+
+from app.services.graph_service import graph_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def score_facts(edges: list[dict], chunk_pages: list[int]) -> list[tuple[float, dict]]:
+    """Score walked edges: hop decay x (page proximity, low degree, rare relation)."""
+    relation_counts = Counter(e["relation"] for e in edges)
+    scored = []
+    for edge in edges:
+        if chunk_pages and isinstance(edge["page"], int):
+            distance = min(abs(edge["page"] - p) for p in chunk_pages)
+            proximity = 1.0 / (1.0 + distance)
+        else:
+            proximity = 0.0
+        degree = 1.0 / math.log(2.0 + edge["degree"])
+        rarity = 1.0 / (1.0 + math.log(relation_counts[edge["relation"]]))
+        relevance = 0.5 * proximity + 0.25 * degree + 0.25 * rarity
+        scored.append((settings.GRAPH_HOP_DECAY ** (edge["hop"] - 1) * relevance, edge))
+    scored.sort(key=lambda s: s[0], reverse=True)
+    return scored
+
+
+class GraphExpansionService:
+    """Bounded k-hop expansion from the question's entities, ranked and cached.
+
+    The walk (which depends only on the document and the entity set) is cached;
+    scoring against the retrieved chunk pages runs per question.
+    """
+
+    def __init__(self):
+        self._cache: OrderedDict[tuple[uuid.UUID, frozenset], list[dict]] = OrderedDict()
+
+    async def expand(self, document_id: uuid.UUID, entities: list[str], chunk_pages: list[int]) -> list[str]:
+        if not entities:
+            return []
+        edges = await self._walk(document_id, entities)
+        facts = []
+        for _, edge in score_facts(edges, chunk_pages)[:settings.GRAPH_MAX_FACTS]:
+            facts.append(f"- {edge['subject']} {edge['relation']} {edge['object']} (Found on Page {edge['page']})")
+        return facts
+
+    def invalidate(self, document_id: uuid.UUID):
+        for key in [k for k in self._cache if k[0] == document_id]:
+            del self._cache[key]
+
+    async def _walk(self, document_id: uuid.UUID, entities: list[str]) -> list[dict]:
+        key = (document_id, frozenset(entities))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        edges: dict[str, dict] = {}
+        visited = set(entities)
+        frontier = list(entities)
+        for hop in range(1, settings.GRAPH_MAX_HOPS + 1):
+            if not frontier:
+                break
+            records = await graph_backend.neighbors(document_id, frontier, settings.GRAPH_FANOUT)
+            next_frontier = []
+            for r in records:
+                if r["rel_id"] not in edges:
+                    edges[r["rel_id"]] = {
+                        "subject": r["subject"],
+                        "relation": r["relation"],
+                        "object": r["object"],
+                        "page": r["page"],
+                        "degree": r["degree"],
+                        "hop": hop,
+                    }
+                if r["neighbor"] not in visited:
+                    visited.add(r["neighbor"])
+                    next_frontier.append(r["neighbor"])
+            frontier = next_frontier
+
+        walked = list(edges.values())
+        self._cache[key] = walked
+        while len(self._cache) > settings.GRAPH_EXPANSION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        logger.info(f"Graph expansion for {len(entities)} entities: {len(walked)} edges, {len(visited)} entities")
+        return walked
+
+
+graph_expansion_service = GraphExpansionService()
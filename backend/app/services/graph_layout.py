@@ -0,0 +1,127 @@
+import asyncio
+import uuid
+import logging
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.graph_layout import DocumentGraphLayout
+from app.services.graph_service import graph_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ideal edge length in canvas units (react-force-graph draws nodes at roughly this scale)
+EDGE_LENGTH = 30.0
+# Rows of the pairwise repulsion computed at once: memory is BLOCK x n floats
+BLOCK = 1024
+
+
+def spectral_layout(n: int, edges: np.ndarray) -> np.ndarray:
+    """Two smallest non-trivial eigenvectors of the normalized Laplacian as (n, 2) positions."""
+    adjacency = np.zeros((n, n), dtype=np.float64)
+    adjacency[edges[:, 0], edges[:, 1]] = 1.0
+    adjacency = np.maximum(adjacency, adjacency.T)
+    np.fill_diagonal(adjacency, 0.0)
+    degree = adjacency.sum(axis=1)
+    inv_sqrt = np.where(degree > 0, 1.0 / np.sqrt(np.maximum(degree, 1e-12)), 0.0)
+    laplacian = np.eye(n) - inv_sqrt[:, None] * adjacency * inv_sqrt[None, :]
+    _, vectors = np.linalg.eigh(laplacian)
+    return vectors[:, 1:3]
+
+
+def force_layout(n: int, edges: np.ndarray, init: np.ndarray, iterations: int) -> np.ndarray:
+    """Vectorized Fruchterman-Reingold refinement with unit ideal edge length and weak gravity."""
+    pos = init.astype(np.float32, copy=True)
+    src, dst = edges[:, 0], edges[:, 1]
+    temperature = max(np.sqrt(n) / 4.0, 1.0)
+    cooling = (0.05 / temperature) ** (1.0 / max(iterations, 1))
+    for _ in range(iterations):
+        disp = np.zeros_like(pos)
+        # Repulsion k^2 / d between all pairs: sum_j (p_i - p_j) / d_ij^2 as two matrix products,
+        # blocked to bound memory
+        sq = (pos ** 2).sum(axis=1)
+        for start in range(0, n, BLOCK):
+            block = pos[start:start + BLOCK]
+            dist2 = sq[start:start + BLOCK, None] + sq[None, :] - 2.0 * (block @ pos.T)
+            weights = 1.0 / np.maximum(dist2, 1e-4)
+            weights[np.arange(len(block)), np.arange(start, start + len(block))] = 0.0
+            disp[start:start + BLOCK] = block * weights.sum(axis=1, keepdims=True) - weights @ pos
+        # Attraction d^2 / k along edges
+        delta = pos[src] - pos[dst]
+        force = delta * np.linalg.norm(delta, axis=1, keepdims=True)
+        np.add.at(disp, src, -force)
+        np.add.at(disp, dst, force)
+        # Gravity keeps disconnected components from drifting apart
+        disp -= 0.05 * pos
+        length = np.maximum(np.linalg.norm(disp, axis=1, keepdims=True), 1e-9)
+        pos += disp / length * np.minimum(length, temperature)
+        temperature *= cooling
+    return pos
+
+
+def compute_layout(names: list[str], links: list[tuple[str, str]], seed: int = 0) -> dict[str, list[float]]:
+    """Deterministic 2D coordinates for a graph given by node names and (source, target) links."""
+    if not names:
+        return {}
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    edges = np.asarray(
+        [(index[s], index[t]) for s, t in links if s in index and t in index and s != t], dtype=np.int64
+    ).reshape(-1, 2)
+
+    rng = np.random.default_rng(seed)
+    spread = np.sqrt(n)
+    if 2 < n <= settings.GRAPH_LAYOUT_SPECTRAL_MAX_NODES and len(edges):
+        init = spectral_layout(n, edges)
+        init = init / np.maximum(np.abs(init).max(axis=0), 1e-12) * spread
+        init += rng.normal(scale=0.01 * spread, size=init.shape)  # break ties between symmetric nodes
+    else:
+        init = rng.uniform(-spread, spread, size=(n, 2))
+
+    pos = force_layout(n, edges, init, settings.GRAPH_LAYOUT_ITERATIONS)
+    # Scale so the median link is EDGE_LENGTH long
+    lengths = np.linalg.norm(pos[edges[:, 0]] - pos[edges[:, 1]], axis=1) if len(edges) else np.ones(1)
+    pos = (pos - pos.mean(axis=0)) * (EDGE_LENGTH / max(float(np.median(lengths)), 1e-6))
+    return {name: [round(float(x), 1), round(float(y), 1)] for name, (x, y) in zip(names, pos)}
+
+
+class GraphLayoutService:
+    """Knowledge map coordinates computed once per document graph version.
+
+    Ingestion computes the layout right after the graph is built; documents
+    whose stored layout predates their current graph version are laid out on
+    first view.
+    """
+
+    async def positions(self, document_id: uuid.UUID, graph_version: int, db: AsyncSession) -> dict[str, list[float]]:
+        result = await db.execute(
+            select(DocumentGraphLayout).where(DocumentGraphLayout.document_id == document_id)
+        )
+        layout = result.scalar_one_or_none()
+        if layout and layout.graph_version == graph_version:
+            return layout.positions
+        return await self.compute(document_id, graph_version, db)
+
+    async def compute(self, document_id: uuid.UUID, graph_version: int, db: AsyncSession) -> dict[str, list[float]]:
+        links = [(link["source"], link["target"]) async for link in graph_backend.links(document_id)]
+        names = list(dict.fromkeys(name for link in links for name in link))
+        # CPU-bound: keep the event loop free while numpy works
+        positions = await asyncio.to_thread(compute_layout, names, links)
+
+        await db.execute(
+            insert(DocumentGraphLayout)
+            .values(document_id=document_id, graph_version=graph_version, positions=positions)
+            .on_conflict_do_update(
+                index_elements=[DocumentGraphLayout.document_id],
+                set_={"graph_version": graph_version, "positions": positions}
+            )
+        )
+        await db.commit()
+        logger.info(f"Graph layout for {document_id} v{graph_version}: {len(names)} nodes, {len(links)} links")
+        return positions
+
+
+graph_layout_service = GraphLayoutService()
@@ -0,0 +1,100 @@
+import logging
+from typing import Awaitable, Callable
+from app.services.graph_service import graph_service
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _namespace_entities():
+    """Move relationships of global entities onto per-document copies, in batches."""
+    while True:
+        records = await graph_service.execute_write(
+            """
+            MATCH (s:Entity)-[r:RELATES_TO]->(o:Entity)
+            WHERE s.doc_id IS NULL OR o.doc_id IS NULL
+            WITH s, r, o LIMIT $limit
+            MERGE (s2:Entity {doc_id: r.doc_id, name: s.name})
+            MERGE (o2:Entity {doc_id: r.doc_id, name: o.name})
+            MERGE (s2)-[:RELATES_TO {relation: r.relation, page: r.page, doc_id: r.doc_id}]->(o2)
+            DELETE r
+            RETURN count(*) AS moved
+            """,
+            {"limit": settings.GRAPH_WRITE_BATCH_SIZE}
+        )
+        if not records or records[0]["moved"] < settings.GRAPH_WRITE_BATCH_SIZE:
+            break
+
+    while True:
+        records = await graph_service.execute_write(
+            """
+            MATCH (e:Entity) WHERE e.doc_id IS NULL AND NOT (e)--()
+            WITH e LIMIT $limit
+            DELETE e
+            RETURN count(*) AS deleted
+            """,
+            {"limit": settings.GRAPH_WRITE_BATCH_SIZE}
+        )
+        if not records or records[0]["deleted"] < settings.GRAPH_WRITE_BATCH_SIZE:
+            break
+
+
+# Versioned Neo4j schema steps, applied in order and recorded on a :SchemaVersion node.
+# Statements use IF NOT EXISTS, so re-running a step (or two workers racing) is harmless;
+# callables are batched data migrations that are equally safe to resume.
+MIGRATIONS: list[tuple[int, str, list[str | Callable[[], Awaitable[None]]]]] = [
+    (
+        1,
+        "unique Entity.name (index-backed MERGE and name lookups)",
+        ["CREATE CONSTRAINT entity_name_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.name IS UNIQUE"],
+    ),
+    (
+        2,
+        "RELATES_TO.doc_id relationship index (per-document filters)",
+        ["CREATE INDEX relates_to_doc_id IF NOT EXISTS FOR ()-[r:RELATES_TO]-() ON (r.doc_id)"],
+    ),
+    (
+        3,
+        "entities namespaced per document: unique (Entity.doc_id, Entity.name)",
+        [
+            # The composite constraint backs the MERGEs of the data migration; the global one
+            # would reject the per-document copies, so it goes right before them
+            "CREATE CONSTRAINT entity_doc_name_unique IF NOT EXISTS "
+            "FOR (e:Entity) REQUIRE (e.doc_id, e.name) IS UNIQUE",
+            "CREATE INDEX entity_doc_id IF NOT EXISTS FOR (e:Entity) ON (e.doc_id)",
+            "DROP CONSTRAINT entity_name_unique IF EXISTS",
+            _namespace_entities,
+        ],
+    ),
+]
+
+
+class GraphSchemaService:
+    async def current_version(self) -> int:
+        records = await graph_service.execute_read(
+            "MATCH (v:SchemaVersion {id: 'graph'}) RETURN v.version AS version"
+        )
+        return records[0]["version"] if records else 0
+
+    async def apply(self, target: int | None = None) -> int:
+        """Apply pending migrations up to `target` (default: latest); returns the resulting version."""
+        version = await self.current_version()
+        for number, description, statements in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            # Schema statements must run in their own transaction, separate from data writes
+            for statement in statements:
+                if callable(statement):
+                    await statement()
+                else:
+                    await graph_service.execute_write(statement)
+            await graph_service.execute_write(
+                "MERGE (v:SchemaVersion {id: 'graph'}) SET v.version = $version",
+                {"version": number}
+            )
+            version = number
+            logger.info(f"Graph schema migrated to v{number}: {description}")
+        return version
+
+
+graph_schema_service = GraphSchemaService()
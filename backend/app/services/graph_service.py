@@ -1,42 +1,207 @@
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+import asyncio
 import logging
+from app.services.graph_backend import GraphBackend, FOCUS_NODE_CAP
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-class GraphService:
+# One hop from the frontier; each frontier entity contributes at most $fanout relationships,
+# preferring low-degree neighbours (hubs carry little specific information)
+HOP_QUERY = """
+UNWIND $frontier AS name
+MATCH (e:Entity {doc_id: $doc_id, name: name})
+CALL {
+    WITH e
+    MATCH (e)-[r:RELATES_TO]-(n:Entity)
+    WITH r, n, COUNT { (n)--() } AS degree
+    ORDER BY degree
+    LIMIT $fanout
+    RETURN r, n, degree
+}
+RETURN startNode(r).name AS subject, r.relation AS relation, endNode(r).name AS object,
+       r.page AS page, n.name AS neighbor, degree, elementId(r) AS rel_id
+"""
+
+# Node sets for the level-of-detail graph views; each binds `nodes` for LINKS_AMONG_NODES
+TOP_NODES = """
+MATCH (e:Entity {doc_id: $doc_id})
+WITH e, COUNT { (e)--() } AS degree
+ORDER BY degree DESC
+LIMIT $top_n
+WITH collect(e) AS nodes
+"""
+NEIGHBOURHOOD = """
+MATCH (f:Entity {doc_id: $doc_id, name: $focus})
+OPTIONAL MATCH (f)-[:RELATES_TO*1..%d]-(n:Entity)
+WITH f, collect(DISTINCT n)[..$node_cap] AS neighbours
+WITH [f] + neighbours AS nodes
+"""
+LINKS_AMONG_NODES = """
+UNWIND nodes AS s
+MATCH (s)-[r:RELATES_TO]->(o:Entity)
+WHERE o IN nodes AND ($cursor IS NULL OR elementId(r) > $cursor)
+RETURN s.name AS source, r.relation AS relation, o.name AS target, elementId(r) AS rel_id
+ORDER BY rel_id
+"""
+ALL_LINKS = """
+MATCH (s:Entity {doc_id: $doc_id})-[r:RELATES_TO]->(o:Entity)
+WHERE $cursor IS NULL OR elementId(r) > $cursor
+RETURN s.name AS source, r.relation AS relation, o.name AS target, elementId(r) AS rel_id
+ORDER BY rel_id
+"""
+
+
+class GraphService(GraphBackend):
+    """Neo4j graph backend (Bolt, async driver); also extracts triplets for ingestion."""
+
     def __init__(self):
         self._driver = None
         try:
-            self._driver = GraphDatabase.driver(
+            # The async driver keeps a pool of connections; sessions borrow one per transaction
+            self._driver = AsyncGraphDatabase.driver(
                 settings.NEO4J_URI,
-                auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
+                auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+                max_connection_pool_size=settings.NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=settings.NEO4J_ACQUISITION_TIMEOUT,
             )
-            logger.info("Successfully connected to Neo4j")
+            logger.info("Neo4j async driver created")
         except Exception as e:
             logger.error(f"Failed to connect to Neo4j: {e}")
 
-    def close(self):
+    async def close(self):
         if self._driver:
-            self._driver.close()
+            await self._driver.close()
 
-    def verify_connectivity(self):
+    async def verify_connectivity(self):
         try:
-            self._driver.verify_connectivity()
+            await self._driver.verify_connectivity()
             return True
         except Exception as e:
             logger.error(f"Neo4j connectivity error: {e}")
             return False
 
-    async def execute_query(self, query: str, parameters: dict = None):
-        """Execute a cypher query."""
+    async def execute_read(self, query: str, parameters: dict = None):
+        """Run a Cypher query in a read transaction (retried on transient errors)."""
+        return await self._execute(query, parameters, write=False)
+
+    async def execute_write(self, query: str, parameters: dict = None):
+        """Run a Cypher query in a write transaction (retried on transient errors)."""
+        return await self._execute(query, parameters, write=True)
+
+    async def stream_read(self, query: str, parameters: dict = None):
+        """Yield records of a large read as they arrive instead of buffering the whole result."""
         if not self._driver:
             raise Exception("Neo4j driver not initialized")
-        
-        with self._driver.session() as session:
+
+        async with self._driver.session(default_access_mode="READ") as session:
             try:
-                result = session.run(query, parameters)
-                return [record for record in result]
+                result = await session.run(query, parameters)
+                async for record in result:
+                    yield record
+            except Exception as e:
+                logger.error(f"Error streaming Cypher query: {e}")
+                raise
+
+    async def write_triplets(self, document_id, triplets: list[dict]) -> int:
+        """MERGE a document's triplets in bounded batches; each batch is idempotent and retried."""
+        query = """
+        UNWIND $triplets AS t
+        MERGE (s:Entity {doc_id: $doc_id, name: t.subject})
+        MERGE (o:Entity {doc_id: $doc_id, name: t.object})
+        MERGE (s)-[r:RELATES_TO {relation: t.relation, page: t.page_number, doc_id: $doc_id}]->(o)
+        """
+        # MERGE rejects null properties: one malformed LLM triplet would fail its whole batch
+        triplets = [t for t in triplets if t.get("subject") and t.get("relation") and t.get("object")]
+        batch_size = settings.GRAPH_WRITE_BATCH_SIZE
+        for start in range(0, len(triplets), batch_size):
+            await self._write_with_retry(
+                query, {"triplets": triplets[start:start + batch_size], "doc_id": str(document_id)}
+            )
+        return len(triplets)
+
+    async def delete_document_graph(self, document_id) -> int:
+        """Delete a document's entities (and with them its relationships) in batches.
+
+        Entities are namespaced per document, so nothing outside the document is touched.
+        """
+        deleted = 0
+        while True:
+            records = await self._write_with_retry(
+                """
+                MATCH (e:Entity {doc_id: $doc_id})
+                WITH e LIMIT $limit
+                DETACH DELETE e
+                RETURN count(*) AS deleted
+                """,
+                {"doc_id": str(document_id), "limit": settings.GRAPH_WRITE_BATCH_SIZE}
+            )
+            batch = records[0]["deleted"] if records else 0
+            deleted += batch
+            if batch < settings.GRAPH_WRITE_BATCH_SIZE:
+                break
+        logger.info(f"Deleted graph of {document_id}: {deleted} entities")
+        return deleted
+
+    async def entity_names(self, document_id) -> list[str]:
+        records = await self.execute_read(
+            "MATCH (e:Entity {doc_id: $doc_id}) RETURN e.name AS name",
+            {"doc_id": str(document_id)}
+        )
+        return [r["name"] for r in records]
+
+    async def neighbors(self, document_id, frontier: list[str], fanout: int) -> list[dict]:
+        records = await self.execute_read(
+            HOP_QUERY, {"doc_id": str(document_id), "frontier": frontier, "fanout": fanout}
+        )
+        return [r.data() for r in records]
+
+    async def links(self, document_id, top_n=None, focus=None, depth=1, cursor=None, limit=None):
+        if focus:
+            query = NEIGHBOURHOOD % int(depth) + LINKS_AMONG_NODES
+        elif top_n:
+            query = TOP_NODES + LINKS_AMONG_NODES
+        else:
+            query = ALL_LINKS
+        if limit:
+            query += "LIMIT $limit"
+        parameters = {
+            "doc_id": str(document_id),
+            "top_n": top_n,
+            "focus": focus,
+            "node_cap": top_n or FOCUS_NODE_CAP,
+            "cursor": cursor,
+            "limit": limit,
+        }
+        async for record in self.stream_read(query, parameters):
+            yield record.data()
+
+    async def _write_with_retry(self, query: str, parameters: dict):
+        """execute_write plus retries with backoff for connection loss beyond the driver's retry window."""
+        for attempt in range(settings.GRAPH_WRITE_RETRIES + 1):
+            try:
+                return await self.execute_write(query, parameters)
+            except (ServiceUnavailable, SessionExpired, TransientError) as e:
+                if attempt == settings.GRAPH_WRITE_RETRIES:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"Graph write failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _execute(self, query: str, parameters: dict | None, write: bool):
+        if not self._driver:
+            raise Exception("Neo4j driver not initialized")
+
+        async def work(tx):
+            result = await tx.run(query, parameters)
+            return [record async for record in result]
+
+        async with self._driver.session() as session:
+            try:
+                if write:
+                    return await session.execute_write(work)
+                return await session.execute_read(work)
             except Exception as e:
                 logger.error(f"Error executing Cypher query: {e}")
                 raise
@@ -88,3 +253,9 @@ class GraphService:
             return []
 
 graph_service = GraphService()
+
+# Backend for graph storage and lookups (GRAPH_BACKEND); Neo4j-only tooling uses graph_service directly
+graph_backend: GraphBackend = graph_service
+if settings.GRAPH_BACKEND == "embedded":
+    from app.services.embedded_graph import EmbeddedGraphBackend
+    graph_backend = EmbeddedGraphBackend()
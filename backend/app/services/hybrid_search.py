@@ -1,12 +1,41 @@
 import uuid
+import asyncio
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.vector_search import vector_search_service
-from app.services.graph_service import graph_service
+from app.services.graph_expansion import graph_expansion_service
+from app.services.entity_matcher import entity_matcher
+from app.services.entity_linker import entity_linker
+from app.services.reranker import reranker_service
+from app.services.summary_tree import summary_tree_service
+from app.services.graph_communities import graph_community_service
+from app.services.sections import section_resolver
 from app.core.config import settings
+from app.core.database import async_session
 
 logger = logging.getLogger(__name__)
 
+
+def reciprocal_rank_fusion(
+    ranked_lists: list[list[dict]],
+    weights: list[float],
+    k: int = 60
+) -> list[dict]:
+    """Fuse ranked chunk lists by weighted RRF: score = sum(w / (k + rank)).
+
+    Chunks are keyed by `id`; fields from every list are merged so a chunk
+    keeps both its `distance` and its `keyword_rank` when found by both.
+    """
+    fused: dict = {}
+    for chunks, weight in zip(ranked_lists, weights):
+        for rank, chunk in enumerate(chunks, start=1):
+            entry = fused.setdefault(chunk["id"], {"rrf_score": 0.0})
+            for key, value in chunk.items():
+                entry.setdefault(key, value)
+            entry["rrf_score"] += weight / (k + rank)
+    return sorted(fused.values(), key=lambda c: c["rrf_score"], reverse=True)
+
+
 class HybridSearchService:
     async def search(
         self, 
@@ -14,40 +43,69 @@ class HybridSearchService:
         query_embedding: list[float], 
         document_id: uuid.UUID, 
         db: AsyncSession,
-        vector_top_k: int = 5
+        vector_top_k: int = 5,
+        total_chunks: int | None = None,
+        ngram_vectors: list[list[float]] | None = None
     ):
-        # 1. Standard Vector Search
-        vector_chunks = await vector_search_service.search_similar(
-            query_embedding, document_id, db, top_k=vector_top_k
-        )
-        
-        # 2. Extract Entities from Question
+        # 1. Global questions ("how do these topics relate overall?") read the precomputed community
+        # summaries instead of chunk and graph lookups
+        if settings.ENABLE_COMMUNITY_SUMMARIES and graph_community_service.is_global(query_text):
+            communities = await vector_search_service.search_summaries(
+                query_embedding, document_id, db, kind="community", top_k=settings.COMMUNITY_TOP_K
+            )
+            if communities:
+                return {
+                    "vector_chunks": communities,
+                    "graph_facts": [],
+                    "entities": []
+                }
+
+        # 1b. Broad questions without a topic ("summarize this document", "main themes?") read the
+        # precomputed summary tree; "summarize chapter 3" goes through section-scoped retrieval below
+        vector_chunks = []
+        scope = summary_tree_service.classify_scope(query_text) if settings.ENABLE_SUMMARY_TREE else None
+        if scope:
+            top_k = 1 if scope == "document" else vector_top_k
+            vector_chunks = await vector_search_service.search_summaries(
+                query_embedding, document_id, db, kind=scope, top_k=top_k
+            )
+
+        # 2. Otherwise Vector + Keyword Search (run concurrently, fused with RRF)
+        # With the reranker on, over-fetch candidates and let the cross-encoder pick the top few
+        if not vector_chunks:
+            fetch_k = settings.RERANK_CANDIDATES if settings.ENABLE_RERANKER else vector_top_k
+            # "in chapter 3 ..." narrows candidates to that section; fall back to the whole document
+            section_prefix = None
+            if settings.ENABLE_SECTION_SCOPING:
+                section_prefix = await section_resolver.resolve(query_text, document_id, db)
+            if section_prefix:
+                vector_chunks = await self._retrieve_chunks(
+                    query_text, query_embedding, document_id, db, fetch_k, section_prefix=section_prefix
+                )
+            if not vector_chunks:
+                vector_chunks = await self._retrieve_chunks(
+                    query_text, query_embedding, document_id, db, fetch_k, total_chunks=total_chunks
+                )
+            if settings.ENABLE_RERANKER:
+                vector_chunks = await reranker_service.rerank(
+                    query_text, vector_chunks, top_n=settings.RERANK_TOP_N
+                )
+
+        # 3. Extract Entities from Question
         # In a real-world scenario, we'd use a small NER model or LLM.
         # For our local-first approach, we'll use a simple "keyword" based extraction
         # against our known graph entities to keep it fast.
         
-        entities_in_query = await self._identify_entities_in_text(query_text, document_id)
+        entities_in_query = await self._identify_entities_in_text(query_text, document_id, ngram_vectors, db)
         logger.info(f"Entities identified in query: {entities_in_query}")
         
-        # 3. Graph Traversal (1-hop expansion)
+        # 4. Graph Traversal (bounded k-hop expansion, ranked against the retrieved pages)
         graph_facts = []
         if entities_in_query:
-            query = """
-            MATCH (s:Entity)-[r:RELATES_TO {doc_id: $doc_id}]->(o:Entity)
-            WHERE s.name IN $entities OR o.name IN $entities
-            RETURN s.name AS subject, r.relation AS relation, o.name AS object, r.page AS page
-            LIMIT 10
-            """
-            records = await graph_service.execute_query(
-                query, 
-                {"doc_id": str(document_id), "entities": entities_in_query}
-            )
-            
-            for r in records:
-                fact = f"- {r['subject']} {r['relation']} {r['object']} (Found on Page {r['page']})"
-                graph_facts.append(fact)
+            chunk_pages = [c["page_number"] for c in vector_chunks if isinstance(c.get("page_number"), int)]
+            graph_facts = await graph_expansion_service.expand(document_id, entities_in_query, chunk_pages)
         
-        # 4. Integrate Vision Content
+        # 5. Integrate Vision Content
         # (This is already appended to the vector chunks during ingestion)
         
         return {
@@ -56,19 +114,98 @@ class HybridSearchService:
             "entities": entities_in_query
         }
 
-    async def _identify_entities_in_text(self, text: str, document_id: uuid.UUID) -> list[str]:
-        """Simple cross-reference to find doc entities mentioned in text."""
-        # Get all entities for this doc
-        query = "MATCH (e:Entity) WHERE ANY(r IN [(e)-[:RELATES_TO {doc_id: $doc_id}]->() | 1] WHERE r=1) RETURN DISTINCT e.name AS name LIMIT 100"
-        records = await graph_service.execute_query(query, {"doc_id": str(document_id)})
-        all_entities = [r["name"] for r in records]
-        
-        # Find matches (case-insensitive)
-        text_lower = text.lower()
-        found = []
-        for entity in all_entities:
-            if entity.lower() in text_lower:
-                found.append(entity)
+    async def search_library(
+        self,
+        query_text: str,
+        query_embedding: list[float],
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        document_ids: list[uuid.UUID] | None = None,
+        vector_top_k: int = 5
+    ):
+        """Library-scoped retrieval (no graph facts: the graph is per-document)."""
+        fetch_k = settings.RERANK_CANDIDATES if settings.ENABLE_RERANKER else vector_top_k
+        chunks = await vector_search_service.search_library(
+            query_embedding, user_id, db, document_ids=document_ids, top_k=fetch_k
+        )
+        chunks = [c for c in chunks if c["distance"] < settings.RAG_MAX_DISTANCE]
+        if settings.ENABLE_RERANKER:
+            chunks = await reranker_service.rerank(query_text, chunks, top_n=settings.RERANK_TOP_N)
+
+        return {
+            "vector_chunks": chunks,
+            "graph_facts": [],
+            "entities": []
+        }
+
+    async def _retrieve_chunks(
+        self,
+        query_text: str,
+        query_embedding: list[float],
+        document_id: uuid.UUID,
+        db: AsyncSession,
+        top_k: int,
+        section_prefix: str | None = None,
+        total_chunks: int | None = None
+    ) -> list[dict]:
+        if not settings.ENABLE_KEYWORD_SEARCH:
+            chunks = await vector_search_service.search_similar(
+                query_embedding, document_id, db, top_k=top_k,
+                section_prefix=section_prefix, total_chunks=total_chunks
+            )
+            return [c for c in chunks if c["distance"] < settings.RAG_MAX_DISTANCE]
+
+        depth = max(settings.HYBRID_CANDIDATE_DEPTH, top_k)
+        vector_hits, keyword_hits = await asyncio.gather(
+            vector_search_service.search_similar(
+                query_embedding, document_id, db, top_k=depth,
+                section_prefix=section_prefix, total_chunks=total_chunks
+            ),
+            self._keyword_search(query_text, document_id, depth, section_prefix),
+        )
+        fused = reciprocal_rank_fusion(
+            [vector_hits, keyword_hits],
+            [settings.HYBRID_VECTOR_WEIGHT, settings.HYBRID_KEYWORD_WEIGHT],
+            k=settings.HYBRID_RRF_K,
+        )
+
+        # Lexical matches are kept even when the embedding considers them far away;
+        # vector-only hits still have to pass the distance cutoff
+        relevant = [
+            c for c in fused
+            if "keyword_rank" in c or c["distance"] < settings.RAG_MAX_DISTANCE
+        ]
+        logger.info(
+            f"Hybrid retrieval: {len(vector_hits)} vector + {len(keyword_hits)} keyword hits "
+            f"-> {len(fused)} fused, {len(relevant)} relevant"
+        )
+        return relevant[:top_k]
+
+    async def _keyword_search(
+        self,
+        query_text: str,
+        document_id: uuid.UUID,
+        top_k: int,
+        section_prefix: str | None = None
+    ) -> list[dict]:
+        # A separate session so the query can run alongside the vector search
+        async with async_session() as db:
+            return await vector_search_service.search_keyword(
+                query_text, document_id, db, top_k=top_k, section_prefix=section_prefix
+            )
+
+    async def _identify_entities_in_text(
+        self,
+        text: str,
+        document_id: uuid.UUID,
+        ngram_vectors: list[list[float]] | None = None,
+        db: AsyncSession | None = None
+    ) -> list[str]:
+        """Find doc entities mentioned in text: exact name matches, then semantically linked ones."""
+        found = await entity_matcher.match(text, document_id, db)
+        if ngram_vectors and db is not None:
+            linked = await entity_linker.link(document_id, ngram_vectors, db)
+            found += [name for name in linked if name not in found]
         return found
 
 hybrid_search_service = HybridSearchService()
@@ -1,17 +1,27 @@
 import uuid
 import logging
 from pathlib import Path
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import update, insert, select
 
 from app.models.document import Document, UploadStatus
 from app.models.chunk import DocumentChunk
+from app.models.page import DocumentPage
+from app.models.entity import EntityAlias, ENTITY_NAME_MAX_LENGTH
 from app.services.pdf_parser import pdf_parser
 from app.services.chunker import chunker
 from app.services.embeddings import embedding_service
 from app.services.vision_service import vision_service
-from app.services.graph_service import graph_service
+from app.services.graph_service import graph_service, graph_backend
+from app.services.entity_matcher import entity_matcher
+from app.services.entity_linker import entity_linker
+from app.services.entity_canonicalizer import entity_canonicalizer
+from app.services.graph_layout import graph_layout_service
 from app.services.email_service import email_service
+from app.services.local_vector_index import local_vector_index
+from app.services.summary_tree import summary_tree_service
+from app.services.graph_communities import graph_community_service
 from app.models.user import User
 from app.core.database import async_session
 from app.core.config import settings
@@ -52,31 +62,58 @@ class IngestionService:
                         if len(page.text) > 50:
                             triplets = await graph_service.extract_triplets(page.text)
                             for t in triplets:
+                                # A runaway LLM "entity" would not fit the entity / alias columns
+                                names = (str(t.get("subject") or ""), str(t.get("object") or ""))
+                                if max(len(name) for name in names) > ENTITY_NAME_MAX_LENGTH:
+                                    continue
                                 t["page_number"] = page.page_number
                                 all_triplets.append(t)
 
+                    # 4b. Merge entity name variants ("the DNA", "dna" -> "DNA"), keeping the aliases
+                    aliases = {}
+                    if settings.ENABLE_ENTITY_CANONICALIZATION and all_triplets:
+                        all_triplets, aliases = entity_canonicalizer.canonicalize(document_id, all_triplets)
+                        if aliases:
+                            await db.execute(insert(EntityAlias).values([
+                                {"document_id": document_id, "alias": alias, "canonical": canonical}
+                                for alias, canonical in aliases.items()
+                            ]))
+
                     # 5. Populate Neo4j
                     if all_triplets:
-                        query = """
-                        UNWIND $triplets AS t
-                        MERGE (s:Entity {name: t.subject})
-                        MERGE (o:Entity {name: t.object})
-                        MERGE (s)-[r:RELATES_TO {relation: t.relation, page: t.page_number, doc_id: $doc_id}]->(o)
-                        """
-                        await graph_service.execute_query(
-                            query, 
-                            {"triplets": all_triplets, "doc_id": str(document_id)}
-                        )
+                        await graph_backend.write_triplets(document_id, all_triplets)
+                    # Entity matcher / linker for chat-time lookups, built from the triplets just written
+                    entity_names = [str(t[k]) for t in all_triplets for k in ("subject", "object") if t.get(k)]
+                    entity_matcher.build(document_id, entity_names, aliases)
+                    if settings.ENABLE_ENTITY_LINKING:
+                        await entity_linker.store(document_id, entity_names, db)
+
+                    # 5a. Community summaries for global questions (optional: a failure keeps the graph)
+                    if settings.ENABLE_COMMUNITY_SUMMARIES and all_triplets:
+                        try:
+                            async with db.begin_nested():
+                                await graph_community_service.build(document_id, all_triplets, db)
+                        except Exception as community_err:
+                            logger.error(f"Graph communities failed for {document_id}: {community_err}")
                 else:
                     logger.info("GraphRAG disabled. Skipping entity extraction and Neo4j storage.")
 
+                # 5b. Page text for find-in-document search (stored with page embeddings after step 8)
+                page_rows = [
+                    {"document_id": document_id, "page_number": p.page_number, "text": p.text, "embedding": None}
+                    for p in pages if p.text.strip()
+                ]
+
                 # 6. Chunk text
                 chunks = chunker.chunk_pages(pages)
                 
                 # 7. Generate Embeddings
                 texts = [c.content for c in chunks]
+                centroid = None
                 if texts:
                     embeddings = embedding_service.embed_texts(texts)
+                    # Mean embedding used to route library-wide searches to this document
+                    centroid = np.mean(np.asarray(embeddings, dtype=np.float32), axis=0).tolist()
                     
                     # 8. Store in DB
                     chunk_data = []
@@ -87,11 +124,36 @@ class IngestionService:
                             "chunk_index": chunk.chunk_index,
                             "content": chunk.content,
                             "page_number": chunk.page_number,
+                            "section_path": chunk.section_path,
                             "embedding": vector
                         })
                     
                     if chunk_data:
                         await db.execute(insert(DocumentChunk).values(chunk_data))
+                        if settings.VECTOR_BACKEND == "local":
+                            local_vector_index.build(document_id, chunk_data, file_path)
+
+                    # Page embedding = mean of its chunk embeddings (coarse stage of two-stage search)
+                    vectors_by_page: dict[int, list] = {}
+                    for chunk, vector in zip(chunks, embeddings):
+                        vectors_by_page.setdefault(chunk.page_number, []).append(vector)
+                    for row in page_rows:
+                        if row["page_number"] in vectors_by_page:
+                            row["embedding"] = np.mean(
+                                np.asarray(vectors_by_page[row["page_number"]], dtype=np.float32), axis=0
+                            ).tolist()
+
+                    # 8b. Summary tree for broad questions (optional: a failure keeps the chunks)
+                    if settings.ENABLE_SUMMARY_TREE:
+                        # Savepoint: a failed insert must not abort the chunks' transaction
+                        try:
+                            async with db.begin_nested():
+                                await summary_tree_service.build(document_id, chunks, db)
+                        except Exception as summary_err:
+                            logger.error(f"Summary tree failed for {document_id}: {summary_err}")
+
+                if page_rows:
+                    await db.execute(insert(DocumentPage).values(page_rows))
 
                 # 9. Final update
                 any_needs_ocr = any(p.needs_ocr for p in pages)
@@ -99,17 +161,28 @@ class IngestionService:
                 if any_needs_ocr and not texts:
                     final_status = UploadStatus.NEEDS_OCR
 
-                await db.execute(
+                result = await db.execute(
                     update(Document)
                     .where(Document.id == document_id)
                     .values(
                         upload_status=final_status,
                         total_pages=len(pages),
-                        total_chunks=len(chunks)
+                        total_chunks=len(chunks),
+                        centroid=centroid,
+                        graph_version=Document.graph_version + 1
                     )
+                    .returning(Document.graph_version)
                 )
+                graph_version = result.scalar_one()
                 await db.commit()
 
+                # 9b. Knowledge map layout for the new graph version (optional: computed on first view otherwise)
+                if settings.ENABLE_GRAPH_RAG:
+                    try:
+                        await graph_layout_service.compute(document_id, graph_version, db)
+                    except Exception as layout_err:
+                        logger.error(f"Graph layout failed for {document_id}: {layout_err}")
+
                 # 10. Send Success Email
                 try:
                     result = await db.execute(
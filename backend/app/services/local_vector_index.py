@@ -0,0 +1,191 @@
+import os
+import json
+import uuid
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chunk import DocumentChunk
+from app.models.document import Document
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _LoadedIndex:
+    """A document's normalized embedding matrix (memory-mapped) plus chunk metadata."""
+
+    def __init__(self, matrix: np.ndarray, chunks: list[dict], version: tuple[int, int]):
+        self.matrix = matrix
+        self.chunks = chunks
+        self.version = version  # (inode, mtime) of the vectors file it was loaded from
+        self.nbytes = matrix.nbytes + sum(len(c["content"]) for c in chunks)
+
+
+class LocalVectorIndex:
+    """Per-document vector files next to the uploads, served from a byte-bounded LRU.
+
+    Postgres stays the source of truth: a missing file is rebuilt from
+    `document_chunks` on first use, and invalidation just drops the files.
+    Cache hits are checked against the file on disk, so a document rebuilt by
+    another worker is reloaded instead of served stale.
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[uuid.UUID, _LoadedIndex] = OrderedDict()
+        self._bytes = 0
+        # document id -> directory of its uploaded file
+        self._directories: dict[uuid.UUID, Path] = {}
+
+    def _paths(self, document_id: uuid.UUID, file_path: str | Path | None = None) -> tuple[Path, Path]:
+        if file_path is not None:
+            self._directories[document_id] = Path(file_path).parent
+        directory = self._directories.get(document_id, settings.upload_path)
+        return directory / f"{document_id}.vectors.npy", directory / f"{document_id}.chunks.json"
+
+    @staticmethod
+    def _version(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _budget(self) -> int:
+        if self.max_bytes is not None:
+            return self.max_bytes
+        return settings.LOCAL_INDEX_CACHE_MB * 1024 * 1024
+
+    def build(self, document_id: uuid.UUID, chunks: list[dict], file_path: str | Path | None = None):
+        """Write the float32 matrix and metadata next to the document's upload (rows carry `embedding`)."""
+        vectors_path, meta_path = self._paths(document_id, file_path)
+        dim = settings.EMBEDDING_DIMENSION
+        matrix = np.asarray([c["embedding"] for c in chunks], dtype=np.float32).reshape(-1, dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+
+        metadata = [
+            {
+                "id": str(c["id"]),
+                "page_number": c["page_number"],
+                "section_path": c.get("section_path"),
+                "content": c["content"]
+            }
+            for c in chunks
+        ]
+
+        # Write to temp files and swap in, so readers never see a half-written index
+        tmp_vectors = vectors_path.with_name(vectors_path.name + ".tmp")
+        tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+        with tmp_vectors.open("wb") as f:
+            np.save(f, matrix)
+        tmp_meta.write_text(json.dumps(metadata))
+        os.replace(tmp_vectors, vectors_path)
+        os.replace(tmp_meta, meta_path)
+
+        self._evict(document_id)
+        logger.info(f"Built local vector index for {document_id}: {len(chunks)} chunks")
+
+    def invalidate(self, document_id: uuid.UUID, file_path: str | Path | None = None):
+        """Drop the cached entry and on-disk files (reprocess / delete)."""
+        self._evict(document_id)
+        for path in self._paths(document_id, file_path):
+            path.unlink(missing_ok=True)
+
+    async def search(
+        self,
+        query_embedding: list[float],
+        document_id: uuid.UUID,
+        db: AsyncSession,
+        top_k: int = 5,
+        section_prefix: str | None = None
+    ) -> list[dict]:
+        index = await self._load(document_id, db)
+        if not index.chunks:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        # Not in place: asarray returns the caller's array when it already is float32
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        similarities = index.matrix @ query
+
+        candidates = len(index.chunks)
+        if section_prefix:
+            in_section = np.array([
+                (c.get("section_path") or "") == section_prefix
+                or (c.get("section_path") or "").startswith(section_prefix + " > ")
+                for c in index.chunks
+            ])
+            similarities = np.where(in_section, similarities, -np.inf)
+            candidates = int(in_section.sum())
+            if not candidates:
+                return []
+
+        k = min(top_k, candidates)
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+
+        return [
+            {
+                **index.chunks[i],
+                "id": uuid.UUID(index.chunks[i]["id"]),
+                "distance": float(1.0 - similarities[i])
+            }
+            for i in top
+        ]
+
+    async def _load(self, document_id: uuid.UUID, db: AsyncSession) -> _LoadedIndex:
+        if document_id not in self._directories and db is not None:
+            file_path = await db.scalar(select(Document.file_path).where(Document.id == document_id))
+            if file_path:
+                self._paths(document_id, file_path)
+        vectors_path, meta_path = self._paths(document_id)
+
+        cached = self._entries.get(document_id)
+        if cached is not None:
+            if cached.version == self._version(vectors_path):
+                self._entries.move_to_end(document_id)
+                return cached
+            self._evict(document_id)
+
+        if not (vectors_path.exists() and meta_path.exists()):
+            await self._rebuild_from_db(document_id, db)
+
+        index = _LoadedIndex(
+            np.load(vectors_path, mmap_mode="r"),
+            json.loads(meta_path.read_text()),
+            self._version(vectors_path)
+        )
+        self._entries[document_id] = index
+        self._bytes += index.nbytes
+        while self._bytes > self._budget() and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+        return index
+
+    async def _rebuild_from_db(self, document_id: uuid.UUID, db: AsyncSession):
+        result = await db.execute(
+            select(
+                DocumentChunk.id,
+                DocumentChunk.page_number,
+                DocumentChunk.section_path,
+                DocumentChunk.content,
+                DocumentChunk.embedding
+            )
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.embedding.is_not(None))
+            .order_by(DocumentChunk.chunk_index)
+        )
+        self.build(document_id, [row._asdict() for row in result.all()])
+
+    def _evict(self, document_id: uuid.UUID):
+        evicted = self._entries.pop(document_id, None)
+        if evicted is not None:
+            self._bytes -= evicted.nbytes
+
+
+local_vector_index = LocalVectorIndex()
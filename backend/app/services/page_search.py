@@ -0,0 +1,76 @@
+import re
+import html
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.page import DocumentPage
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so the term matches literally (escape character: backslash)."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def highlight_snippets(text: str, term: str, radius: int = 60, max_snippets: int = 3) -> tuple[int, list[str]]:
+    """Count case-insensitive matches and build HTML-escaped snippets with <mark> around each hit."""
+    pattern = re.compile(re.escape(term), re.IGNORECASE)
+    matches = list(pattern.finditer(text))
+
+    snippets = []
+    last_end = -1
+    for match in matches:
+        if len(snippets) >= max_snippets:
+            break
+        if match.start() < last_end:
+            continue  # already shown in the previous snippet
+        start = max(0, match.start() - radius)
+        end = min(len(text), match.end() + radius)
+        window = " ".join(text[start:end].split())
+        marked = pattern.sub(lambda m: f"\0{m.group(0)}\1", window)
+        marked = html.escape(marked).replace("\0", "<mark>").replace("\1", "</mark>")
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if end < len(text) else ""
+        snippets.append(f"{prefix}{marked}{suffix}")
+        last_end = end
+    return len(matches), snippets
+
+
+class PageSearchService:
+    """Find-in-document over the trigram-indexed page text (no embeddings, no LLM)."""
+
+    async def search(
+        self,
+        document_id: uuid.UUID,
+        term: str,
+        db: AsyncSession,
+        after: int | None = None,
+        limit: int = 20
+    ) -> tuple[list[dict], int | None]:
+        """Pages containing `term` in page order, keyset-paginated on page_number."""
+        query = (
+            select(DocumentPage.page_number, DocumentPage.text)
+            .where(
+                DocumentPage.document_id == document_id,
+                DocumentPage.text.ilike(f"%{escape_like(term)}%", escape="\\")
+            )
+            .order_by(DocumentPage.page_number)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(DocumentPage.page_number > after)
+
+        rows = (await db.execute(query)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        hits = []
+        for row in rows:
+            count, snippets = highlight_snippets(row.text, term)
+            hits.append({"page_number": row.page_number, "match_count": count, "snippets": snippets})
+
+        next_after = rows[-1].page_number if has_more and rows else None
+        return hits, next_after
+
+
+page_search_service = PageSearchService()
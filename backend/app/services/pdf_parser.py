@@ -1,18 +1,31 @@
 import fitz  # PyMuPDF
+from collections import Counter
 from pathlib import Path
 from pydantic import BaseModel
 import os
 import uuid
 
+from app.services.sections import join_section_path
+
+
+class SectionMarker(BaseModel):
+    offset: int  # character offset in the page text where the section starts
+    path: str  # e.g. "Chapter 3 Cells > 3.1 Structure"
+
 
 class PageContent(BaseModel):
     page_number: int
     text: str
     needs_ocr: bool
     image_paths: list[str] = []
+    section_path: str | None = None  # section active at the top of the page
+    sections: list[SectionMarker] = []  # sections starting on this page
 
 
 class PDFParser:
+    HEADING_SIZE_RATIO = 1.15  # a line this much larger than body text is a heading candidate
+    MAX_HEADING_LEVELS = 3
+
     @staticmethod
     def parse_pdf(file_path: Path, output_dir: Path = None) -> list[PageContent]:
         doc = fitz.open(str(file_path))
@@ -24,6 +37,10 @@ class PDFParser:
             asset_dir = output_dir / "assets"
             asset_dir.mkdir(parents=True, exist_ok=True)
 
+        # Heading hierarchy: the PDF outline when present, font sizes otherwise
+        headings_by_page = PDFParser._outline_headings(doc) or PDFParser._layout_headings(doc)
+        section_stack: list[str] = []
+
         for i, page in enumerate(doc):
             text = page.get_text().strip()
             needs_ocr = len(text) < 10
@@ -47,15 +64,73 @@ class PDFParser:
                     
                     image_paths.append(str(img_path))
             
+            # Track the section path across pages
+            section_path = join_section_path(section_stack)
+            markers = []
+            cursor = 0
+            for level, title in headings_by_page.get(i + 1, []):
+                section_stack = section_stack[:level - 1] + [title]
+                found = text.lower().find(title.lower(), cursor)
+                offset = found if found >= 0 else cursor
+                cursor = offset
+                markers.append(SectionMarker(offset=offset, path=join_section_path(section_stack)))
+
             pages.append(PageContent(
                 page_number=i + 1,
                 text=text,
                 needs_ocr=needs_ocr,
-                image_paths=image_paths
+                image_paths=image_paths,
+                section_path=section_path,
+                sections=markers
             ))
             
         doc.close()
         return pages
 
+    @staticmethod
+    def _outline_headings(doc) -> dict[int, list[tuple[int, str]]]:
+        """Headings from the PDF outline (TOC): page number -> [(level, title)]."""
+        headings: dict[int, list[tuple[int, str]]] = {}
+        for level, title, page_number in doc.get_toc(simple=True):
+            title = " ".join(title.split())
+            if title and page_number >= 1:
+                headings.setdefault(page_number, []).append((level, title))
+        return headings
+
+    @staticmethod
+    def _layout_headings(doc) -> dict[int, list[tuple[int, str]]]:
+        """Headings detected from the text layout: lines set noticeably larger than body text."""
+        lines_by_page = []
+        size_counts: Counter = Counter()
+        for page in doc:
+            lines = []
+            for block in page.get_text("dict")["blocks"]:
+                for line in block.get("lines", []):
+                    spans = [s for s in line["spans"] if s["text"].strip()]
+                    if not spans:
+                        continue
+                    line_text = " ".join("".join(s["text"] for s in spans).split())
+                    size = round(max(s["size"] for s in spans), 1)
+                    size_counts[size] += len(line_text)
+                    lines.append((size, line_text))
+            lines_by_page.append(lines)
+
+        if not size_counts:
+            return {}
+
+        # Body text is the size covering the most characters; larger sizes rank as heading levels
+        body_size = size_counts.most_common(1)[0][0]
+        heading_sizes = sorted(
+            (s for s in size_counts if s >= body_size * PDFParser.HEADING_SIZE_RATIO), reverse=True
+        )[:PDFParser.MAX_HEADING_LEVELS]
+        levels = {size: rank + 1 for rank, size in enumerate(heading_sizes)}
+
+        headings: dict[int, list[tuple[int, str]]] = {}
+        for page_index, lines in enumerate(lines_by_page):
+            for size, line_text in lines:
+                if size in levels and 2 <= len(line_text) <= 120 and not line_text.isdigit():
+                    headings.setdefault(page_index + 1, []).append((levels[size], line_text))
+        return headings
+
 
 pdf_parser = PDFParser()
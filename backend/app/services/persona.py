@@ -53,7 +53,13 @@ class PersonaEngine:
         # Improvement #3 & #4: Page numbers and safe grounding
         content_parts = []
         for c in context_chunks:
-            source = f"[{c['page_number']}]" if c['page_number'] == "Web" else f"[Page {c['page_number']}]"
+            if c['page_number'] == "Web":
+                source = f"[{c['page_number']}]"
+            elif c.get('source_name'):
+                # Library search: chunks come from several documents
+                source = f"[{c['source_name']}, Page {c['page_number']}]"
+            else:
+                source = f"[Page {c['page_number']}]"
             content_parts.append(f"{source}: {c['content']}")
         
         context_text = "\n\n".join(content_parts)
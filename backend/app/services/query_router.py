@@ -0,0 +1,147 @@
+import re
+import enum
+import uuid
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from app.services.embeddings import embedding_service
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RouteDecision(str, enum.Enum):
+    RETRIEVE = "retrieve"  # run the full retrieval pipeline
+    REUSE = "reuse"  # follow-up: reuse the previous turn's context
+    NONE = "none"  # small talk: answer without document context
+
+
+SMALL_TALK = re.compile(
+    r"^\s*(hi|hello|hey|yo|thanks|thank you|thx|ok|okay|cool|great|nice|awesome|got it|"
+    r"bye|goodbye|see you|good (morning|afternoon|evening|night))"
+    r"(\s+(there|so much|a lot|very much|again|buddy|everyone|you))*[\s!.?]*$",
+    re.IGNORECASE
+)
+FOLLOW_UP = re.compile(
+    r"\b(explain (that|this|it)|more simply|simpler|elaborate|what do you mean|say (that|it) again|"
+    r"give (me )?(an|another) example|clarify|rephrase|in other words|tell me more|go on|continue)\b",
+    re.IGNORECASE
+)
+# Words that leave a follow-up without a topic of its own ("can you give me another example of that?")
+FOLLOW_UP_FILLER = {
+    "a", "an", "the", "that", "this", "it", "its", "them", "those", "can", "could", "would", "will", "you",
+    "please", "me", "us", "i", "about", "of", "on", "for", "with", "in", "more", "again", "bit", "little",
+    "some", "so", "just", "what", "do", "does", "did", "mean", "by", "further", "now", "ok", "okay", "and",
+    "then", "also", "one", "example", "examples", "detail", "simply", "simple", "terms", "words", "way",
+    "differently", "thanks", "last", "answer", "point", "part",
+}
+SMALL_TALK_PROTOTYPES = [
+    "hello, how are you?",
+    "thank you so much, that was helpful",
+    "okay, got it",
+    "good job, nice answer",
+    "bye, see you later",
+]
+
+
+class QueryRouter:
+    """Decides per message whether to retrieve, reuse the last context, or skip retrieval.
+
+    Cheap regex rules run first; otherwise the question embedding (needed for
+    retrieval anyway) is compared against small-talk prototypes and the
+    previous question of the session.
+    """
+
+    def __init__(self):
+        # session id -> {"embedding", "context_chunks", "graph_facts"}
+        self._sessions: OrderedDict[uuid.UUID, dict] = OrderedDict()
+        self._prototypes: np.ndarray | None = None
+        self.counts = {d: 0 for d in RouteDecision}
+        self.avg_retrieval_ms = 0.0
+        self.saved_ms = 0.0
+
+    @staticmethod
+    def is_follow_up(question: str) -> bool:
+        return bool(FOLLOW_UP.search(question)) and len(question.split()) <= 12
+
+    @staticmethod
+    def has_content_terms(question: str) -> bool:
+        """Whether a follow-up names something beyond the follow-up phrase ("clarify mitosis")."""
+        rest = FOLLOW_UP.sub(" ", question.lower())
+        return any(word not in FOLLOW_UP_FILLER for word in re.findall(r"\w+", rest))
+
+    def route_by_rules(self, question: str, session_id: uuid.UUID) -> RouteDecision | None:
+        if SMALL_TALK.match(question):
+            return RouteDecision.NONE
+        # Follow-ups naming a topic are checked against the previous question by embedding
+        if self.is_follow_up(question) and not self.has_content_terms(question) and session_id in self._sessions:
+            return RouteDecision.REUSE
+        return None
+
+    def route_by_embedding(
+        self, query_embedding: list[float], session_id: uuid.UUID, question: str | None = None
+    ) -> RouteDecision:
+        query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        if float(np.max(self._prototype_matrix() @ query)) >= settings.ROUTER_SMALL_TALK_THRESHOLD:
+            return RouteDecision.NONE
+
+        previous = self._sessions.get(session_id)
+        if previous is not None and previous["embedding"] is not None:
+            threshold = settings.ROUTER_REUSE_THRESHOLD
+            if question is not None and self.is_follow_up(question):
+                threshold = settings.ROUTER_FOLLOW_UP_THRESHOLD
+            if float(previous["embedding"] @ query) >= threshold:
+                return RouteDecision.REUSE
+
+        return RouteDecision.RETRIEVE
+
+    def remember(
+        self,
+        session_id: uuid.UUID,
+        query_embedding: list[float],
+        context_chunks: list[dict],
+        graph_facts: list[str]
+    ):
+        """Cache the context of a retrieval turn for follow-ups in the same session."""
+        self._sessions[session_id] = {
+            "embedding": self._normalize(np.asarray(query_embedding, dtype=np.float32)),
+            "context_chunks": context_chunks,
+            "graph_facts": graph_facts,
+        }
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > settings.ROUTER_SESSION_CACHE_SIZE:
+            self._sessions.popitem(last=False)
+
+    def cached_context(self, session_id: uuid.UUID) -> dict:
+        return self._sessions[session_id]
+
+    def record(self, decision: RouteDecision, retrieval_ms: float | None = None):
+        """Track decisions; skipped turns are credited with the average retrieval latency."""
+        self.counts[decision] += 1
+        if decision == RouteDecision.RETRIEVE and retrieval_ms is not None:
+            retrieved = self.counts[RouteDecision.RETRIEVE]
+            self.avg_retrieval_ms += (retrieval_ms - self.avg_retrieval_ms) / retrieved
+        elif decision != RouteDecision.RETRIEVE:
+            self.saved_ms += self.avg_retrieval_ms
+
+        total = sum(self.counts.values())
+        skipped = total - self.counts[RouteDecision.RETRIEVE]
+        logger.info(
+            f"Query router: {decision.value} | skip rate {skipped / total:.0%} "
+            f"({skipped}/{total}), ~{self.saved_ms:.0f} ms retrieval saved"
+        )
+
+    def _prototype_matrix(self) -> np.ndarray:
+        if self._prototypes is None:
+            vectors = np.asarray(embedding_service.embed_texts(SMALL_TALK_PROTOTYPES), dtype=np.float32)
+            self._prototypes = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return self._prototypes
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+query_router = QueryRouter()
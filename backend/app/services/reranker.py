@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RerankerService:
+    def __init__(self):
+        self.model = None
+        # (question hash, chunk id) -> cross-encoder score, LRU-bounded
+        self._cache: OrderedDict = OrderedDict()
+        self._load_lock = asyncio.Lock()
+
+    async def initialize(self):
+        """Load the cross-encoder off the event loop, once; nothing is loaded until called."""
+        if self.model is not None:
+            return
+        async with self._load_lock:
+            if self.model is None:
+                from sentence_transformers import CrossEncoder
+
+                self.model = await asyncio.to_thread(CrossEncoder, settings.RERANKER_MODEL, device="cpu")
+                print(f"Loaded reranker model: {settings.RERANKER_MODEL}")
+
+    async def rerank(self, question: str, chunks: list[dict], top_n: int) -> list[dict]:
+        """Score (question, chunk) pairs in one batched CPU call and keep the best `top_n`."""
+        if not chunks:
+            return []
+        await self.initialize()
+
+        start = time.perf_counter()
+        question_hash = hashlib.sha256(question.strip().lower().encode()).hexdigest()[:16]
+
+        scores = {}
+        pending = []
+        for chunk in chunks:
+            key = (question_hash, chunk["id"])
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                scores[chunk["id"]] = self._cache[key]
+            else:
+                pending.append(chunk)
+
+        if pending:
+            pairs = [(question, c["content"]) for c in pending]
+            predicted = await asyncio.to_thread(
+                self.model.predict, pairs, batch_size=len(pairs), show_progress_bar=False
+            )
+            for chunk, score in zip(pending, predicted):
+                scores[chunk["id"]] = float(score)
+                self._remember((question_hash, chunk["id"]), float(score))
+
+        ranked = sorted(
+            ({**c, "rerank_score": scores[c["id"]]} for c in chunks),
+            key=lambda c: c["rerank_score"],
+            reverse=True
+        )
+        logger.info(
+            f"Reranked {len(chunks)} candidates ({len(chunks) - len(pending)} cached) "
+            f"-> top {top_n} in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return ranked[:top_n]
+
+    def _remember(self, key: tuple, score: float):
+        self._cache[key] = score
+        if len(self._cache) > settings.RERANK_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+
+reranker_service = RerankerService()
@@ -0,0 +1,96 @@
+import re
+import uuid
+import logging
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chunk import DocumentChunk, SECTION_PATH_MAX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# "in chapter 3", "section 2.4", "part IV"
+NUMBERED_REFERENCE = re.compile(
+    r"\b(chapter|section|part|unit|lesson|module)\s+(\d+(?:\.\d+)*|[ivxlc]+)\b",
+    re.IGNORECASE
+)
+# "in the section on photosynthesis", "the chapter about cell division"
+TITLED_REFERENCE = re.compile(
+    r"\b(?:chapter|section|part|unit) (?:on|about|called|titled|named) \"?([\w' -]{3,60}?)\"?(?=[?.,!;:]|$)",
+    re.IGNORECASE
+)
+
+
+def join_section_path(titles: list[str], max_length: int = SECTION_PATH_MAX_LENGTH) -> str | None:
+    """"Chapter 3 Cells > 3.1 Structure" from the heading stack, at most `max_length` characters.
+
+    Deep or long-titled outlines drop middle headings first ("Part I > ... > 3.1 Structure"),
+    keeping the top level and the innermost section; a single overlong title is cut.
+    """
+    if not titles:
+        return None
+    path = " > ".join(titles)
+    if len(path) <= max_length:
+        return path
+    head, tail = titles[0], list(titles[1:])
+    while tail:
+        path = " > ".join([head, "...", *tail])
+        if len(path) <= max_length:
+            return path
+        tail.pop(0)
+    return head[:max_length]
+
+
+class SectionResolver:
+    """Maps a section reference in the question to a section path of the document."""
+
+    @staticmethod
+    def extract_reference(question: str) -> tuple[str | None, str] | None:
+        """(keyword, number) for numbered references, (None, title) for titled ones."""
+        match = NUMBERED_REFERENCE.search(question)
+        if match:
+            return match.group(1).lower(), match.group(2).lower()
+        match = TITLED_REFERENCE.search(question)
+        if match:
+            return None, match.group(1).strip().lower()
+        return None
+
+    @staticmethod
+    def match_path(reference: tuple[str | None, str], paths: list[str]) -> str | None:
+        """Shallowest section path prefix whose heading matches the reference."""
+        keyword, value = reference
+        if keyword is not None:
+            # "Chapter 3 Cells", "3 Cells", "3. Cells" match chapter 3, but "3.1 Structure" does not
+            pattern = re.compile(
+                rf"^(?:{keyword}\s+)?{re.escape(value)}(?![\d.]\d)\b", re.IGNORECASE
+            )
+        else:
+            pattern = re.compile(rf"\b{re.escape(value)}\b", re.IGNORECASE)
+
+        best = None
+        for path in paths:
+            components = path.split(" > ")
+            for depth, component in enumerate(components):
+                if pattern.search(component.strip()):
+                    prefix = " > ".join(components[:depth + 1])
+                    if best is None or depth < best[0]:
+                        best = (depth, prefix)
+                    break
+        return best[1] if best else None
+
+    async def resolve(self, question: str, document_id: uuid.UUID, db: AsyncSession) -> str | None:
+        reference = self.extract_reference(question)
+        if reference is None:
+            return None
+
+        result = await db.execute(
+            select(DocumentChunk.section_path)
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.section_path.is_not(None))
+            .group_by(DocumentChunk.section_path)
+            .order_by(func.min(DocumentChunk.chunk_index))
+        )
+        prefix = self.match_path(reference, list(result.scalars().all()))
+        logger.info(f"Section reference {reference} resolved to: {prefix}")
+        return prefix
+
+
+section_resolver = SectionResolver()
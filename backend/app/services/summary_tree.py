@@ -0,0 +1,160 @@
+import re
+import uuid
+import logging
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.summary import DocumentSummary
+from app.services.chunker import Chunk
+from app.services.embeddings import embedding_service
+from app.services.sections import section_resolver
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_SCOPE = re.compile(
+    r"\b(summari[sz]e|summary|overview|tl;?dr|gist|what is (this|the) (document|pdf|book|text|paper|file) about)\b",
+    re.IGNORECASE
+)
+SECTION_SCOPE = re.compile(
+    r"\b(main|key|central|major) (themes?|topics?|ideas?|points?|concepts?|takeaways?)\b|\boutline\b",
+    re.IGNORECASE
+)
+# Words that do not name a topic in a broad request ("can you give me a short summary of this document?")
+SCOPE_FILLER = {
+    "a", "an", "the", "this", "that", "these", "my", "our", "your", "its", "it", "of", "for", "on", "in",
+    "to", "with", "and", "please", "can", "could", "would", "will", "you", "me", "us", "i", "we", "give",
+    "provide", "write", "make", "create", "want", "need", "like", "get", "what", "is", "are", "was",
+    "about", "whole", "entire", "all", "overall", "general", "brief", "briefly", "short", "quick",
+    "quickly", "simple", "concise", "high", "level", "few", "sentences", "paragraph", "bullet", "points",
+    "document", "pdf", "book", "text", "paper", "file", "material", "notes", "lecture", "reading",
+}
+
+
+def _parent_path(path: str | None) -> str | None:
+    """"Chapter 3 > 3.1 Structure" -> "Chapter 3"; top-level sections share the root ""."""
+    if path is None:
+        return None
+    return path.rsplit(" > ", 1)[0] if " > " in path else ""
+
+
+def group_by_section(paths: list[str | None], size: int) -> list[list[int]]:
+    """Indexes of consecutive items sharing a section path, in runs of at most `size`.
+
+    Items without a path (documents without an outline) form fixed-size groups.
+    """
+    groups: list[list[int]] = []
+    for i, path in enumerate(paths):
+        if groups and paths[groups[-1][0]] == path and len(groups[-1]) < size:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
+def _names_topic(question: str, match: re.Match) -> bool:
+    """Whether the question has content words beyond the broad phrase and filler."""
+    rest = f"{question[:match.start()]} {question[match.end():]}"
+    return any(word not in SCOPE_FILLER for word in re.findall(r"\w+", rest.lower()))
+
+
+class SummaryTreeService:
+    """Builds a summary tree at ingestion: chunk groups -> section summaries -> document summary.
+
+    The tree follows the document outline: level 1 summarizes the chunks of each
+    section, higher levels summarize sibling sections under their parent. Every
+    node is one sequential LLM call at ingestion (roughly chunks / SUMMARY_GROUP_SIZE
+    calls, plus the levels above).
+    """
+
+    @staticmethod
+    def classify_scope(question: str) -> str | None:
+        """Return the summary kind that answers a broad question ('document' / 'section'), if any.
+
+        Only bare requests ("summarize this document", "tl;dr") qualify: a question
+        naming a section ("summarize chapter 3") or a topic ("overview of photosynthesis")
+        returns None and goes through normal, section-scoped retrieval.
+        """
+        if section_resolver.extract_reference(question):
+            return None
+        for kind, pattern in (("document", DOCUMENT_SCOPE), ("section", SECTION_SCOPE)):
+            match = pattern.search(question)
+            if match:
+                return None if _names_topic(question, match) else kind
+        return None
+
+    async def build(self, document_id: uuid.UUID, chunks: list[Chunk], db: AsyncSession) -> int:
+        """Summarize the chunks level by level and store every node with its embedding."""
+        group_size = max(2, settings.SUMMARY_GROUP_SIZE)
+
+        # Level 1: summaries of the chunks of each section
+        nodes = []
+        for indexes in group_by_section([c.section_path for c in chunks], group_size):
+            group = [chunks[i] for i in indexes]
+            nodes.append({
+                "text": await self._summarize("\n\n".join(c.content for c in group)),
+                "page_start": group[0].page_number,
+                "page_end": group[-1].page_number,
+                "path": group[0].section_path,
+            })
+
+        rows = []
+        level = 1
+        while nodes:
+            is_root = len(nodes) == 1
+            for position, node in enumerate(nodes):
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "document_id": document_id,
+                    "kind": "document" if is_root else "section",
+                    "level": level,
+                    "position": position,
+                    "content": node["text"],
+                    "page_start": node["page_start"],
+                    "page_end": node["page_end"],
+                })
+            if is_root:
+                break
+
+            # Next level: summarize sibling sections under their parent section
+            parent_paths = [_parent_path(n["path"]) for n in nodes]
+            groups = group_by_section(parent_paths, group_size)
+            if len(groups) == len(nodes):
+                # No siblings to merge at this depth: fall back to fixed-size groups
+                parent_paths = [None] * len(nodes)
+                groups = group_by_section(parent_paths, group_size)
+            parents = []
+            for indexes in groups:
+                group = [nodes[i] for i in indexes]
+                parents.append({
+                    "text": await self._summarize("\n\n".join(n["text"] for n in group)),
+                    "page_start": group[0]["page_start"],
+                    "page_end": group[-1]["page_end"],
+                    "path": parent_paths[indexes[0]],
+                })
+            nodes = parents
+            level += 1
+
+        if rows:
+            embeddings = embedding_service.embed_texts([r["content"] for r in rows])
+            for row, vector in zip(rows, embeddings):
+                row["embedding"] = vector
+            await db.execute(insert(DocumentSummary).values(rows))
+
+        logger.info(f"Summary tree for {document_id}: {len(rows)} nodes over {level} levels")
+        return len(rows)
+
+    async def _summarize(self, text: str) -> str:
+        from app.services.llm import llm_service
+
+        prompt = f"""
+        Summarize the following study material in 3-5 sentences.
+        Keep the key concepts, definitions and how they relate. Do not add information.
+
+        Text: {text}
+        """
+        response = await llm_service.call_ollama(prompt)
+        return response.strip()
+
+
+summary_tree_service = SummaryTreeService()
@@ -1,46 +1,305 @@
+import re
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import select, text, cast, func, or_, true
+from pgvector.sqlalchemy import Vector, HALFVEC, BIT
 
 from app.models.chunk import DocumentChunk
+from app.models.document import Document, UploadStatus
+from app.models.summary import DocumentSummary
+from app.models.page import DocumentPage
+from app.core.config import settings
+from app.services.local_vector_index import local_vector_index
 
 
 class VectorSearchService:
     async def search_similar(
-        self, 
-        query_embedding: list[float], 
-        document_id: uuid.UUID, 
+        self,
+        query_embedding: list[float],
+        document_id: uuid.UUID,
         db: AsyncSession,
-        top_k: int = 5
+        top_k: int = 5,
+        storage_mode: str | None = None,
+        backend: str | None = None,
+        section_prefix: str | None = None,
+        total_chunks: int | None = None,
+        two_stage: bool | None = None,
+        ef_search: int | None = None
     ):
+        if (backend or settings.VECTOR_BACKEND) == "local":
+            chunks = await local_vector_index.search(
+                query_embedding, document_id, db, top_k=top_k, section_prefix=section_prefix
+            )
+            print(f"🔍 Vector search (local) found {len(chunks)} chunks with pages: {[c['page_number'] for c in chunks]}")
+            return chunks
+
         # Using pgvector cosine distance operator <=>
         # We also filter by document_id to ensure RAG is grounded in the specific file
+        mode = storage_mode or settings.VECTOR_STORAGE_MODE
+        exact_distance = DocumentChunk.embedding.cosine_distance(query_embedding).label("distance")
+
+        # Large documents: rank page embeddings first, then only the chunks of the top pages
+        # (section-scoped searches are already narrow)
+        if two_stage is None:
+            two_stage = not section_prefix and (total_chunks or 0) >= settings.TWO_STAGE_MIN_CHUNKS
+        page_filter = self._page_filter(query_embedding, document_id) if two_stage else true()
+        await self._tune_filtered_scan(db, ef_search)
+
+        if mode == "full":
+            query = (
+                select(
+                    DocumentChunk.id,
+                    DocumentChunk.content,
+                    DocumentChunk.page_number,
+                    DocumentChunk.section_path,
+                    exact_distance
+                )
+                .where(
+                    DocumentChunk.document_id == document_id,
+                    self._section_filter(section_prefix),
+                    page_filter
+                )
+                .order_by("distance")
+                .limit(top_k)
+            )
+        else:
+            # Candidate search runs on the reduced-precision expression index,
+            # then the small over-fetched set is reranked with exact float32 distances
+            candidates = (
+                select(
+                    DocumentChunk.id,
+                    DocumentChunk.content,
+                    DocumentChunk.page_number,
+                    DocumentChunk.section_path,
+                    exact_distance
+                )
+                .where(
+                    DocumentChunk.document_id == document_id,
+                    self._section_filter(section_prefix),
+                    page_filter
+                )
+                .order_by(self._approximate_distance(query_embedding, mode))
+                .limit(top_k * settings.VECTOR_RERANK_OVERFETCH)
+                .subquery()
+            )
+            query = select(candidates).order_by(candidates.c.distance).limit(top_k)
+
+        result = await db.execute(query)
+        # relaxed_order iterative scans may return neighbours slightly out of order
+        rows = sorted(result.all(), key=lambda row: row.distance)
+
+        chunks = [
+            {
+                "id": row.id,
+                "content": row.content,
+                "page_number": row.page_number,
+                "section_path": row.section_path,
+                "distance": float(row.distance)
+            }
+            for row in rows
+        ]
+
+        label = f"{mode}, two-stage" if two_stage else mode
+        print(f"🔍 Vector search ({label}) found {len(chunks)} chunks with pages: {[c['page_number'] for c in chunks]}")
+        return chunks
+
+    async def search_library(
+        self,
+        query_embedding: list[float],
+        user_id: uuid.UUID,
+        db: AsyncSession,
+        document_ids: list[uuid.UUID] | None = None,
+        top_k: int = 5,
+        route_top_docs: int | None = None
+    ):
+        """Search across a user's library (optionally a subset of documents).
+
+        Documents are first pruned by centroid distance, then a single chunk-level
+        query runs over the routed documents only.
+        """
+        routed_docs = (
+            select(Document.id)
+            .where(
+                Document.user_id == user_id,
+                Document.upload_status == UploadStatus.READY,
+                Document.centroid.is_not(None)
+            )
+            .order_by(Document.centroid.cosine_distance(query_embedding))
+            .limit(route_top_docs or settings.LIBRARY_ROUTE_TOP_DOCS)
+        )
+        if document_ids:
+            routed_docs = routed_docs.where(Document.id.in_(document_ids))
+
         query = (
             select(
+                DocumentChunk.id,
+                DocumentChunk.document_id,
                 DocumentChunk.content,
                 DocumentChunk.page_number,
+                Document.filename,
                 DocumentChunk.embedding.cosine_distance(query_embedding).label("distance")
             )
-            .where(DocumentChunk.document_id == document_id)
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(DocumentChunk.document_id.in_(routed_docs.scalar_subquery()))
             .order_by("distance")
             .limit(top_k)
         )
-        
+
+        await self._tune_filtered_scan(db)
         result = await db.execute(query)
-        rows = result.all()
-        
         chunks = [
             {
+                "id": row.id,
+                "document_id": row.document_id,
+                "source_name": row.filename,
                 "content": row.content,
                 "page_number": row.page_number,
                 "distance": float(row.distance)
             }
-            for row in rows
+            for row in sorted(result.all(), key=lambda row: row.distance)
         ]
-        
-        print(f"🔍 Vector search found {len(chunks)} chunks with pages: {[c['page_number'] for c in chunks]}")
+
+        print(f"📚 Library search found {len(chunks)} chunks from {len({c['document_id'] for c in chunks})} documents")
         return chunks
 
+    async def search_summaries(
+        self,
+        query_embedding: list[float],
+        document_id: uuid.UUID,
+        db: AsyncSession,
+        kind: str,
+        top_k: int = 5
+    ):
+        """Search the document's summary tree nodes of one kind ('section' / 'document')."""
+        query = (
+            select(
+                DocumentSummary.id,
+                DocumentSummary.content,
+                DocumentSummary.level,
+                DocumentSummary.page_start,
+                DocumentSummary.page_end,
+                DocumentSummary.embedding.cosine_distance(query_embedding).label("distance")
+            )
+            .where(DocumentSummary.document_id == document_id, DocumentSummary.kind == kind)
+            .order_by("distance")
+            .limit(top_k)
+        )
+
+        result = await db.execute(query)
+        summaries = [
+            {
+                "id": row.id,
+                "content": row.content,
+                "page_number": row.page_start,
+                "page_end": row.page_end,
+                "summary_level": row.level,
+                "distance": float(row.distance)
+            }
+            for row in result.all()
+        ]
+
+        print(f"🌳 Summary search ({kind}) found {len(summaries)} nodes")
+        return summaries
+
+    async def search_keyword(
+        self,
+        query_text: str,
+        document_id: uuid.UUID,
+        db: AsyncSession,
+        top_k: int = 5,
+        section_prefix: str | None = None
+    ):
+        """Full-text search over the GIN-indexed `content_tsv` column, ranked by ts_rank_cd."""
+        # OR the question terms together so partial matches still rank; each term goes through
+        # plainto_tsquery, which cannot fail on tsquery syntax and drops 'english' stopwords
+        terms = list(dict.fromkeys(re.findall(r"[^\W_]+", query_text.lower())))
+        if not terms:
+            return []
+        tsquery = func.plainto_tsquery("english", terms[0])
+        for term in terms[1:]:
+            tsquery = tsquery.op("||")(func.plainto_tsquery("english", term))
+        rank = func.ts_rank_cd(DocumentChunk.content_tsv, tsquery).label("rank")
+
+        query = (
+            select(
+                DocumentChunk.id,
+                DocumentChunk.content,
+                DocumentChunk.page_number,
+                DocumentChunk.section_path,
+                rank
+            )
+            .where(
+                DocumentChunk.document_id == document_id,
+                DocumentChunk.content_tsv.op("@@")(tsquery),
+                self._section_filter(section_prefix)
+            )
+            .order_by(rank.desc())
+            .limit(top_k)
+        )
+
+        result = await db.execute(query)
+        chunks = [
+            {
+                "id": row.id,
+                "content": row.content,
+                "page_number": row.page_number,
+                "section_path": row.section_path,
+                "keyword_rank": float(row.rank)
+            }
+            for row in result.all()
+        ]
+
+        print(f"🔎 Keyword search found {len(chunks)} chunks with pages: {[c['page_number'] for c in chunks]}")
+        return chunks
+
+    @staticmethod
+    async def _tune_filtered_scan(db: AsyncSession, ef_search: int | None = None):
+        """Transaction-local HNSW settings for scans filtered by document.
+
+        The HNSW indexes are global: rows of other documents are filtered out after
+        the index scan, so with the default ef_search (40) a document-scoped query
+        can return fewer than top_k rows. Iterative scans keep walking the graph
+        until enough rows pass the filter. `ef_search` overrides HNSW_EF_SEARCH.
+        """
+        ef_search = ef_search or settings.HNSW_EF_SEARCH
+        await db.execute(select(func.set_config("hnsw.ef_search", str(int(ef_search)), True)))
+        if settings.HNSW_ITERATIVE_SCAN != "off":
+            await db.execute(select(func.set_config("hnsw.iterative_scan", settings.HNSW_ITERATIVE_SCAN, True)))
+
+    @staticmethod
+    def _page_filter(query_embedding: list[float], document_id: uuid.UUID):
+        """Coarse stage: restrict chunks to the pages whose mean embedding is closest to the query."""
+        top_pages = (
+            select(DocumentPage.page_number)
+            .where(DocumentPage.document_id == document_id, DocumentPage.embedding.is_not(None))
+            .order_by(DocumentPage.embedding.cosine_distance(query_embedding))
+            .limit(settings.TWO_STAGE_TOP_PAGES)
+        )
+        return DocumentChunk.page_number.in_(top_pages.scalar_subquery())
+
+    @staticmethod
+    def _section_filter(section_prefix: str | None):
+        """Restrict chunks to a section and its subsections (served by ix_document_chunks_section_path)."""
+        if not section_prefix:
+            return true()
+        return or_(
+            DocumentChunk.section_path == section_prefix,
+            DocumentChunk.section_path.startswith(section_prefix + " > ", autoescape=True)
+        )
+
+    @staticmethod
+    def _approximate_distance(query_embedding: list[float], mode: str):
+        """Distance expression matching the halfvec / binary expression indexes."""
+        dim = settings.EMBEDDING_DIMENSION
+        if mode == "halfvec":
+            return cast(DocumentChunk.embedding, HALFVEC(dim)).cosine_distance(
+                cast(query_embedding, HALFVEC(dim))
+            )
+        if mode == "binary":
+            return cast(func.binary_quantize(DocumentChunk.embedding), BIT(dim)).hamming_distance(
+                cast(func.binary_quantize(cast(query_embedding, Vector(dim))), BIT(dim))
+            )
+        raise ValueError(f"Unknown VECTOR_STORAGE_MODE: {mode}")
+
 
 vector_search_service = VectorSearchService()
@@ -0,0 +1,122 @@
+"""Measure what entity canonicalization does to graph size and query latency.
+
+Usage: python benchmark_entity_canonicalization.py [--triplets 2000] [--queries 200]
+                                                 [--backend embedded|neo4j] [--embeddings]
+
+Generates triplets whose entity names come in the surface variants an LLM
+produces ("DNA", "dna", "the DNA", "Deoxyribonucleic acid (DNA)", plurals),
+canonicalizes them, loads the raw and canonical graphs as two documents and
+reports entity / relationship counts plus p50 / p95 latency of a 2-hop
+expansion and the full-graph export. Rules only unless --embeddings (which
+loads the embedding model). Both benchmark graphs are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.embeddings import embedding_service
+from app.services.entity_canonicalizer import entity_canonicalizer
+from app.services.graph_service import graph_service
+from app.services.embedded_graph import EmbeddedGraphBackend
+
+RELATIONS = ["is part of", "produces", "depends on", "regulates", "contains"]
+
+
+def variants(concept: str, acronym: str) -> list[str]:
+    return [
+        concept, concept.lower(), f"the {concept}", f"{concept}s",
+        acronym, acronym.lower(), f"{concept} ({acronym})",
+    ]
+
+
+def noisy_triplets(count: int) -> list[dict]:
+    concepts = [(f"Compound {i} Molecule", f"CM{i}") for i in range(count // 10 + 2)]
+
+    def mention():
+        return random.choice(variants(*random.choice(concepts)))
+
+    return [
+        {
+            "subject": mention(),
+            "relation": random.choice(RELATIONS),
+            "object": mention(),
+            "page_number": random.randint(1, 100),
+        }
+        for _ in range(count)
+    ]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def two_hop(backend, document_id, start: str):
+    rows = await backend.neighbors(document_id, [start], settings.GRAPH_FANOUT)
+    frontier = list(dict.fromkeys(r["neighbor"] for r in rows))
+    return rows + await backend.neighbors(document_id, frontier, settings.GRAPH_FANOUT)
+
+
+async def measure(backend, document_id, queries: int) -> dict[str, list[float]]:
+    names = await backend.entity_names(document_id)
+    latencies = {"2-hop": [], "export": []}
+    for _ in range(queries):
+        start = time.perf_counter()
+        await two_hop(backend, document_id, random.choice(names))
+        latencies["2-hop"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        [link async for link in backend.links(document_id)]
+        latencies["export"].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def main(triplets: int, queries: int, backend_name: str, embeddings: bool):
+    random.seed(7)
+    raw = noisy_triplets(triplets)
+    if embeddings:
+        await embedding_service.initialize()
+    else:
+        settings.ENTITY_CANONICAL_THRESHOLD = 1.0
+
+    start = time.perf_counter()
+    canonical, aliases = entity_canonicalizer.canonicalize(uuid.uuid4(), raw)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.UPLOAD_DIR = directory
+        backend = graph_service if backend_name == "neo4j" else EmbeddedGraphBackend()
+        graphs = {"raw": uuid.uuid4(), "canonical": uuid.uuid4()}
+        try:
+            await backend.write_triplets(graphs["raw"], raw)
+            await backend.write_triplets(graphs["canonical"], canonical)
+
+            print(f"Canonicalized {len(raw)} triplets in {elapsed:.0f} ms, {len(aliases)} aliases ({backend_name})\n")
+            print(f"{'graph':<11}{'entities':<10}{'rels':<8}{'2-hop p50':<11}{'2-hop p95':<11}{'export p50':<12}{'export p95':<12}")
+            for label, document_id in graphs.items():
+                entities = len(await backend.entity_names(document_id))
+                relationships = len([link async for link in backend.links(document_id)])
+                latencies = await measure(backend, document_id, queries)
+                print(
+                    f"{label:<11}{entities:<10}{relationships:<8}"
+                    f"{percentile(latencies['2-hop'], 0.5):<11.2f}{percentile(latencies['2-hop'], 0.95):<11.2f}"
+                    f"{percentile(latencies['export'], 0.5):<12.2f}{percentile(latencies['export'], 0.95):<12.2f}"
+                )
+        finally:
+            for document_id in graphs.values():
+                await backend.delete_document_graph(document_id)
+            await graph_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--triplets", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--backend", choices=["embedded", "neo4j"], default="embedded")
+    parser.add_argument("--embeddings", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.triplets, args.queries, args.backend, args.embeddings))
@@ -0,0 +1,99 @@
+"""Benchmark the Neo4j and embedded (CSR) graph backends on the same operations.
+
+Usage: python benchmark_graph_backends.py [--docs 20] [--triplets 200] [--queries 50] [--skip-neo4j]
+
+Loads synthetic documents into each backend through the GraphBackend interface
+and reports p50 / p95 latency for triplet upsert, entity names (matcher load),
+1-hop lookup (chat graph expansion), full-graph export (graph view / layout)
+and delete. Neo4j documents use random ids and are deleted at the end; the
+embedded backend writes into a temporary directory.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.graph_service import graph_service
+from app.services.embedded_graph import EmbeddedGraphBackend
+
+RELATIONS = ["is part of", "produces", "depends on", "measures", "regulates"]
+
+
+def synthetic_triplets(count: int) -> list[dict]:
+    entities = [f"Concept {i}" for i in range(count // 3 + 2)]
+    return [
+        {
+            "subject": random.choice(entities),
+            "relation": random.choice(RELATIONS),
+            "object": random.choice(entities),
+            "page_number": random.randint(1, 100),
+        }
+        for _ in range(count)
+    ]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def timed(latencies: dict, name: str, coroutine):
+    start = time.perf_counter()
+    result = await coroutine
+    latencies.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+    return result
+
+
+async def export(backend, document_id):
+    return [link async for link in backend.links(document_id)]
+
+
+async def run(label: str, backend, documents: dict, queries: int):
+    latencies: dict[str, list[float]] = {}
+    try:
+        for document_id, triplets in documents.items():
+            await timed(latencies, "upsert", backend.write_triplets(document_id, triplets))
+
+        ids = list(documents)
+        for _ in range(queries):
+            document_id = random.choice(ids)
+            names = await timed(latencies, "entity names", backend.entity_names(document_id))
+            frontier = random.sample(names, min(3, len(names)))
+            await timed(latencies, "1-hop", backend.neighbors(document_id, frontier, settings.GRAPH_FANOUT))
+            await timed(latencies, "export", export(backend, document_id))
+    finally:
+        for document_id in documents:
+            await timed(latencies, "delete", backend.delete_document_graph(document_id))
+
+    for name, values in latencies.items():
+        print(f"{label:<10}{name:<14}{len(values):<8}{percentile(values, 0.5):<10.2f}{percentile(values, 0.95):<10.2f}")
+
+
+async def main(docs: int, triplets: int, queries: int, skip_neo4j: bool):
+    documents = {uuid.uuid4(): synthetic_triplets(triplets) for _ in range(docs)}
+    print(f"{docs} documents x {triplets} triplets, {queries} lookups\n")
+    print(f"{'backend':<10}{'operation':<14}{'runs':<8}{'p50 ms':<10}{'p95 ms':<10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.UPLOAD_DIR = directory
+        await run("embedded", EmbeddedGraphBackend(), documents, queries)
+
+    if not skip_neo4j:
+        try:
+            await run("neo4j", graph_service, documents, queries)
+        finally:
+            await graph_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--triplets", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--skip-neo4j", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.triplets, args.queries, args.skip_neo4j))
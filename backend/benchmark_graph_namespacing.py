@@ -0,0 +1,136 @@
+"""Benchmark doc-scoped graph queries with global vs per-document entity nodes.
+
+Usage: python benchmark_graph_namespacing.py [--docs 10,100,500] [--triplets 50] [--queries 20]
+
+Loads synthetic documents that all mention a few popular entities ("Energy",
+"Data", ...) under two layouts, side by side in Neo4j:
+  global    - :BenchGlobal {name}            (the old layout: shared supernodes)
+  scoped    - :BenchScoped {doc_id, name}    (the current layout)
+and times the chat 1-hop expansion and the graph-view query for one document
+as the number of loaded documents grows. All benchmark nodes are removed at the end.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.graph_service import graph_service
+
+POPULAR = ["Energy", "Data", "System", "Process", "Model", "Cell", "Function", "Structure"]
+
+SETUP = [
+    "CREATE CONSTRAINT bench_global_name IF NOT EXISTS FOR (e:BenchGlobal) REQUIRE e.name IS UNIQUE",
+    "CREATE CONSTRAINT bench_scoped_key IF NOT EXISTS FOR (e:BenchScoped) REQUIRE (e.doc_id, e.name) IS UNIQUE",
+    "CREATE INDEX bench_rel_doc_id IF NOT EXISTS FOR ()-[r:BENCH_RELATES_TO]-() ON (r.doc_id)",
+]
+TEARDOWN = [
+    "DROP CONSTRAINT bench_global_name IF EXISTS",
+    "DROP CONSTRAINT bench_scoped_key IF EXISTS",
+    "DROP INDEX bench_rel_doc_id IF EXISTS",
+]
+
+LOAD = {
+    "global": """
+        UNWIND $triplets AS t
+        MERGE (s:BenchGlobal {name: t.subject})
+        MERGE (o:BenchGlobal {name: t.object})
+        MERGE (s)-[:BENCH_RELATES_TO {relation: t.relation, page: t.page, doc_id: $doc_id}]->(o)
+    """,
+    "scoped": """
+        UNWIND $triplets AS t
+        MERGE (s:BenchScoped {doc_id: $doc_id, name: t.subject})
+        MERGE (o:BenchScoped {doc_id: $doc_id, name: t.object})
+        MERGE (s)-[:BENCH_RELATES_TO {relation: t.relation, page: t.page, doc_id: $doc_id}]->(o)
+    """,
+}
+
+QUERIES = {
+    ("global", "1-hop"): """
+        MATCH (s:BenchGlobal)-[r:BENCH_RELATES_TO {doc_id: $doc_id}]->(o:BenchGlobal)
+        WHERE s.name IN $entities OR o.name IN $entities
+        RETURN s.name, r.relation, o.name, r.page LIMIT 10
+    """,
+    ("scoped", "1-hop"): """
+        UNWIND $entities AS name
+        MATCH (e:BenchScoped {doc_id: $doc_id, name: name})-[r:BENCH_RELATES_TO]-()
+        WITH DISTINCT r
+        RETURN startNode(r).name, r.relation, endNode(r).name, r.page LIMIT 10
+    """,
+    ("global", "graph view"): """
+        MATCH (s:BenchGlobal)-[r:BENCH_RELATES_TO {doc_id: $doc_id}]->(o:BenchGlobal)
+        RETURN s.name, r.relation, o.name
+    """,
+    ("scoped", "graph view"): """
+        MATCH (s:BenchScoped {doc_id: $doc_id})-[r:BENCH_RELATES_TO]->(o:BenchScoped)
+        RETURN s.name, r.relation, o.name
+    """,
+}
+
+
+def synthetic_triplets(doc_index: int, count: int) -> list[dict]:
+    local = [f"Concept {doc_index}-{i}" for i in range(count // 2 + 1)]
+    return [
+        {
+            "subject": random.choice(POPULAR + local),
+            "relation": random.choice(["is part of", "produces", "depends on", "measures"]),
+            "object": random.choice(POPULAR + local),
+            "page": random.randint(1, 50),
+        }
+        for _ in range(count)
+    ]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def benchmark(doc_counts: list[int], triplets: int, queries: int):
+    for statement in SETUP:
+        await graph_service.execute_write(statement)
+
+    loaded = 0
+    try:
+        print(f"\n{'docs':<8}{'layout':<9}{'query':<13}{'p50 ms':<10}{'p95 ms':<10}")
+        for target in doc_counts:
+            while loaded < target:
+                data = synthetic_triplets(loaded, triplets)
+                for layout in LOAD:
+                    await graph_service.execute_write(LOAD[layout], {"triplets": data, "doc_id": f"bench-{loaded}"})
+                loaded += 1
+
+            for (layout, name), query in QUERIES.items():
+                latencies = []
+                for _ in range(queries):
+                    parameters = {
+                        "doc_id": f"bench-{random.randrange(loaded)}",
+                        "entities": random.sample(POPULAR, 2),
+                    }
+                    start = time.perf_counter()
+                    await graph_service.execute_read(query, parameters)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                print(
+                    f"{loaded:<8}{layout:<9}{name:<13}"
+                    f"{percentile(latencies, 0.5):<10.2f}{percentile(latencies, 0.95):<10.2f}"
+                )
+    finally:
+        for label in ("BenchGlobal", "BenchScoped"):
+            while True:
+                records = await graph_service.execute_write(
+                    f"MATCH (e:{label}) WITH e LIMIT 1000 DETACH DELETE e RETURN count(*) AS deleted"
+                )
+                if not records or records[0]["deleted"] < 1000:
+                    break
+        for statement in TEARDOWN:
+            await graph_service.execute_write(statement)
+        await graph_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", default="10,100,500")
+    parser.add_argument("--triplets", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(benchmark([int(d) for d in args.docs.split(",")], args.triplets, args.queries))
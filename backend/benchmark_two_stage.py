@@ -0,0 +1,91 @@
+"""Compare flat chunk scan with two-stage page-then-chunk search: recall@k and latency per document.
+
+Usage: python benchmark_two_stage.py [--queries 50] [--top-k 5] [--top-pages 20] [--min-chunks 0]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.chunk import DocumentChunk
+from app.models.document import Document
+from app.services.vector_search import vector_search_service
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def benchmark(num_queries: int, top_k: int, top_pages: int, min_chunks: int):
+    settings.TWO_STAGE_TOP_PAGES = top_pages
+    async with async_session() as db:
+        result = await db.execute(
+            select(Document.id, Document.filename, Document.total_chunks, Document.total_pages)
+            .where(Document.total_chunks >= min_chunks)
+            .order_by(Document.total_chunks.desc())
+        )
+        documents = result.all()
+        if not documents:
+            print("No documents found. Ingest a document first.")
+            return
+
+        print(f"\nTop pages: {top_pages}, top-k: {top_k}")
+        print(
+            f"{'document':<32}{'chunks':<8}{'pages':<7}{'recall@' + str(top_k):<11}"
+            f"{'flat p50':<10}{'flat p95':<10}{'2st p50':<10}{'2st p95':<10}"
+        )
+        for doc in documents:
+            # Each sampled chunk's own embedding is used as a query vector
+            sample_result = await db.execute(
+                select(DocumentChunk.embedding)
+                .where(DocumentChunk.document_id == doc.id, DocumentChunk.embedding.is_not(None))
+            )
+            queries = [list(v) for v in sample_result.scalars().all()]
+            queries = random.sample(queries, min(num_queries, len(queries)))
+            if not queries:
+                continue
+
+            flat_ms, staged_ms = [], []
+            hits = expected_total = 0
+            for query in queries:
+                start = time.perf_counter()
+                flat = await vector_search_service.search_similar(
+                    query, doc.id, db, top_k=top_k, storage_mode="full", backend="pgvector", two_stage=False
+                )
+                flat_ms.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                staged = await vector_search_service.search_similar(
+                    query, doc.id, db, top_k=top_k, storage_mode="full", backend="pgvector", two_stage=True
+                )
+                staged_ms.append((time.perf_counter() - start) * 1000)
+
+                expected = {c["id"] for c in flat}
+                hits += len(expected & {c["id"] for c in staged})
+                expected_total += len(expected)
+
+            recall = hits / max(1, expected_total)
+            print(
+                f"{doc.filename[:30]:<32}{doc.total_chunks:<8}{doc.total_pages:<7}{recall:<11.3f}"
+                f"{percentile(flat_ms, 0.5):<10.2f}{percentile(flat_ms, 0.95):<10.2f}"
+                f"{percentile(staged_ms, 0.5):<10.2f}{percentile(staged_ms, 0.95):<10.2f}"
+            )
+
+        print(f"\nTWO_STAGE_MIN_CHUNKS is currently {settings.TWO_STAGE_MIN_CHUNKS}: "
+              f"pick the size where two-stage latency wins at acceptable recall.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--top-pages", type=int, default=settings.TWO_STAGE_TOP_PAGES)
+    parser.add_argument("--min-chunks", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.queries, args.top_k, args.top_pages, args.min_chunks))
@@ -0,0 +1,95 @@
+"""Compare full / halfvec / binary candidate search: recall@k, latency and index size.
+
+Usage: python benchmark_vector_storage.py [--queries 50] [--top-k 5]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import select, text
+
+from app.core.database import async_session
+from app.models.chunk import DocumentChunk
+from app.services.vector_search import vector_search_service
+
+MODES = ["full", "halfvec", "binary"]
+INDEXES = {
+    "full": "ix_document_chunks_embedding",
+    "halfvec": "ix_document_chunks_embedding_halfvec",
+    "binary": "ix_document_chunks_embedding_binary",
+}
+
+
+async def benchmark(num_queries: int, top_k: int):
+    async with async_session() as db:
+        # Sample stored chunks; each chunk's own embedding is used as a query vector
+        result = await db.execute(
+            select(DocumentChunk.document_id, DocumentChunk.embedding)
+            .where(DocumentChunk.embedding.is_not(None))
+        )
+        samples = result.all()
+        if not samples:
+            print("No embedded chunks found. Ingest a document first.")
+            return
+        samples = random.sample(samples, min(num_queries, len(samples)))
+
+        # Ground truth: exact float32 top-k (`full` has an HNSW index too, so index scans are
+        # disabled for this transaction and the planner falls back to a sequential scan)
+        await db.execute(text("SET LOCAL enable_indexscan = off"))
+        truth = []
+        for row in samples:
+            chunks = await vector_search_service.search_similar(
+                list(row.embedding), row.document_id, db, top_k=top_k, storage_mode="full",
+                backend="pgvector", two_stage=False
+            )
+            truth.append({c["id"] for c in chunks})
+        await db.rollback()
+
+        print(f"\n{'mode':<10}{'recall@' + str(top_k):<12}{'p50 ms':<10}{'p95 ms':<10}{'index size':<12}")
+        for mode in MODES:
+            latencies = []
+            hits = 0
+            for row, expected in zip(samples, truth):
+                start = time.perf_counter()
+                chunks = await vector_search_service.search_similar(
+                    list(row.embedding), row.document_id, db, top_k=top_k, storage_mode=mode,
+                    backend="pgvector", two_stage=False
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & {c["id"] for c in chunks})
+
+            latencies.sort()
+            recall = hits / max(1, sum(len(t) for t in truth))
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+            size = "-"
+            if mode in INDEXES:
+                # Partitioned index: the parent has no storage, its per-partition indexes do
+                size_result = await db.execute(
+                    text(
+                        "SELECT pg_size_pretty(coalesce(sum(pg_relation_size(relid)), 0)) "
+                        "FROM pg_partition_tree(CAST(:name AS regclass))"
+                    ),
+                    {"name": INDEXES[mode]}
+                )
+                size = size_result.scalar()
+            print(f"{mode:<10}{recall:<12.3f}{p50:<10.2f}{p95:<10.2f}{size:<12}")
+
+        table_result = await db.execute(
+            text(
+                "SELECT pg_size_pretty(coalesce(sum(pg_total_relation_size(relid)), 0)) "
+                "FROM pg_partition_tree('document_chunks')"
+            )
+        )
+        print(f"\ndocument_chunks total size (table + indexes): {table_result.scalar()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.queries, args.top_k))
@@ -0,0 +1,96 @@
+"""Migrate document_chunks to the hash-partitioned layout, with before/after benchmarks.
+
+Usage: python partition_chunks.py [--samples 20]
+
+Runs the benchmark, applies the partitioning migration (436346e4f04b) with
+Alembic, then runs the benchmark again. The delete benchmark runs inside a
+rolled-back transaction, so no data is removed.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, text, func
+
+from app.core.database import async_session, engine
+from app.models.chunk import DocumentChunk
+from app.services.vector_search import vector_search_service
+
+PARTITION_REVISION = "436346e4f04b"
+
+
+async def benchmark(label: str, samples: int):
+    async with async_session() as db:
+        result = await db.execute(
+            select(DocumentChunk.document_id, func.count())
+            .group_by(DocumentChunk.document_id)
+        )
+        documents = result.all()
+        if not documents:
+            print("No chunks found. Ingest some documents first.")
+            await engine.dispose()
+            return
+        documents = random.sample(documents, min(samples, len(documents)))
+
+        search_ms = []
+        delete_ms = []
+        scanned = []
+        for document_id, _ in documents:
+            embedding_result = await db.execute(
+                select(DocumentChunk.embedding)
+                .where(DocumentChunk.document_id == document_id)
+                .limit(1)
+            )
+            query_embedding = list(embedding_result.scalar())
+
+            start = time.perf_counter()
+            await vector_search_service.search_similar(query_embedding, document_id, db, backend="pgvector")
+            search_ms.append((time.perf_counter() - start) * 1000)
+
+            # Count how many tables the planner touches for a document-scoped query
+            plan = await db.execute(
+                text("EXPLAIN SELECT id FROM document_chunks WHERE document_id = :doc_id"),
+                {"doc_id": document_id}
+            )
+            scanned.append(sum(1 for (line,) in plan if " on document_chunks" in line))
+
+            # Time the reprocess-style delete, then roll it back
+            async with db.begin_nested() as savepoint:
+                start = time.perf_counter()
+                await db.execute(
+                    text("DELETE FROM document_chunks WHERE document_id = :doc_id"),
+                    {"doc_id": document_id}
+                )
+                delete_ms.append((time.perf_counter() - start) * 1000)
+                await savepoint.rollback()
+
+        # A partitioned parent has no storage of its own: sum the tree (also right before partitioning)
+        size_result = await db.execute(text(
+            "SELECT pg_size_pretty(coalesce(sum(pg_total_relation_size(relid)), 0)) "
+            "FROM pg_partition_tree('document_chunks')"
+        ))
+        await db.rollback()
+
+    search_ms.sort()
+    delete_ms.sort()
+    print(f"\n== {label} ({len(documents)} documents sampled) ==")
+    print(f"vector search p50: {search_ms[len(search_ms) // 2]:.2f} ms, max: {search_ms[-1]:.2f} ms")
+    print(f"per-document delete p50: {delete_ms[len(delete_ms) // 2]:.2f} ms, max: {delete_ms[-1]:.2f} ms")
+    print(f"tables scanned per document query: {max(scanned)}")
+    print(f"document_chunks total size: {size_result.scalar()}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark("before", args.samples))
+    print(f"\nApplying migration {PARTITION_REVISION}...")
+    command.upgrade(Config("alembic.ini"), PARTITION_REVISION)
+    asyncio.run(benchmark("after", args.samples))
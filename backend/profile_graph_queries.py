@@ -0,0 +1,102 @@
+"""PROFILE the hot Neo4j queries before and after the graph schema migrations.
+
+Usage: python profile_graph_queries.py [--document-id <uuid>] [--target <version>]
+
+Profiles the chat / graph-view queries on a sample document, applies the
+pending migrations from app/services/graph_schema.py, then profiles again.
+Only read queries are profiled (PROFILE executes the query); the ingestion
+MERGE is represented by the equivalent Entity name lookup.
+"""
+
+import argparse
+import asyncio
+
+from neo4j import AsyncGraphDatabase
+
+from app.core.config import settings
+from app.services.graph_service import graph_service
+from app.services.graph_schema import graph_schema_service
+
+QUERIES = {
+    "entity lookup (MERGE match)": (
+        "MATCH (e:Entity {doc_id: $doc_id, name: $name}) RETURN e.name"
+    ),
+    "doc entities": (
+        "MATCH (e:Entity {doc_id: $doc_id}) RETURN e.name AS name"
+    ),
+    "1-hop expansion": (
+        "UNWIND $entities AS name "
+        "MATCH (e:Entity {doc_id: $doc_id, name: name})-[r:RELATES_TO]-() "
+        "WITH DISTINCT r "
+        "RETURN startNode(r).name AS subject, r.relation AS relation, endNode(r).name AS object, "
+        "r.page AS page LIMIT 10"
+    ),
+    "graph view": (
+        "MATCH (s:Entity {doc_id: $doc_id})-[r:RELATES_TO]->(o:Entity) "
+        "RETURN s.name AS source, r.relation AS relation, o.name AS target"
+    ),
+}
+
+
+def summarize(plan: dict) -> tuple[int, list[str]]:
+    """Total db hits and the operator names of a profiled plan."""
+    hits = plan.get("dbHits", 0)
+    operators = [plan.get("operatorType", "?").split("@")[0]]
+    for child in plan.get("children", []):
+        child_hits, child_operators = summarize(child)
+        hits += child_hits
+        operators += child_operators
+    return hits, operators
+
+
+async def sample_parameters(document_id: str | None) -> dict:
+    if document_id is None:
+        records = await graph_service.execute_read(
+            "MATCH ()-[r:RELATES_TO]->() RETURN r.doc_id AS doc_id LIMIT 1"
+        )
+        if not records:
+            return {}
+        document_id = records[0]["doc_id"]
+    records = await graph_service.execute_read(
+        "MATCH (s:Entity)-[r:RELATES_TO {doc_id: $doc_id}]->(o:Entity) RETURN s.name AS s, o.name AS o LIMIT 3",
+        {"doc_id": document_id}
+    )
+    entities = sorted({name for r in records for name in (r["s"], r["o"])})
+    return {"doc_id": document_id, "entities": entities, "name": entities[0] if entities else ""}
+
+
+async def profile(label: str, parameters: dict):
+    driver = AsyncGraphDatabase.driver(settings.NEO4J_URI, auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD))
+    print(f"\n== {label} (schema v{await graph_schema_service.current_version()}) ==")
+    print(f"{'query':<30}{'db hits':<12}{'rows':<8}{'ms':<8}operators")
+    async with driver.session(default_access_mode="READ") as session:
+        for name, query in QUERIES.items():
+            result = await session.run(f"PROFILE {query}", parameters)
+            rows = len([r async for r in result])
+            summary = await result.consume()
+            hits, operators = summarize(summary.profile or {})
+            elapsed = (summary.result_available_after or 0) + (summary.result_consumed_after or 0)
+            print(f"{name:<30}{hits:<12}{rows:<8}{elapsed:<8}{' > '.join(dict.fromkeys(operators))}")
+    await driver.close()
+
+
+async def main(document_id: str | None, target: int | None):
+    parameters = await sample_parameters(document_id)
+    if not parameters:
+        print("No graph data found. Ingest a document with GraphRAG enabled first.")
+        await graph_service.close()
+        return
+
+    await profile("before", parameters)
+    version = await graph_schema_service.apply(target)
+    print(f"\nApplied graph schema migrations up to v{version}")
+    await profile("after", parameters)
+    await graph_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--document-id", default=None)
+    parser.add_argument("--target", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.document_id, args.target))
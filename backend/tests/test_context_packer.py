@@ -0,0 +1,49 @@
+import pytest
+from app.services.context_packer import ContextPacker, strip_overlap, shingle_similarity
+from app.services.embeddings import embedding_service
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    """Word-count tokenizer and keyword embeddings: 'cell' sentences match the question."""
+    monkeypatch.setattr(embedding_service, "count_tokens", lambda texts: [len(t.split()) for t in texts])
+    monkeypatch.setattr(
+        embedding_service, "embed_texts",
+        lambda texts: [[1.0, 0.0] if "cell" in t.lower() else [0.0, 1.0] for t in texts]
+    )
+
+
+class TestContextPacker:
+    def test_strip_overlap_removes_repeated_prefix(self):
+        previous = "Cells divide by mitosis. The nucleus splits into two."
+        text = "The nucleus splits into two. Each daughter cell is identical."
+
+        assert strip_overlap(previous, text) == "Each daughter cell is identical."
+
+    def test_shingle_similarity(self):
+        assert shingle_similarity("a b c d", "a b c d") == 1.0
+        assert shingle_similarity("a b c d", "w x y z") == 0.0
+
+    def test_pack_drops_duplicates_and_irrelevant_sentences(self, fake_embeddings):
+        items = [
+            {"page_number": 1, "content": "The cell is the unit of life. Rivers flow downhill."},
+            {"page_number": 4, "content": "The cell is the unit of life. Rivers flow downhill."},
+            {"page_number": "Web", "content": "Title: Rivers\nURL: x\nSnippet: Rivers flow."},
+        ]
+
+        packed, facts = ContextPacker().pack("what is a cell?", items, ["- cell has nucleus"], budget=100)
+
+        assert [c["page_number"] for c in packed] == [1, "Web"]
+        assert packed[0]["content"] == "The cell is the unit of life."
+        assert packed[1]["content"] == items[2]["content"]
+        assert facts == ["- cell has nucleus"]
+
+    def test_pack_respects_budget(self, fake_embeddings):
+        items = [
+            {"page_number": 1, "content": "Cell one has many words here."},
+            {"page_number": 2, "content": "Cell two has many words here too."},
+        ]
+
+        packed, _ = ContextPacker().pack("cell", items, [], budget=8)
+
+        assert [c["page_number"] for c in packed] == [1]
@@ -0,0 +1,54 @@
+import uuid
+import pytest
+from app.core.config import settings
+from app.services.embedded_graph import EmbeddedGraphBackend
+
+
+def triplet(subject, relation, obj, page=1):
+    return {"subject": subject, "relation": relation, "object": obj, "page_number": page}
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestEmbeddedGraph:
+    @pytest.mark.asyncio
+    async def test_upsert_lookup_export_and_delete(self, upload_dir):
+        backend = EmbeddedGraphBackend()
+        document_id = uuid.uuid4()
+        other_id = uuid.uuid4()
+
+        written = await backend.write_triplets(document_id, [
+            triplet("ATP", "powers", "Pump", page=3),
+            triplet("Pump", "moves", "Ions", page=4),
+            triplet("ATP", "powers", "Pump", page=3),  # duplicate: merged
+            {"subject": "ATP", "relation": None, "object": "Cell"},  # malformed: skipped
+        ])
+        await backend.write_triplets(document_id, [triplet("Cell", "stores", "ATP", page=7)])
+        await backend.write_triplets(other_id, [triplet("ATP", "fuels", "Muscle")])
+
+        assert written == 3
+        assert await backend.entity_names(document_id) == ["ATP", "Pump", "Ions", "Cell"]
+
+        rows = await backend.neighbors(document_id, ["ATP"], fanout=5)
+        assert {(r["subject"], r["relation"], r["object"], r["page"]) for r in rows} == {
+            ("ATP", "powers", "Pump", 3), ("Cell", "stores", "ATP", 7)
+        }
+        # Lowest-degree neighbour first, fanout respected
+        assert [r["neighbor"] for r in rows] == ["Cell", "Pump"]
+        assert len(await backend.neighbors(document_id, ["ATP"], fanout=1)) == 1
+
+        # Reloaded from disk by a fresh instance; pagination by rel_id
+        reloaded = EmbeddedGraphBackend()
+        first = [link async for link in reloaded.links(document_id, limit=2)]
+        rest = [link async for link in reloaded.links(document_id, cursor=first[-1]["rel_id"])]
+        assert [(l["source"], l["target"]) for l in first + rest] == [("ATP", "Pump"), ("Pump", "Ions"), ("Cell", "ATP")]
+        focus = [link async for link in reloaded.links(document_id, focus="Ions", depth=1)]
+        assert [(l["source"], l["target"]) for l in focus] == [("Pump", "Ions")]
+
+        assert await reloaded.delete_document_graph(document_id) == 4
+        assert await reloaded.entity_names(document_id) == []
+        assert await reloaded.entity_names(other_id) == ["ATP", "Muscle"]
@@ -0,0 +1,81 @@
+import uuid
+import pytest
+from app.core.config import settings
+from app.services.embeddings import embedding_service
+from app.services.entity_canonicalizer import EntityCanonicalizer, canonical_key
+from app.services.entity_matcher import EntityMatcher
+
+
+def triplet(subject, relation, obj, page=1):
+    return {"subject": subject, "relation": relation, "object": obj, "page_number": page}
+
+
+class TestEntityCanonicalizer:
+    def test_rules_merge_variants_and_collapse_edges(self, monkeypatch):
+        monkeypatch.setattr(settings, "ENTITY_CANONICAL_THRESHOLD", 1.0)
+        triplets = [
+            triplet("DNA", "encodes", "Proteins"),
+            triplet("the DNA", "encodes", "protein"),
+            triplet("Deoxyribonucleic acid (DNA)", "is stored in", "Nucleus", page=2),
+            triplet("dna", "is", "DNA"),
+            triplet("Cell (biology)", "contains", "Nucleus", page=2),
+        ]
+
+        canonical, aliases = EntityCanonicalizer().canonicalize(uuid.uuid4(), triplets)
+
+        assert canonical_key("The Mitochondria's Proteins") == "mitochondria s protein"
+        assert [(t["subject"], t["object"]) for t in canonical] == [
+            ("DNA", "Proteins"), ("DNA", "Nucleus"), ("Cell (biology)", "Nucleus")
+        ]
+        assert aliases == {
+            "the DNA": "DNA", "Deoxyribonucleic acid (DNA)": "DNA", "Deoxyribonucleic acid": "DNA",
+            "dna": "DNA", "protein": "Proteins",
+        }
+
+    def test_disambiguating_parentheticals_are_not_merged(self, monkeypatch):
+        monkeypatch.setattr(settings, "ENTITY_CANONICAL_THRESHOLD", 1.0)
+        names = ["Mercury (planet)", "Mercury (element)", "Vitamin B (B6)", "Vitamin B (B12)"]
+
+        mapping = EntityCanonicalizer().cluster(names, {name: 1 for name in names})
+
+        assert mapping == {name: name for name in names}
+
+    def test_embedding_similarity_merges_remaining_groups(self, monkeypatch):
+        vectors = {"mitochondrion": [1.0, 0.0], "mitochondria": [0.99, 0.05], "nucleus": [0.0, 1.0]}
+        monkeypatch.setattr(embedding_service, "embed_texts", lambda texts: [vectors[t] for t in texts])
+
+        mapping = EntityCanonicalizer().cluster(
+            ["Mitochondrion", "mitochondria", "Nucleus"], {"Mitochondrion": 2, "mitochondria": 1, "Nucleus": 1}
+        )
+
+        assert mapping == {"Mitochondrion": "Mitochondrion", "mitochondria": "Mitochondrion", "Nucleus": "Nucleus"}
+
+    def test_numbered_names_and_chains_are_not_merged(self, monkeypatch):
+        # An embedder that cannot tell the names apart
+        monkeypatch.setattr(embedding_service, "embed_texts", lambda texts: [[1.0, 0.0] for _ in texts])
+        names = [
+            "Type 1 diabetes", "Type 2 diabetes", "Newton's first law", "Newton's second law",
+            "DNA polymerase I", "DNA polymerase III",
+        ]
+
+        mapping = EntityCanonicalizer().cluster(names, {name: 1 for name in names})
+
+        assert mapping == {name: name for name in names}
+        assert canonical_key("Physics news") == "physics news"
+        assert canonical_key("Means of Production") == "means of production"
+
+        # a ~ b and b ~ c but not a ~ c: complete linkage keeps a and c apart
+        vectors = {"a": [1.0, 0.0], "b": [0.96, 0.28], "c": [0.8, 0.6]}
+        monkeypatch.setattr(embedding_service, "embed_texts", lambda texts: [vectors[t] for t in texts])
+
+        mapping = EntityCanonicalizer().cluster(["a", "b", "c"], {"a": 1, "b": 1, "c": 1})
+
+        assert mapping["a"] != mapping["c"]
+
+    @pytest.mark.asyncio
+    async def test_matcher_reports_aliases_as_canonical(self):
+        matcher = EntityMatcher()
+        document_id = uuid.uuid4()
+        matcher.build(document_id, ["DNA"], {"Deoxyribonucleic acid (DNA)": "DNA", "deoxyribonucleic acid": "DNA"})
+
+        assert await matcher.match("Where is deoxyribonucleic acid (DNA) stored?", document_id) == ["DNA"]
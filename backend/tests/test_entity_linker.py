@@ -0,0 +1,28 @@
+import uuid
+import pytest
+from app.core.config import settings
+from app.services.entity_linker import EntityLinker
+
+
+def pad(vector):
+    return vector + [0.0] * (settings.EMBEDDING_DIMENSION - len(vector))
+
+
+class TestEntityLinker:
+    def test_candidate_ngrams_skip_stopword_edges(self):
+        grams = EntityLinker.candidate_ngrams("How does the photosynthetic process work?")
+
+        assert grams[0] == "photosynthetic process work"
+        assert "photosynthetic process" in grams
+        assert "the photosynthetic" not in grams
+        assert "how" not in grams
+
+    @pytest.mark.asyncio
+    async def test_links_entities_above_threshold(self):
+        linker = EntityLinker()
+        document_id = uuid.uuid4()
+        linker._remember(document_id, [pad([1.0, 0.0]), pad([0.0, 1.0])], ["photosynthesis", "mitosis"])
+
+        linked = await linker.link(document_id, [pad([0.95, 0.1]), pad([0.0, 0.0, 1.0])], db=None)
+
+        assert linked == ["photosynthesis"]
@@ -0,0 +1,36 @@
+import uuid
+import pytest
+from app.services.entity_matcher import AhoCorasick, EntityMatcher
+
+
+class TestEntityMatcher:
+    def test_automaton_finds_overlapping_patterns(self):
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+
+        assert automaton.find("ushers") == {0, 1, 3}
+
+    @pytest.mark.asyncio
+    async def test_matches_whole_normalized_names(self):
+        matcher = EntityMatcher()
+        document_id = uuid.uuid4()
+        names = ["Cell Membrane", "cell", "ATP", "art"] + [f"entity {i}" for i in range(500)]
+        matcher.build(document_id, names)
+
+        found = await matcher.match("Once started, how does the cell-membrane use ATP? See entity 420.", document_id)
+
+        # Entities past the old LIMIT 100 match; "art" does not match inside "started"
+        assert found == ["Cell Membrane", "cell", "ATP", "entity 420"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_from_graph(self, monkeypatch):
+        matcher = EntityMatcher()
+        document_id = uuid.uuid4()
+        matcher.build(document_id, ["mitosis"])
+        matcher.invalidate(document_id)
+
+        async def fake_names(document_id):
+            return ["meiosis"]
+
+        monkeypatch.setattr("app.services.entity_matcher.graph_backend.entity_names", fake_names)
+
+        assert await matcher.match("mitosis vs meiosis", document_id) == ["meiosis"]
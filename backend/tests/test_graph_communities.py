@@ -0,0 +1,40 @@
+from app.services.graph_communities import GraphCommunityService, detect_communities, label_propagation
+
+
+def triplet(subject, relation, obj, page):
+    return {"subject": subject, "relation": relation, "object": obj, "page_number": page}
+
+
+class TestGraphCommunities:
+    def test_label_propagation_separates_loosely_joined_cliques(self):
+        clique = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+        edges = clique + [(a + 4, b + 4) for a, b in clique] + [(3, 4)]
+
+        labels = label_propagation(8, edges)
+
+        assert len(set(labels[:4])) == 1 and len(set(labels[4:])) == 1
+        assert labels[0] != labels[4]
+
+    def test_communities_carry_facts_and_page_range(self):
+        triplets = [
+            triplet("Chlorophyll", "absorbs", "Light", 3),
+            triplet("Light", "drives", "Photosynthesis", 4),
+            triplet("Photosynthesis", "needs", "Chlorophyll", 5),
+            triplet("Mitochondria", "produce", "ATP", 20),
+            triplet("ATP", "powers", "Pump", 21),
+            triplet("Pump", "uses", "Mitochondria", 22),
+            triplet("Isolated", "mentions", "Pair", 30),
+        ]
+
+        communities = detect_communities(triplets)
+
+        assert len(communities) == 2  # the 2-entity pair is below COMMUNITY_MIN_SIZE
+        by_entities = {frozenset(c["entities"]): c for c in communities}
+        photosynthesis = by_entities[frozenset({"Chlorophyll", "Light", "Photosynthesis"})]
+        assert (photosynthesis["page_start"], photosynthesis["page_end"]) == (3, 5)
+        assert "Light drives Photosynthesis" in photosynthesis["facts"]
+
+    def test_global_questions(self):
+        assert GraphCommunityService.is_global("How do these topics relate overall?")
+        assert GraphCommunityService.is_global("What are the connections between the main concepts?")
+        assert not GraphCommunityService.is_global("How does ATP relate to the pump?")
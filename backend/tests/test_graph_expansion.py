@@ -0,0 +1,48 @@
+import uuid
+import pytest
+from app.services.graph_expansion import GraphExpansionService, score_facts
+
+
+def edge(subject, relation, obj, page, degree=1, hop=1):
+    return {"subject": subject, "relation": relation, "object": obj, "page": page, "degree": degree, "hop": hop}
+
+
+class TestGraphExpansion:
+    def test_scores_prefer_near_pages_low_degree_and_first_hop(self):
+        near = edge("ATP", "powers", "Pump", page=12)
+        far = edge("ATP", "powers", "Muscle", page=80)
+        hub = edge("ATP", "relates to", "Energy", page=12, degree=500)
+        second_hop = edge("Pump", "moves", "Ions", page=12, hop=2)
+
+        ranked = [e for _, e in score_facts([far, hub, second_hop, near], chunk_pages=[11, 13])]
+
+        assert ranked[0] is near
+        assert ranked.index(far) > ranked.index(near)
+        assert ranked.index(hub) > ranked.index(near)
+        assert ranked.index(second_hop) > ranked.index(near)
+
+    @pytest.mark.asyncio
+    async def test_walk_is_cached_until_invalidated(self, monkeypatch):
+        service = GraphExpansionService()
+        document_id = uuid.uuid4()
+        calls = []
+
+        async def fake_neighbors(document_id, frontier, fanout):
+            calls.append(frontier)
+            if frontier == ["ATP"]:
+                return [{
+                    "subject": "ATP", "relation": "powers", "object": "Pump", "page": 3,
+                    "neighbor": "Pump", "degree": 2, "rel_id": "r1",
+                }]
+            return []
+
+        monkeypatch.setattr("app.services.graph_expansion.graph_backend.neighbors", fake_neighbors)
+
+        facts = await service.expand(document_id, ["ATP"], [3])
+        await service.expand(document_id, ["ATP"], [40])
+        assert facts == ["- ATP powers Pump (Found on Page 3)"]
+        assert calls == [["ATP"], ["Pump"]]
+
+        service.invalidate(document_id)
+        await service.expand(document_id, ["ATP"], [3])
+        assert len(calls) == 4
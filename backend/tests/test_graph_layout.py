@@ -0,0 +1,24 @@
+import numpy as np
+from app.services.graph_layout import compute_layout, EDGE_LENGTH
+
+
+class TestGraphLayout:
+    def test_layout_is_deterministic_and_keeps_clusters_apart(self):
+        # Two dense triangles joined by a single bridge
+        links = [("a", "b"), ("b", "c"), ("c", "a"), ("x", "y"), ("y", "z"), ("z", "x"), ("c", "x")]
+        names = ["a", "b", "c", "x", "y", "z"]
+
+        positions = compute_layout(names, links)
+
+        assert positions == compute_layout(names, links)
+        assert set(positions) == set(names)
+        points = {n: np.asarray(p) for n, p in positions.items()}
+        assert np.isfinite(np.stack(list(points.values()))).all()
+
+        lengths = [np.linalg.norm(points[s] - points[t]) for s, t in links]
+        assert abs(np.median(lengths) - EDGE_LENGTH) < 1.0
+        # Nodes of the same triangle sit closer than nodes of different ones
+        assert np.linalg.norm(points["a"] - points["b"]) < np.linalg.norm(points["a"] - points["y"])
+
+    def test_empty_graph(self):
+        assert compute_layout([], []) == {}
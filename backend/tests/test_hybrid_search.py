@@ -0,0 +1,29 @@
+from app.services.hybrid_search import reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion:
+    def test_chunk_in_both_lists_ranks_first(self):
+        vector_hits = [
+            {"id": "a", "content": "A", "page_number": 1, "distance": 0.2},
+            {"id": "b", "content": "B", "page_number": 2, "distance": 0.3},
+        ]
+        keyword_hits = [
+            {"id": "c", "content": "C", "page_number": 3, "keyword_rank": 0.9},
+            {"id": "b", "content": "B", "page_number": 2, "keyword_rank": 0.5},
+        ]
+
+        fused = reciprocal_rank_fusion([vector_hits, keyword_hits], [1.0, 1.0], k=60)
+
+        assert [c["id"] for c in fused][0] == "b"
+        assert fused[0]["distance"] == 0.3
+        assert fused[0]["keyword_rank"] == 0.5
+        assert {c["id"] for c in fused} == {"a", "b", "c"}
+
+    def test_weights_shift_ranking(self):
+        vector_hits = [{"id": "a", "distance": 0.2}]
+        keyword_hits = [{"id": "c", "keyword_rank": 0.9}]
+
+        fused = reciprocal_rank_fusion([vector_hits, keyword_hits], [1.0, 2.0], k=60)
+
+        assert [c["id"] for c in fused] == ["c", "a"]
+        assert fused[0]["rrf_score"] == 2.0 / 61
@@ -0,0 +1,84 @@
+import uuid
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.services.local_vector_index import LocalVectorIndex
+
+
+def make_chunks(vectors):
+    return [
+        {
+            "id": uuid.uuid4(),
+            "page_number": i + 1,
+            "content": f"chunk {i}",
+            "embedding": vector + [0.0] * (settings.EMBEDDING_DIMENSION - len(vector)),
+        }
+        for i, vector in enumerate(vectors)
+    ]
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestLocalVectorIndex:
+    @pytest.mark.asyncio
+    async def test_search_returns_nearest_chunks(self, upload_dir):
+        index = LocalVectorIndex()
+        document_id = uuid.uuid4()
+        chunks = make_chunks([[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]])
+        index.build(document_id, chunks)
+
+        query = [1.0, 0.1] + [0.0] * (settings.EMBEDDING_DIMENSION - 2)
+        results = await index.search(query, document_id, db=None, top_k=2)
+
+        assert [r["id"] for r in results] == [chunks[0]["id"], chunks[2]["id"]]
+        assert results[0]["distance"] < results[1]["distance"]
+        assert results[0]["page_number"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded_by_bytes(self, upload_dir):
+        index = LocalVectorIndex(max_bytes=1)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        index.build(first, make_chunks([[1.0, 0.0]]))
+        index.build(second, make_chunks([[0.0, 1.0]]))
+
+        query = [1.0] + [0.0] * (settings.EMBEDDING_DIMENSION - 1)
+        await index.search(query, first, db=None)
+        await index.search(query, second, db=None)
+
+        assert list(index._entries) == [second]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_removes_files(self, upload_dir):
+        index = LocalVectorIndex()
+        document_id = uuid.uuid4()
+        index.build(document_id, make_chunks([[1.0, 0.0]]))
+
+        index.invalidate(document_id)
+
+        assert not any(upload_dir.iterdir())
+        assert document_id not in index._entries
+
+    @pytest.mark.asyncio
+    async def test_files_sit_next_to_the_upload_and_reload_when_rebuilt(self, upload_dir):
+        worker, other_worker = LocalVectorIndex(), LocalVectorIndex()
+        document_id = uuid.uuid4()
+        file_path = upload_dir / "docs" / f"{document_id}_notes.pdf"
+        file_path.parent.mkdir()
+        worker.build(document_id, make_chunks([[1.0, 0.0]]), file_path)
+        other_worker._paths(document_id, file_path)
+
+        query = np.array([2.0] + [0.0] * (settings.EMBEDDING_DIMENSION - 1), dtype=np.float32)
+        first = await worker.search(query, document_id, db=None)
+        # Reprocessed by another worker: the cached matrix must not be served
+        rebuilt = make_chunks([[0.0, 1.0]])
+        other_worker.build(document_id, rebuilt, file_path)
+        second = await worker.search(query, document_id, db=None)
+
+        assert (file_path.parent / f"{document_id}.vectors.npy").exists()
+        assert query[0] == 2.0
+        assert first[0]["distance"] < 1e-6
+        assert second[0]["id"] == rebuilt[0]["id"]
@@ -0,0 +1,17 @@
+from app.services.page_search import escape_like, highlight_snippets
+
+
+class TestPageSearch:
+    def test_snippets_mark_every_match_and_escape_html(self):
+        text = "Mitosis <b>divides</b> cells. " + "filler " * 40 + "MITOSIS ends with cytokinesis."
+
+        count, snippets = highlight_snippets(text, "mitosis", radius=20)
+
+        assert count == 2
+        assert len(snippets) == 2
+        assert snippets[0].startswith("<mark>Mitosis</mark> &lt;b&gt;divides")
+        assert "<mark>MITOSIS</mark>" in snippets[1]
+        assert snippets[1].startswith("…")
+
+    def test_escape_like_wildcards(self):
+        assert escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
@@ -0,0 +1,46 @@
+import uuid
+import numpy as np
+from app.services.query_router import QueryRouter, RouteDecision
+
+
+class TestQueryRouter:
+    def test_small_talk_skips_retrieval(self):
+        router = QueryRouter()
+        session_id = uuid.uuid4()
+
+        assert router.route_by_rules("hi", session_id) == RouteDecision.NONE
+        assert router.route_by_rules("Thanks a lot!", session_id) == RouteDecision.NONE
+        assert router.route_by_rules("hey what is DNA?", session_id) is None
+
+    def test_follow_up_reuses_cached_context(self):
+        router = QueryRouter()
+        session_id = uuid.uuid4()
+        question = "explain that more simply"
+
+        # Nothing cached yet: fall through to the embedding stage
+        assert router.route_by_rules(question, session_id) is None
+
+        router.remember(session_id, [1.0, 0.0, 0.0], [{"page_number": 1, "content": "x"}], [])
+
+        assert router.route_by_rules(question, session_id) == RouteDecision.REUSE
+        assert router.cached_context(session_id)["context_chunks"][0]["page_number"] == 1
+
+    def test_follow_up_with_a_topic_needs_a_similar_question(self, monkeypatch):
+        router = QueryRouter()
+        session_id = uuid.uuid4()
+        question = "Can you clarify the difference between mitosis and meiosis?"
+        monkeypatch.setattr(router, "_prototype_matrix", lambda: np.zeros((1, 3)))
+        router.remember(session_id, [1.0, 0.0, 0.0], [], [])
+
+        assert router.route_by_rules(question, session_id) is None
+        assert router.route_by_embedding([0.0, 1.0, 0.0], session_id, question) == RouteDecision.RETRIEVE
+        assert router.route_by_embedding([0.8, 0.6, 0.0], session_id, question) == RouteDecision.REUSE
+
+    def test_near_duplicate_question_reuses_context(self, monkeypatch):
+        router = QueryRouter()
+        session_id = uuid.uuid4()
+        monkeypatch.setattr(router, "_prototype_matrix", lambda: np.zeros((1, 3)))
+        router.remember(session_id, [1.0, 0.0, 0.0], [], [])
+
+        assert router.route_by_embedding([0.99, 0.05, 0.0], session_id) == RouteDecision.REUSE
+        assert router.route_by_embedding([0.0, 1.0, 0.0], session_id) == RouteDecision.RETRIEVE
@@ -0,0 +1,56 @@
+from app.services.sections import SectionResolver, join_section_path
+from app.services.chunker import Chunker
+from app.services.pdf_parser import PageContent, SectionMarker
+
+PATHS = [
+    "Chapter 1 Introduction",
+    "Chapter 1 Introduction > 1.1 History",
+    "Chapter 3 Cells",
+    "Chapter 3 Cells > 3.1 Structure",
+    "Chapter 3 Cells > 3.2 Photosynthesis",
+    "Chapter 13 Ecology",
+]
+
+
+class TestSectionResolver:
+    def test_numbered_reference_matches_shallowest_section(self):
+        resolver = SectionResolver()
+
+        chapter = resolver.extract_reference("What does chapter 3 say about membranes?")
+        subsection = resolver.extract_reference("Summarise section 3.1 for me")
+
+        assert resolver.match_path(chapter, PATHS) == "Chapter 3 Cells"
+        assert resolver.match_path(subsection, PATHS) == "Chapter 3 Cells > 3.1 Structure"
+        assert resolver.extract_reference("How do cells divide?") is None
+
+    def test_titled_reference(self):
+        resolver = SectionResolver()
+        reference = resolver.extract_reference("In the section on photosynthesis, what is ATP?")
+
+        assert resolver.match_path(reference, PATHS) == "Chapter 3 Cells > 3.2 Photosynthesis"
+
+    def test_chunks_inherit_section_of_their_offset(self):
+        text = "Cells. " + "Cells are small. " * 4 + "3.1 Structure. " + "Membranes hold them. " * 4
+        page = PageContent(
+            page_number=5,
+            text=text,
+            needs_ocr=False,
+            section_path="Chapter 2 Genes",
+            sections=[
+                SectionMarker(offset=0, path="Chapter 3 Cells"),
+                SectionMarker(offset=text.index("3.1"), path="Chapter 3 Cells > 3.1 Structure"),
+            ],
+        )
+
+        chunks = Chunker(chunk_size=80, overlap=10).chunk_pages([page])
+
+        assert chunks[0].section_path == "Chapter 3 Cells"
+        assert chunks[-1].section_path == "Chapter 3 Cells > 3.1 Structure"
+
+    def test_long_section_paths_drop_middle_headings(self):
+        titles = ["Part I Biology", "Chapter 3 " + "x" * 40, "3.1 " + "y" * 40, "3.1.2 Membranes"]
+
+        assert join_section_path(titles) == " > ".join(titles)
+        assert join_section_path(titles, max_length=60) == "Part I Biology > ... > 3.1.2 Membranes"
+        assert join_section_path(["z" * 100], max_length=60) == "z" * 60
+        assert join_section_path([]) is None
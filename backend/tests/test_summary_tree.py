@@ -0,0 +1,23 @@
+from app.services.summary_tree import SummaryTreeService, group_by_section
+
+
+class TestClassifyScope:
+    def test_bare_requests_read_the_summary_tree(self):
+        assert SummaryTreeService.classify_scope("Summarize this document") == "document"
+        assert SummaryTreeService.classify_scope("tl;dr") == "document"
+        assert SummaryTreeService.classify_scope("Can you give me a short overview of the book?") == "document"
+        assert SummaryTreeService.classify_scope("What are the main themes?") == "section"
+
+    def test_requests_with_a_topic_or_section_use_retrieval(self):
+        assert SummaryTreeService.classify_scope("Summarize chapter 3") is None
+        assert SummaryTreeService.classify_scope("Give an overview of photosynthesis") is None
+        assert SummaryTreeService.classify_scope("What are the key ideas of the section on mitosis?") is None
+        assert SummaryTreeService.classify_scope("Is the summary of Darwin's theory correct?") is None
+
+
+class TestGroupBySection:
+    def test_groups_follow_sections_and_cap_size(self):
+        paths = ["Ch 1", "Ch 1", "Ch 1", "Ch 2 > 2.1", "Ch 2 > 2.2", "Ch 2 > 2.2"]
+
+        assert group_by_section(paths, 2) == [[0, 1], [2], [3], [4, 5]]
+        assert group_by_section([None] * 5, 2) == [[0, 1], [2, 3], [4]]
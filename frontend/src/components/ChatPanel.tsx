@@ -39,6 +39,7 @@ export function ChatPanel({ documentId }: ChatPanelProps) {
     const [activeSessionId, setActiveSessionId] = useState<string | null>(null);
     const [showHistory, setShowHistory] = useState(false);
     const [webSearchEnabled, setWebSearchEnabled] = useState(false);
+    const [librarySearchEnabled, setLibrarySearchEnabled] = useState(false);
 
     const scrollRef = useRef<HTMLDivElement>(null);
     const token = useAuthStore((state) => state.token);
@@ -119,6 +120,7 @@ export function ChatPanel({ documentId }: ChatPanelProps) {
                     persona: selectedPersona,
                     session_id: activeSessionId,
                     web_search: webSearchEnabled,
+                    library_search: !documentId && librarySearchEnabled,
                 }),
             });
 
@@ -316,6 +318,26 @@ export function ChatPanel({ documentId }: ChatPanelProps) {
                             <span className="sm:hidden">Web</span>
                         </button>
 
+                        {!documentId && (
+                            <button
+                                onClick={() => setLibrarySearchEnabled(!librarySearchEnabled)}
+                                className={cn(
+                                    "flex items-center gap-1.5 px-2.5 py-1 rounded-md text-xs font-medium transition-all",
+                                    librarySearchEnabled
+                                        ? "bg-primary-100 dark:bg-primary-900/30 text-primary-600 dark:text-primary-400 border border-primary-200 dark:border-primary-800"
+                                        : "bg-gray-100 dark:bg-slate-800 text-gray-500 dark:text-slate-400 border border-gray-200 dark:border-slate-700 hover:bg-gray-200 dark:hover:bg-slate-700"
+                                )}
+                                title="Search across all your uploaded documents"
+                            >
+                                <div className={cn(
+                                    "w-1.5 h-1.5 rounded-full",
+                                    librarySearchEnabled ? "bg-primary-500 animate-pulse" : "bg-gray-400"
+                                )} />
+                                <span className="hidden sm:inline">My Library</span>
+                                <span className="sm:hidden">Library</span>
+                            </button>
+                        )}
+
                         {documentId && (
                             <select
                                 value={selectedPersona}
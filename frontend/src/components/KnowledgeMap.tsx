@@ -8,9 +8,15 @@ interface Node {
     id: string;
     name: string;
     val?: number;
+    page_degree?: number;
+    x?: number;
+    y?: number;
+    fx?: number;
+    fy?: number;
 }
 
 interface Link {
+    id: string;
     source: string;
     target: string;
     label: string;
@@ -21,6 +27,15 @@ interface GraphData {
     links: Link[];
 }
 
+// Pin nodes at the server-computed layout so the map renders without running a force simulation
+const pinNodes = (graph: GraphData): GraphData => ({
+    ...graph,
+    nodes: graph.nodes.map(n => (n.x !== undefined && n.y !== undefined ? { ...n, fx: n.x, fy: n.y } : n)),
+});
+
+// Level of detail: the map opens on the best-connected entities; clicking one pulls in its neighbourhood
+const TOP_NODES = 150;
+
 export function KnowledgeMap({ documentId }: { documentId: string }) {
     const [data, setData] = useState<GraphData | null>(null);
     const [loading, setLoading] = useState(true);
@@ -30,8 +45,8 @@ export function KnowledgeMap({ documentId }: { documentId: string }) {
     useEffect(() => {
         const fetchGraph = async () => {
             try {
-                const response = await api.get(`/graph/${documentId}`);
-                setData(response.data);
+                const response = await api.get(`/graph/${documentId}`, { params: { top_n: TOP_NODES } });
+                setData(pinNodes(response.data));
             } catch (err) {
                 console.error("Failed to fetch graph:", err);
                 setError("No knowledge connections found yet. Try chatting more!");
@@ -43,6 +58,24 @@ export function KnowledgeMap({ documentId }: { documentId: string }) {
         fetchGraph();
     }, [documentId]);
 
+    const expandNode = async (node: Node) => {
+        try {
+            const response = await api.get(`/graph/${documentId}`, { params: { focus: node.id, depth: 1 } });
+            const neighbourhood: GraphData = pinNodes(response.data);
+            setData(prev => {
+                if (!prev) return neighbourhood;
+                const nodeIds = new Set(prev.nodes.map(n => n.id));
+                const linkIds = new Set(prev.links.map(l => l.id));
+                return {
+                    nodes: [...prev.nodes, ...neighbourhood.nodes.filter(n => !nodeIds.has(n.id))],
+                    links: [...prev.links, ...neighbourhood.links.filter(l => !linkIds.has(l.id))],
+                };
+            });
+        } catch (err) {
+            console.error("Failed to expand node:", err);
+        }
+    };
+
     if (loading) {
         return (
             <div className="flex flex-col items-center justify-center h-full gap-4 text-gray-500">
@@ -83,6 +116,8 @@ export function KnowledgeMap({ documentId }: { documentId: string }) {
                 linkDirectionalArrowRelPos={1}
                 linkCurvature={0.25}
                 linkLabel="label"
+                onNodeClick={(node: any) => expandNode(node as Node)}
+                cooldownTicks={data.nodes.every(n => n.fx !== undefined) ? 0 : Infinity}
                 nodeCanvasObject={(node: any, ctx: CanvasRenderingContext2D, globalScale: number) => {
                     const label = (node as Node).name;
                     const fontSize = 12 / globalScale;
@@ -112,7 +147,7 @@ export function KnowledgeMap({ documentId }: { documentId: string }) {
             {/* Legend/Overlay */}
             <div className="absolute top-4 left-4 p-3 bg-white/80 dark:bg-slate-900/80 backdrop-blur-md rounded-lg border border-gray-200 dark:border-slate-800 shadow-sm z-10 pointer-events-none">
                 <h4 className="text-xs font-bold uppercase tracking-wider text-gray-400 mb-1">Interactive Map</h4>
-                <p className="text-xs text-gray-600 dark:text-slate-400">Explore concept connections</p>
+                <p className="text-xs text-gray-600 dark:text-slate-400">Click a concept to expand its connections</p>
             </div>
         </div>
     );
@@ -1,7 +1,8 @@
 import { useEffect, useState } from 'react';
-import { Loader2 } from 'lucide-react';
+import { Loader2, Search, X } from 'lucide-react';
 import { useStudyStore } from '../stores/useStudyStore';
 import api from '../services/api';
+import { documentsService, type PageSearchHit } from '../services/documentsService';
 
 interface PDFViewerProps {
     documentId: string;
@@ -9,7 +10,33 @@ interface PDFViewerProps {
 
 export function PDFViewer({ documentId }: PDFViewerProps) {
     const currentPage = useStudyStore((state) => state.currentPage);
+    const setPage = useStudyStore((state) => state.setPage);
     const [url, setUrl] = useState<string | null>(null);
+    const [query, setQuery] = useState('');
+    const [hits, setHits] = useState<PageSearchHit[]>([]);
+    const [nextAfter, setNextAfter] = useState<number | null>(null);
+    const [searching, setSearching] = useState(false);
+
+    const runSearch = async (after: number | null = null) => {
+        if (query.trim().length < 2) return;
+        setSearching(true);
+        try {
+            // Server-side find over the indexed page text; snippets come back escaped with <mark> hits
+            const result = await documentsService.searchDocument(documentId, query.trim(), after);
+            setHits(after ? [...hits, ...result.hits] : result.hits);
+            setNextAfter(result.next_after);
+        } catch (error) {
+            console.error('Error searching document:', error);
+        } finally {
+            setSearching(false);
+        }
+    };
+
+    const clearSearch = () => {
+        setQuery('');
+        setHits([]);
+        setNextAfter(null);
+    };
 
     useEffect(() => {
         const fetchPdf = async () => {
@@ -73,10 +100,54 @@ export function PDFViewer({ documentId }: PDFViewerProps) {
     }
 
     return (
-        <div className="h-full w-full bg-slate-900 border-r border-slate-800">
+        <div className="h-full w-full flex flex-col bg-slate-900 border-r border-slate-800">
+            <form
+                onSubmit={(e) => { e.preventDefault(); runSearch(); }}
+                className="flex items-center gap-2 p-2 border-b border-slate-800"
+            >
+                <Search className="w-4 h-4 text-slate-500" />
+                <input
+                    value={query}
+                    onChange={(e) => setQuery(e.target.value)}
+                    placeholder="Find in document..."
+                    className="flex-1 bg-transparent text-sm text-slate-200 placeholder-slate-500 outline-none"
+                />
+                {searching && <Loader2 className="w-4 h-4 animate-spin text-primary-500" />}
+                {hits.length > 0 && (
+                    <button type="button" onClick={clearSearch} className="text-slate-500 hover:text-slate-300">
+                        <X className="w-4 h-4" />
+                    </button>
+                )}
+            </form>
+            {hits.length > 0 && (
+                <div className="max-h-64 overflow-y-auto border-b border-slate-800 text-sm">
+                    {hits.map((hit) => (
+                        <button
+                            key={hit.page_number}
+                            onClick={() => setPage(hit.page_number)}
+                            className="block w-full text-left px-3 py-2 hover:bg-slate-800 text-slate-300"
+                        >
+                            <span className="text-xs font-semibold text-primary-400">
+                                Page {hit.page_number} · {hit.match_count} match{hit.match_count === 1 ? '' : 'es'}
+                            </span>
+                            {hit.snippets.map((snippet, i) => (
+                                <p key={i} className="text-xs text-slate-400" dangerouslySetInnerHTML={{ __html: snippet }} />
+                            ))}
+                        </button>
+                    ))}
+                    {nextAfter !== null && (
+                        <button
+                            onClick={() => runSearch(nextAfter)}
+                            className="w-full px-3 py-2 text-xs text-primary-400 hover:bg-slate-800"
+                        >
+                            Load more
+                        </button>
+                    )}
+                </div>
+            )}
             <iframe
                 src={displayUrl}
-                className="w-full h-full border-none"
+                className="w-full flex-1 border-none"
                 title="PDF Viewer"
             />
         </div>
@@ -9,6 +9,19 @@ export interface DocumentResponse {
     created_at: string;
 }
 
+export interface PageSearchHit {
+    page_number: number;
+    match_count: number;
+    snippets: string[];
+}
+
+export interface DocumentSearchResponse {
+    query: string;
+    hits: PageSearchHit[];
+    next_after: number | null;
+    took_ms: number;
+}
+
 export const documentsService = {
     getDocuments: async (): Promise<DocumentResponse[]> => {
         const response = await api.get<DocumentResponse[]>('/documents');
@@ -28,5 +41,12 @@ export const documentsService = {
     reprocessDocument: async (id: string): Promise<DocumentResponse> => {
         const response = await api.post<DocumentResponse>(`/documents/${id}/reprocess`);
         return response.data;
+    },
+
+    searchDocument: async (id: string, q: string, after?: number | null): Promise<DocumentSearchResponse> => {
+        const response = await api.get<DocumentSearchResponse>(`/documents/${id}/search`, {
+            params: { q, after: after ?? undefined }
+        });
+        return response.data;
     }
 };